@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+import time
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+from Blockchain import Transaction, TxInput, TxOutput, generate_key_pair, load_public_key, verify_transactions
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def make_outputs(count):
+    return [TxOutput(f"address_{i:06d}", 0.5 + i) for i in range(count)]
+
+
+def build_eager(outputs, hash_format):
+    # прежнее поведение: хеш пересчитывается после каждого add_output - O(k^2) для k выходов
+    tx = Transaction(tx_inputs=[TxInput("prev_tx_hash", 0, public_key=b"public key")], hash_format=hash_format)
+    tx.id = tx.calculate_hash()
+    for tx_out in outputs:
+        tx.add_output(tx_out)
+        tx.id = tx.calculate_hash()
+    return tx.id
+
+
+def build_lazy(outputs, hash_format):
+    # текущее поведение: add_output только помечает хеш устаревшим, он считается один раз при чтении id
+    tx = Transaction(tx_inputs=[TxInput("prev_tx_hash", 0, public_key=b"public key")], hash_format=hash_format)
+    for tx_out in outputs:
+        tx.add_output(tx_out)
+    return tx.id
+
+
+async def make_signed(count, key_count):
+    # count подписанных транзакций с одним входом; ключи повторяются, как у реальных адресов
+    keys = [(await generate_key_pair())[0] for _ in range(key_count)]
+    transactions = []
+    for i in range(count):
+        tx = Transaction(tx_inputs=[TxInput(f"prev_tx_{i}", 0)], tx_outputs=[TxOutput(f"address_{i}", 1.0)])
+        await tx.sign_input(0, keys[i % key_count])
+        transactions.append(tx)
+    return transactions
+
+
+def verify_uncached(transactions):
+    # прежний способ: ключ разбирается заново при каждой проверке, входы проверяются по одному
+    failures = []
+    for tx_index, tx in enumerate(transactions):
+        message = tx.id.encode()
+        for input_index, inp in enumerate(tx.tx_inputs):
+            try:
+                load_pem_public_key(inp.public_key).verify(inp.signature, message, ec.ECDSA(hashes.SHA256()))
+            except Exception:
+                failures.append((tx_index, input_index))
+    return failures
+
+
+def bench_signatures(count, key_count=16):
+    transactions = asyncio.run(make_signed(count, key_count))
+    for tx in transactions:
+        tx.id  # id считаются заранее, измеряется только проверка подписей
+    seconds, reference = measure(verify_uncached, transactions)
+    print(f"\n{count} подписей, {key_count} разных ключей")
+    print(f"разбор ключа при каждой проверке, 1 поток: {count / seconds:8.0f} подписей/с")
+    load_public_key.cache_clear()
+    for workers in sorted({1, 2, 4, 8, os.cpu_count() or 1}):
+        seconds, failures = measure(verify_transactions, transactions, workers)
+        assert failures == reference == []
+        print(f"verify_transactions, потоков {workers:2d}:           {count / seconds:8.0f} подписей/с")
+    print(f"кэш ключей: {load_public_key.cache_info()}")
+
+
+if __name__ == "__main__":
+    # число выходов можно передать аргументами: python Bench-Blockchain.py 1000 5000 10000
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 2000, 5000, 10000]
+    for count in counts:
+        outputs = make_outputs(count)
+        eager_json, reference = measure(build_eager, outputs, "json")
+        lazy_json, result = measure(build_lazy, outputs, "json")
+        assert result == reference
+        lazy_binary, _ = measure(build_lazy, outputs, "binary")
+        print(f"{count:6d} выходов: прежний способ (JSON после каждого add_output) {eager_json * 1000:9.1f} мс, "
+              f"лениво JSON {lazy_json * 1000:7.2f} мс ({eager_json / lazy_json:6.0f}x), "
+              f"лениво binary {lazy_binary * 1000:7.2f} мс ({eager_json / lazy_binary:6.0f}x)")
+    bench_signatures(5000)
@@ -1,11 +1,15 @@
 import hashlib
 import json
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.serialization import (
-    Encoding, PublicFormat, PrivateFormat, NoEncryption
+    Encoding, PublicFormat, PrivateFormat, NoEncryption, load_der_public_key, load_pem_public_key
 )
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.backends import default_backend
@@ -26,14 +30,118 @@ class TxInput:
     public_key: Optional[bytes] = None # Публичный ключ владельца
 
 
+PUBLIC_KEY_CACHE_SIZE = 4096  # Сколько разобранных публичных ключей хранить (одни и те же ключи встречаются во многих транзакциях)
+VERIFY_BATCH_SIZE = 64  # Сколько подписей проверяет одна задача пула в verify_transactions
+
+
+@lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def load_public_key(encoded: bytes) -> ec.EllipticCurvePublicKey:
+    """
+    Разбирает публичный ключ ECDSA по его байтам (с кэшем LRU по этим байтам).
+    Принимает PEM (SubjectPublicKeyInfo, как сохраняет sign_input), DER SubjectPublicKeyInfo
+    и точку кривой secp256k1 (сжатую или несжатую). Для неверного ключа - ValueError.
+    """
+    if encoded.startswith(b"-----BEGIN"):
+        public_key = load_pem_public_key(encoded)
+    elif encoded.startswith(b"\x30"):  # SEQUENCE в DER
+        public_key = load_der_public_key(encoded)
+    else:
+        public_key = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), encoded)
+    if not isinstance(public_key, ec.EllipticCurvePublicKey):
+        raise ValueError("Public key is not an elliptic curve key")
+    return public_key
+
+
+def _verify(signature: Optional[bytes], encoded_key: Optional[bytes], message: bytes) -> bool:
+    """Проверяет подпись message; False для отсутствующей или неверной подписи или ключа"""
+    if not signature or not encoded_key:
+        return False
+    try:
+        load_public_key(bytes(encoded_key)).verify(signature, message, ec.ECDSA(hashes.SHA256()))
+        return True
+    except (InvalidSignature, ValueError):
+        return False
+
+
+# Форматы хеша транзакции:
+#   "binary" - SHA-256 от канонического двоичного представления (по умолчанию для новых транзакций);
+#   "json"   - SHA-256 от json.dumps(..., sort_keys=True), как в прежних версиях. Транзакции,
+#              сохранённые без поля "hash_format", считаются созданными в этом формате.
+HASH_FORMATS = ("binary", "json")
+DEFAULT_HASH_FORMAT = "binary"
+
+_BINARY_DOMAIN = b"TX\x01"  # Версия двоичного представления
+_NONE_FIELD = b"\xff\xff\xff\xff"  # Длина-маркер для отсутствующего поля (None)
+_U32 = struct.Struct(">I")
+_INPUT_HEAD = struct.Struct(">q")  # vout
+_AMOUNT = struct.Struct(">d")  # Сумма как число с плавающей точкой IEEE 754
+
+
+def _field(value) -> bytes:
+    """Поле с префиксом длины: 4 байта длины (big-endian) и байты; строки кодируются в UTF-8"""
+    if value is None:
+        return _NONE_FIELD
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return _U32.pack(len(value)) + value
+
+
 class Transaction:
-    def __init__(self, tx_inputs: List[TxInput] = None, tx_outputs: List[TxOutput] = None):
+    def __init__(self, tx_inputs: List[TxInput] = None, tx_outputs: List[TxOutput] = None,
+                 hash_format: str = DEFAULT_HASH_FORMAT):
+        if hash_format not in HASH_FORMATS:
+            raise ValueError(f"Unknown hash format: {hash_format}")
         self.tx_inputs = tx_inputs if tx_inputs is not None else []
         self.tx_outputs = tx_outputs if tx_outputs is not None else []
-        self.id = self.calculate_hash()
-    
+        self.hash_format = hash_format
+        # id вычисляется лениво: изменения только помечают хеш устаревшим
+        self._id: Optional[str] = None
+        self._dirty = True
+
+    @property
+    def id(self) -> str:
+        """ID транзакции; пересчитывается при первом обращении после изменения"""
+        if self._dirty:
+            self._id = self.calculate_hash()
+            self._dirty = False
+        return self._id
+
+    @id.setter
+    def id(self, value: str):
+        """Явно заданный ID (например, при загрузке из словаря)"""
+        self._id = value
+        self._dirty = False
+
+    def invalidate(self):
+        """Помечает хеш устаревшим (после изменения входов или выходов напрямую)"""
+        self._dirty = True
+
     def calculate_hash(self) -> str:
-        """Вычисляет хеш транзакции (SHA-256)"""
+        """Вычисляет хеш транзакции (SHA-256) в формате self.hash_format"""
+        if self.hash_format == "binary":
+            return hashlib.sha256(self.serialize()).hexdigest()
+        return self.calculate_json_hash()
+
+    def serialize(self) -> bytes:
+        """
+        Каноническое двоичное представление для хеширования (подпись в хеш не входит):
+        версия; число входов (4 байта), для каждого - tx_id, vout (8 байт), public_key;
+        число выходов (4 байта), для каждого - address и amount (8 байт, double).
+        Строки и байты записываются с префиксом длины (4 байта), None - длиной 0xFFFFFFFF.
+        """
+        parts = [_BINARY_DOMAIN, _U32.pack(len(self.tx_inputs))]
+        for inp in self.tx_inputs:
+            parts.append(_field(inp.tx_id))
+            parts.append(_INPUT_HEAD.pack(inp.vout))
+            parts.append(_field(inp.public_key))
+        parts.append(_U32.pack(len(self.tx_outputs)))
+        for tx_out in self.tx_outputs:
+            parts.append(_field(tx_out.address))
+            parts.append(_AMOUNT.pack(tx_out.amount))
+        return b"".join(parts)
+
+    def calculate_json_hash(self) -> str:
+        """Хеш в прежнем формате JSON (для транзакций, созданных до двоичного формата)"""
         tx_data = {
             "inputs": [
                 {"tx_id": inp.tx_id, "vout": inp.vout, "public_key": inp.public_key.hex() 
@@ -46,24 +154,35 @@ class Transaction:
         return hashlib.sha256(tx_json).hexdigest()
 
     async def sign_input(self, input_index: int, private_key: ec.EllipticCurvePrivateKey):
-        """Асинхронно подписывает указанный вход транзакции"""
+        """
+        Асинхронно подписывает указанный вход транзакции.
+        Публичный ключ входа входит в хеш транзакции, поэтому у транзакции с несколькими входами
+        ключи всех входов должны быть заданы до подписи (TxInput(public_key=...)): иначе подпись
+        одного входа изменила бы id и сделала недействительными подписи остальных - ValueError.
+        """
         if input_index >= len(self.tx_inputs):
             raise IndexError("Input index out of range")
-        
+
         # Получаем публичный ключ из приватного
-        public_key = private_key.public_key()
-        self.tx_inputs[input_index].public_key = public_key.public_bytes(
+        public_key = private_key.public_key().public_bytes(
             Encoding.PEM,
             PublicFormat.SubjectPublicKeyInfo
         )
-        
+        inp = self.tx_inputs[input_index]
+        others = [other for i, other in enumerate(self.tx_inputs) if i != input_index]
+        if any(other.public_key is None for other in others):
+            raise ValueError("Public keys of all other inputs must be set before signing")
+        if inp.public_key != public_key and any(other.signature for other in others):
+            raise ValueError("Changing the input public key would invalidate signatures of other inputs")
+        inp.public_key = public_key
+        self.invalidate()  # Ключ входит в хеш - id пересчитывается перед подписью
+
         # Подписываем хеш транзакции
         signature = private_key.sign(
             self.id.encode(),
             ec.ECDSA(hashes.SHA256()))
-        
-        self.tx_inputs[input_index].signature = signature
-        self.id = self.calculate_hash()  # Обновляем хеш после подписи
+
+        inp.signature = signature  # Подпись в хеш не входит, id не меняется
 
     def verify_signature(self, input_index: int) -> bool:
         """Проверяет подпись указанного входа"""
@@ -71,25 +190,7 @@ class Transaction:
             raise IndexError("Input index out of range")
         
         inp = self.tx_inputs[input_index]
-        if not inp.signature or not inp.public_key:
-            return False
-        
-        try:
-            # Загружаем публичный ключ
-            public_key = ec.EllipticCurvePublicKey.from_encoded_point(
-                ec.SECP256K1(),
-                inp.public_key
-            )
-            
-            # Проверяем подпись
-            public_key.verify(
-                inp.signature,
-                self.id.encode(),
-                ec.ECDSA(hashes.SHA256())
-            )
-            return True
-        except (InvalidSignature, ValueError):
-            return False
+        return _verify(inp.signature, inp.public_key, self.id.encode())
 
     def is_valid(self) -> bool:
         """Проверяет валидность всей транзакции"""
@@ -106,15 +207,16 @@ class Transaction:
 
     def add_input(self, tx_input: TxInput):
         self.tx_inputs.append(tx_input)
-        self.id = self.calculate_hash()
+        self._dirty = True
 
     def add_output(self, tx_output: TxOutput):
         self.tx_outputs.append(tx_output)
-        self.id = self.calculate_hash()
+        self._dirty = True
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
+            "hash_format": self.hash_format,
             "inputs": [
                 {
                     "tx_id": inp.tx_id,
@@ -129,7 +231,8 @@ class Transaction:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Transaction':
-        tx = cls()
+        # Словари без "hash_format" сохранены прежними версиями, их id посчитан по JSON
+        tx = cls(hash_format=data.get("hash_format", "json"))
         tx.tx_inputs = [
             TxInput(
                 tx_id=inp["tx_id"],
@@ -144,6 +247,34 @@ class Transaction:
         return tx
 
 
+def _verify_batch(tasks: List[Tuple[int, int, Optional[bytes], Optional[bytes], bytes]]) -> List[Tuple[int, int]]:
+    """Проверяет порцию подписей и возвращает (номер транзакции, номер входа) неверных"""
+    return [(tx_index, input_index) for tx_index, input_index, signature, encoded_key, message in tasks
+            if not _verify(signature, encoded_key, message)]
+
+
+def verify_transactions(transactions: List[Transaction], workers: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Проверяет подписи всех входов многих транзакций в пуле потоков
+    (OpenSSL отпускает GIL на время проверки подписи).
+
+    :return: Отсортированный список (номер транзакции, номер входа) для входов с неверной подписью;
+             пустой список - все подписи верны
+    """
+    # id считаются заранее в вызывающем потоке, потоки пула получают только байты
+    tasks = [(tx_index, input_index, inp.signature, inp.public_key, tx.id.encode())
+             for tx_index, tx in enumerate(transactions)
+             for input_index, inp in enumerate(tx.tx_inputs)]
+    batches = [tasks[start:start + VERIFY_BATCH_SIZE] for start in range(0, len(tasks), VERIFY_BATCH_SIZE)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(batches) <= 1:
+        results = [_verify_batch(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_verify_batch, batches))
+    return [failure for result in results for failure in result]
+
+
 async def generate_key_pair() -> Tuple[ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey]:
     """Генерирует пару ECDSA ключей (secp256k1)"""
     private_key = ec.generate_private_key(ec.SECP256K1(), default_backend())
@@ -216,6 +347,7 @@ async def create_and_test_transaction():
     print("Restored transaction valid:", restored_tx.is_valid())
 
 
-# Запускаем тест
-import asyncio
-asyncio.run(create_and_test_transaction())
+if __name__ == "__main__":
+    # Запускаем тест
+    import asyncio
+    asyncio.run(create_and_test_transaction())
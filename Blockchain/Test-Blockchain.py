@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import json
+import unittest
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from Blockchain import Transaction, TxInput, TxOutput, generate_key_pair, load_public_key, verify_transactions
+
+class TestTransactionId(unittest.TestCase):
+
+    def test_lazy_id_follows_changes(self):
+        tx = Transaction()
+        tx.add_output(TxOutput("alice", 50.0))
+        first = tx.id
+        self.assertEqual(first, tx.calculate_hash())
+        tx.add_output(TxOutput("bob", 1.0))
+        self.assertNotEqual(tx.id, first)
+        self.assertEqual(tx.id, tx.calculate_hash())
+        tx.add_input(TxInput("prev", 0, public_key=b"key"))
+        self.assertEqual(tx.id, tx.calculate_hash())
+
+    def test_invalidate_after_direct_change(self):
+        tx = Transaction(tx_outputs=[TxOutput("alice", 50.0)])
+        first = tx.id
+        tx.tx_outputs.append(TxOutput("bob", 1.0))
+        self.assertEqual(tx.id, first)  # Прямое изменение списка без invalidate не замечается
+        tx.invalidate()
+        self.assertEqual(tx.id, tx.calculate_hash())
+        self.assertNotEqual(tx.id, first)
+
+    def test_explicit_id(self):
+        tx = Transaction(tx_outputs=[TxOutput("alice", 50.0)])
+        tx.id = "explicit"
+        self.assertEqual(tx.id, "explicit")
+        tx.add_output(TxOutput("bob", 1.0))
+        self.assertEqual(tx.id, tx.calculate_hash())
+
+    def test_binary_encoding_is_unambiguous(self):
+        # Префиксы длины не дают сдвинуть границу между полями
+        a = Transaction(tx_outputs=[TxOutput("ab", 1.0), TxOutput("c", 1.0)])
+        b = Transaction(tx_outputs=[TxOutput("a", 1.0), TxOutput("bc", 1.0)])
+        self.assertNotEqual(a.id, b.id)
+        self.assertEqual(a.id, hashlib.sha256(a.serialize()).hexdigest())
+        # Отсутствующий ключ отличается от пустого
+        none_key = Transaction(tx_inputs=[TxInput("prev", 0)])
+        empty_key = Transaction(tx_inputs=[TxInput("prev", 0, public_key=b"")])
+        self.assertNotEqual(none_key.id, empty_key.id)
+
+    def test_json_format_matches_previous_hash(self):
+        tx = Transaction(tx_inputs=[TxInput("prev", 1, public_key=b"key")],
+                         tx_outputs=[TxOutput("alice", 50.0)], hash_format="json")
+        data = {"inputs": [{"tx_id": "prev", "vout": 1, "public_key": b"key".hex()}],
+                "outputs": [{"address": "alice", "amount": 50.0}]}
+        expected = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        self.assertEqual(tx.id, expected)
+        with self.assertRaises(ValueError):
+            Transaction(hash_format="xml")
+
+    def test_from_dict_compatibility(self):
+        tx = Transaction(tx_inputs=[TxInput("prev", 0, public_key=b"key")],
+                         tx_outputs=[TxOutput("alice", 50.0)], hash_format="json")
+        data = tx.to_dict()
+        del data["hash_format"]  # Словарь прежней версии
+        restored = Transaction.from_dict(data)
+        self.assertEqual(restored.hash_format, "json")
+        self.assertEqual(restored.id, tx.id)
+        self.assertEqual(restored.calculate_hash(), tx.id)
+
+        binary = Transaction(tx_outputs=[TxOutput("alice", 50.0)])
+        restored = Transaction.from_dict(binary.to_dict())
+        self.assertEqual(restored.hash_format, "binary")
+        self.assertEqual(restored.calculate_hash(), binary.id)
+
+
+class TestSigning(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alice, _ = asyncio.run(generate_key_pair())
+        cls.bob, _ = asyncio.run(generate_key_pair())
+
+    def test_sign_after_reading_id(self):
+        # Ключ, заданный sign_input, входит в хеш: id пересчитывается перед подписью
+        tx = Transaction(tx_inputs=[TxInput("prev", 0)], tx_outputs=[TxOutput("bob", 1.0)])
+        unsigned_id = tx.id
+        asyncio.run(tx.sign_input(0, self.alice))
+        self.assertNotEqual(tx.id, unsigned_id)
+        self.assertTrue(tx.verify_signature(0))
+        self.assertTrue(tx.is_valid())
+
+    def test_two_inputs_with_preset_keys(self):
+        tx = Transaction(tx_inputs=[TxInput("prev", 0), TxInput("prev", 1)], tx_outputs=[TxOutput("c", 1.0)])
+        tx.tx_inputs[1].public_key = b"placeholder"
+        tx.invalidate()
+        asyncio.run(tx.sign_input(0, self.alice))
+        # Ключ второго входа уже подписанной транзакции заменить нельзя
+        with self.assertRaises(ValueError):
+            asyncio.run(tx.sign_input(1, self.bob))
+        self.assertTrue(tx.verify_signature(0))
+
+        tx = Transaction(tx_inputs=[TxInput("prev", 0), TxInput("prev", 1)], tx_outputs=[TxOutput("c", 1.0)])
+        with self.assertRaises(ValueError):
+            asyncio.run(tx.sign_input(0, self.alice))  # Ключ второго входа ещё не задан
+
+    def test_two_inputs_signed_in_order(self):
+        # Ключи всех входов заданы заранее - подпись второго входа не меняет id
+        tx = Transaction(tx_outputs=[TxOutput("c", 1.0)])
+        for vout, private_key in enumerate((self.alice, self.bob)):
+            public_key = private_key.public_key().public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo)
+            tx.add_input(TxInput("prev", vout, public_key=public_key))
+        asyncio.run(tx.sign_input(0, self.alice))
+        asyncio.run(tx.sign_input(1, self.bob))
+        self.assertTrue(tx.verify_signature(0))
+        self.assertTrue(tx.verify_signature(1))
+        self.assertTrue(tx.is_valid())
+
+    def test_restored_transaction_valid(self):
+        tx = Transaction(tx_inputs=[TxInput("prev", 0)], tx_outputs=[TxOutput("bob", 1.0)])
+        asyncio.run(tx.sign_input(0, self.alice))
+        restored = Transaction.from_dict(tx.to_dict())
+        self.assertEqual(restored.id, tx.id)
+        self.assertTrue(restored.is_valid())
+        restored.tx_outputs[0].amount = 1000.0
+        restored.invalidate()
+        self.assertFalse(restored.is_valid())
+
+
+class TestVerification(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.alice, _ = asyncio.run(generate_key_pair())
+        cls.bob, _ = asyncio.run(generate_key_pair())
+
+    def signed(self, count):
+        transactions = []
+        for i in range(count):
+            tx = Transaction(tx_inputs=[TxInput(f"prev_{i}", 0)], tx_outputs=[TxOutput("c", 1.0)])
+            asyncio.run(tx.sign_input(0, (self.alice, self.bob)[i % 2]))
+            transactions.append(tx)
+        return transactions
+
+    def test_load_public_key_formats(self):
+        public_key = self.alice.public_key()
+        expected = public_key.public_numbers()
+        for encoding, public_format in ((Encoding.PEM, PublicFormat.SubjectPublicKeyInfo),
+                                        (Encoding.DER, PublicFormat.SubjectPublicKeyInfo),
+                                        (Encoding.X962, PublicFormat.CompressedPoint),
+                                        (Encoding.X962, PublicFormat.UncompressedPoint)):
+            encoded = public_key.public_bytes(encoding, public_format)
+            self.assertEqual(load_public_key(encoded).public_numbers(), expected)
+        for junk in (b"junk", b"-----BEGIN PUBLIC KEY-----\nxx\n-----END PUBLIC KEY-----\n", b"\x30\x01"):
+            with self.assertRaises(ValueError):
+                load_public_key(junk)
+
+    def test_load_public_key_cached(self):
+        encoded = self.bob.public_key().public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo)
+        self.assertIs(load_public_key(encoded), load_public_key(encoded))
+
+    def test_verify_transactions(self):
+        transactions = self.signed(150)
+        self.assertEqual(verify_transactions(transactions, workers=4), [])
+        transactions[3].tx_inputs[0].signature = b"bad"
+        transactions[70].tx_inputs[0].public_key = b"junk"
+        transactions[70].invalidate()
+        transactions[149].tx_inputs[0].signature = None
+        transactions[100].tx_outputs[0].amount = 2.0
+        transactions[100].invalidate()
+        expected = [(3, 0), (70, 0), (100, 0), (149, 0)]
+        self.assertEqual(verify_transactions(transactions, workers=4), expected)
+        self.assertEqual(verify_transactions(transactions, workers=1), expected)
+        self.assertEqual(verify_transactions([]), [])
+
+    def test_verify_transactions_reports_input_index(self):
+        tx = Transaction(tx_outputs=[TxOutput("c", 1.0)])
+        for vout, private_key in enumerate((self.alice, self.bob)):
+            public_key = private_key.public_key().public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo)
+            tx.add_input(TxInput("prev", vout, public_key=public_key))
+        asyncio.run(tx.sign_input(0, self.alice))
+        coinbase = Transaction(tx_outputs=[TxOutput("alice", 50.0)])
+        self.assertEqual(verify_transactions([coinbase, tx]), [(1, 1)])  # Второй вход не подписан
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from Hash import sha256_hash, sha256_file, sha256_many
+from Merkle import MerkleTree, verify_proof, merkle_root
+from HashCache import HashCache
+from TreeHash import sha256_tree_file, verify_range
+
+
+def make_tree(directory, total_size):
+    # каталог из файлов разного размера: много мелких, немного средних и несколько крупных
+    sizes = [4 << 10] * 2000 + [1 << 20] * 100 + [64 << 20] * 4
+    scale = total_size / sum(sizes)
+    block = os.urandom(1 << 20)
+    paths = []
+    for i, size in enumerate(sizes):
+        size = max(1, int(size * scale))
+        path = os.path.join(directory, f"file{i:05d}.bin")
+        with open(path, "wb") as f:
+            for start in range(0, size, len(block)):
+                f.write(block[:min(len(block), size - start)])
+        paths.append(path)
+    return paths
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def read_whole(paths):
+    # прежний способ: прочитать файл целиком и передать в sha256_hash
+    result = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            result[path] = sha256_hash(f.read())
+    return result
+
+
+if __name__ == "__main__":
+    # общий размер каталога в МБ можно передать аргументом: python Bench-Hash.py 1024
+    total_size = int(float(sys.argv[1]) * 2**20) if len(sys.argv) > 1 else 512 * 2**20
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_tree(directory, total_size)
+        size = sum(os.path.getsize(path) for path in paths)
+        read_whole(paths)  # прогрев страничного кэша
+        gb = size / 2**30
+
+        seconds, reference = measure(read_whole, paths)
+        print(f"sha256_hash(f.read()), {len(paths)} файлов, {size / 2**20:.0f} МБ: {gb / seconds:6.2f} ГБ/с")
+
+        for chunk_size in (64 << 10, 256 << 10, 1 << 20, 4 << 20):
+            seconds, _ = measure(lambda: {path: sha256_file(path, chunk_size) for path in paths})
+            print(f"sha256_file, порция {chunk_size >> 10:5d} КБ: {gb / seconds:6.2f} ГБ/с")
+
+        for workers in sorted({1, 2, 4, 8, os.cpu_count() or 1}):
+            seconds, result = measure(lambda: dict(sha256_many(paths, workers)))
+            assert result == reference
+            print(f"sha256_many, потоков {workers:2d}: {gb / seconds:6.2f} ГБ/с")
+
+        # кэш хешей: первый запуск хеширует всё, второй берёт неизменённые файлы из базы
+        db_path = os.path.join(directory, "cache.sqlite")
+        for run in ("первый", "второй"):
+            with HashCache(db_path) as cache:
+                seconds, result = measure(lambda: dict(cache.sha256_many(paths)))
+                assert result == reference
+                print(f"HashCache, {run} запуск: {seconds:.2f} с; {cache.report()}")
+
+        # древовидный хеш одного большого файла: масштабирование по числу потоков
+        big_file = os.path.join(directory, "big.bin")
+        with open(big_file, "wb") as f:
+            block = os.urandom(1 << 20)
+            for _ in range(max(1, total_size >> 20)):
+                f.write(block)
+        big_gb = os.path.getsize(big_file) / 2**30
+        seconds, _ = measure(sha256_file, big_file)
+        print(f"sha256_file, один файл {big_gb:.2f} ГБ: {big_gb / seconds:6.2f} ГБ/с")
+        for workers in range(1, (os.cpu_count() or 1) + 1):
+            seconds, tree_hash = measure(sha256_tree_file, big_file, 4 << 20, workers)
+            print(f"sha256_tree_file, потоков {workers:2d}: {big_gb / seconds:6.2f} ГБ/с")
+        seconds, ok = measure(verify_range, big_file, int(big_gb * 2**30) // 2, 1 << 20, tree_hash, tree_hash.digest)
+        assert ok
+        print(f"verify_range 1 МБ из середины файла: {seconds * 1000:.1f} мс")
+
+    # дерево Меркла на 1 млн листьев: добавление, доказательства включения, изменение листа
+    count = 1_000_000
+    items = [i.to_bytes(8, "big") for i in range(count)]
+    tree = MerkleTree()
+    seconds, _ = measure(lambda: [tree.append(item) for item in items])
+    print(f"MerkleTree.append: {count / seconds:10.0f} листьев/с, память узлов "
+          f"{tree.nbytes / 2**20:.0f} МБ")
+    root = tree.root
+    indices = random.Random(0).sample(range(count), 10000)
+    seconds, proofs = measure(lambda: [tree.proof(i) for i in indices])
+    print(f"MerkleTree.proof:  {len(indices) / seconds:10.0f} доказательств/с ({len(proofs[0])} хешей)")
+    seconds, checks = measure(lambda: [verify_proof(items[i], i, count, proof, root) for i, proof in zip(indices, proofs)])
+    assert all(checks)
+    print(f"verify_proof:      {len(indices) / seconds:10.0f} проверок/с")
+    seconds, _ = measure(lambda: [tree.update(i, b"changed") or tree.root for i in indices[:1000]])
+    full_seconds, _ = measure(merkle_root, items)
+    print(f"изменение листа и новый корень: {seconds / 1000 * 1e6:.0f} мкс, "
+          f"пересчёт всего дерева: {full_seconds:.2f} с")
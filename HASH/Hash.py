@@ -1,4 +1,12 @@
 import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, Iterator, Optional, Tuple
+
+CHUNK_SIZE = 256 << 10  # размер порции при чтении файла (256 КБ)
+MMAP_THRESHOLD = 64 << 20  # файлы от этого размера отображаются в память (64 МБ)
+
 
 def sha256_hash(input_bytes: bytes) -> bytes:
     # функция принимает массив байт произвольной длины и возвращает хеш SHA-256 (32 байта).
@@ -6,6 +14,52 @@ def sha256_hash(input_bytes: bytes) -> bytes:
     sha256.update(input_bytes)
     return sha256.digest()
 
+
+def sha256_file(path: str, chunk_size: int = CHUNK_SIZE, mmap_threshold: int = MMAP_THRESHOLD) -> bytes:
+    # хеш SHA-256 файла без чтения его целиком в память.
+    # небольшие файлы читаются порциями в один и тот же буфер, большие отображаются в память (mmap)
+    # и передаются в хеш порциями через memoryview без копирования.
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= mmap_threshold and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)  # подсказка ядру: читать с опережением
+                with memoryview(mapped) as view:
+                    for start in range(0, size, chunk_size):
+                        sha256.update(view[start:start + chunk_size])
+        else:
+            buffer = bytearray(max(1, min(chunk_size, size)))  # мелким файлам - буфер по размеру файла
+            with memoryview(buffer) as view:
+                while True:
+                    count = f.readinto(buffer)
+                    if not count:
+                        break
+                    sha256.update(view[:count])
+    return sha256.digest()
+
+
+def sha256_many(paths: Iterable[str], workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+                mmap_threshold: int = MMAP_THRESHOLD) -> Iterator[Tuple[str, bytes]]:
+    # хеширует много файлов в пуле потоков (hashlib отпускает GIL на больших порциях) и выдаёт пары
+    # (путь, хеш) по мере готовности, а не в исходном порядке. в работе одновременно не больше
+    # 4 * workers файлов, поэтому список путей может быть сколь угодно длинным.
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    paths = iter(paths)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        while True:
+            for path in paths:
+                pending[pool.submit(sha256_file, path, chunk_size, mmap_threshold)] = path
+                if len(pending) >= 4 * workers:
+                    break
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
 # ввод данных с клавиатуры
 if __name__ == "__main__":
     user_input = input("Введите строку для хеширования: ")
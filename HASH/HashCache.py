@@ -0,0 +1,220 @@
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Hash import sha256_file, sha256_many
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hash_cache.sqlite")
+MAX_ENTRIES = 1_000_000  # сколько файлов помнит кэш; давно не использованные записи удаляются
+BATCH_SIZE = 10_000  # сколько изменений записывается в базу одной транзакцией
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path      TEXT PRIMARY KEY,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    inode     INTEGER NOT NULL,
+    digest    BLOB NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used);
+CREATE TABLE IF NOT EXISTS settings (
+    name  TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+Meta = Tuple[int, int, int]  # размер, время изменения (нс), номер inode
+
+
+def _meta(stat: os.stat_result) -> Meta:
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class HashCache:
+    # кэш хешей SHA-256 файлов в локальной базе SQLite.
+    # запись действительна, пока у файла те же путь, размер, время изменения и inode;
+    # иначе файл хешируется заново. изменения копятся в памяти и записываются пачками
+    # в одной транзакции, поэтому проход по миллиону файлов не упирается в fsync.
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_entries: int = MAX_ENTRIES,
+                 batch_size: int = BATCH_SIZE):
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self._db = sqlite3.connect(db_path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._pending: Dict[str, Tuple[Meta, bytes]] = {}  # новые хеши, ещё не записанные в базу
+        self._touched: Dict[str, float] = {}  # попадания в кэш: обновить last_used
+        # статистика текущего запуска
+        self.hits = 0
+        self.misses = 0
+        self.hit_bytes = 0
+        self.hashed_bytes = 0
+        self.hash_seconds = 0.0
+
+    def _cached(self, path: str, meta: Meta) -> Optional[bytes]:
+        pending = self._pending.get(path)
+        if pending is not None:
+            return pending[1] if pending[0] == meta else None
+        row = self._db.execute("SELECT size, mtime_ns, inode, digest FROM hashes WHERE path = ?",
+                               (path,)).fetchone()
+        if row is None or tuple(row[:3]) != meta:
+            return None
+        return bytes(row[3])
+
+    def _hit(self, path: str, meta: Meta) -> None:
+        self.hits += 1
+        self.hit_bytes += meta[0]
+        self._touched[path] = time.time()
+        self._maybe_flush()
+
+    def _store(self, path: str, meta: Meta, digest: bytes) -> None:
+        self.misses += 1
+        self.hashed_bytes += meta[0]
+        # файл мог измениться во время хеширования - тогда хеш не сохраняем
+        try:
+            unchanged = _meta(os.stat(path)) == meta
+        except OSError:
+            unchanged = False
+        if unchanged:
+            self._pending[path] = (meta, digest)
+            self._touched.pop(path, None)
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if len(self._pending) + len(self._touched) >= self.batch_size:
+            self.flush()
+
+    def sha256(self, path: str) -> bytes:
+        # хеш файла: из кэша, если метаданные совпадают, иначе вычисляется заново
+        path = os.path.abspath(path)
+        meta = _meta(os.stat(path))
+        digest = self._cached(path, meta)
+        if digest is not None:
+            self._hit(path, meta)
+            return digest
+        start = time.perf_counter()
+        digest = sha256_file(path)
+        self.hash_seconds += time.perf_counter() - start
+        self._store(path, meta, digest)
+        return digest
+
+    def sha256_many(self, paths: Iterable[str], workers: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+        # хеши многих файлов: попадания выдаются сразу, остальные файлы хешируются в пуле потоков
+        # (Hash.sha256_many) и выдаются по мере готовности. пути - как переданы; на каждый переданный
+        # путь выдаётся одна пара, даже если файл передан несколько раз (или под разными записями
+        # одного пути): отсутствующий в кэше файл хешируется один раз, повторы промаха в статистике
+        # не учитываются.
+        misses: Dict[str, Tuple[List[str], Meta]] = {}
+        for path in paths:
+            full_path = os.path.abspath(path)
+            if full_path in misses:
+                misses[full_path][0].append(path)
+                continue
+            meta = _meta(os.stat(full_path))
+            digest = self._cached(full_path, meta)
+            if digest is not None:
+                self._hit(full_path, meta)
+                yield path, digest
+            else:
+                misses[full_path] = ([path], meta)
+        if not misses:
+            return
+        start = time.perf_counter()
+        try:
+            for full_path, digest in sha256_many(list(misses), workers):
+                originals, meta = misses[full_path]
+                self._store(full_path, meta, digest)
+                for path in originals:
+                    yield path, digest
+        finally:
+            # время учитывается и тогда, когда результаты прочитаны не до конца
+            self.hash_seconds += time.perf_counter() - start
+
+    def flush(self) -> None:
+        # записывает накопленные изменения одной транзакцией и удаляет лишние записи
+        if not self._pending and not self._touched:
+            return
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO hashes (path, size, mtime_ns, inode, digest, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, *meta, digest, now) for path, (meta, digest) in self._pending.items()])
+            self._db.executemany("UPDATE hashes SET last_used = ? WHERE path = ?",
+                                 [(used, path) for path, used in self._touched.items()])
+            self._pending.clear()
+            self._touched.clear()
+            self._evict()
+            if self.hash_seconds > 0 and self.hashed_bytes > 0:
+                # скорость хеширования запоминается для оценки экономии в следующих запусках
+                self._db.execute("INSERT OR REPLACE INTO settings (name, value) VALUES ('hash_speed', ?)",
+                                 (self.hashed_bytes / self.hash_seconds,))
+
+    def _evict(self) -> None:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM hashes").fetchone()
+        if count > self.max_entries:
+            self._db.execute("DELETE FROM hashes WHERE path IN "
+                             "(SELECT path FROM hashes ORDER BY last_used LIMIT ?)",
+                             (count - self.max_entries,))
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._db.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        # доля попаданий и оценка сэкономленного времени: байты из кэша при средней скорости
+        # хеширования в этом запуске (или в прошлых, если в этом всё взято из кэша)
+        total = self.hits + self.misses
+        if self.hash_seconds > 0 and self.hashed_bytes > 0:
+            speed = self.hashed_bytes / self.hash_seconds
+        else:
+            row = self._db.execute("SELECT value FROM settings WHERE name = 'hash_speed'").fetchone()
+            speed = row[0] if row else None
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "hit_bytes": self.hit_bytes,
+            "hashed_bytes": self.hashed_bytes,
+            "hash_seconds": self.hash_seconds,
+            "saved_seconds": self.hit_bytes / speed if speed else 0.0,
+        }
+
+    def report(self) -> str:
+        stats = self.stats()
+        return (f"файлов: {stats['hits'] + stats['misses']}, из кэша: {stats['hits']} "
+                f"({stats['hit_rate']:.1%}), захешировано заново: {stats['misses']} "
+                f"({stats['hashed_bytes'] / 2**20:.1f} МБ за {stats['hash_seconds']:.2f} с), "
+                f"сэкономлено около {stats['saved_seconds']:.2f} с")
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _walk(directory: str) -> List[str]:
+    return [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+
+
+if __name__ == "__main__":
+    # python HashCache.py <каталог> [файл базы] - хеширует все файлы каталога с использованием кэша
+    if len(sys.argv) < 2:
+        print("Использование: python HashCache.py <каталог> [файл базы]")
+        sys.exit(1)
+    db_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_DB_PATH
+    with HashCache(db_path) as cache:
+        start = time.perf_counter()
+        for path, digest in cache.sha256_many(_walk(sys.argv[1])):
+            print(f"{digest.hex()}  {path}")
+        print(f"\n{cache.report()}, всего {time.perf_counter() - start:.2f} с", file=sys.stderr)
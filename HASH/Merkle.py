@@ -0,0 +1,197 @@
+from typing import Dict, Iterable, List, Tuple, Union
+
+from Hash import sha256_hash
+
+HASH_SIZE = 32
+LEAF_PREFIX = b"\x00"  # разделение доменов: хеш листа и хеш узла не могут совпасть
+NODE_PREFIX = b"\x01"
+
+Data = Union[bytes, bytearray, memoryview, str]
+
+
+def _to_bytes(data: Data) -> bytes:
+    # строки (например, id транзакций) хешируются в кодировке UTF-8
+    return data.encode("utf-8") if isinstance(data, str) else bytes(data)
+
+
+def leaf_hash(data: Data) -> bytes:
+    # хеш листа: SHA-256(0x00 || данные)
+    return sha256_hash(LEAF_PREFIX + _to_bytes(data))
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    # хеш внутреннего узла: SHA-256(0x01 || левый || правый)
+    return sha256_hash(NODE_PREFIX + left + right)
+
+
+class MerkleTree:
+    # дерево Меркла с добавлением листьев за амортизированные O(1) хешей.
+    # уровень L хранит хеши полных поддеревьев из 2**L листьев подряд в одном bytearray
+    # (по 32 байта на узел), без отдельного объекта Python на каждый узел.
+    # узлы правого края, ещё не ставшие полными, вычисляются по запросу за O(log n):
+    # одиночный узел без пары переносится на уровень выше без изменений.
+
+    def __init__(self, items: Iterable[Data] = ()):
+        self._levels: List[bytearray] = [bytearray()]
+        self._size = 0
+        self._edge: Dict[Tuple[int, int], bytes] = {}  # кэш узлов правого края до следующего изменения
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _stored(self, level: int, index: int) -> bytes:
+        start = index * HASH_SIZE
+        return bytes(self._levels[level][start:start + HASH_SIZE])
+
+    def _complete(self, level: int) -> int:
+        # число полных узлов на уровне
+        return self._size >> level
+
+    def append_hash(self, leaf: bytes) -> int:
+        # добавляет готовый хеш листа и возвращает номер листа
+        if len(leaf) != HASH_SIZE:
+            raise ValueError(f"Хеш листа должен занимать {HASH_SIZE} байта")
+        index = self._size
+        self._levels[0] += leaf
+        self._size += 1
+        self._edge.clear()
+        # поднимаемся, пока узел правый: тогда его родитель стал полным
+        level, node, current = 0, index, leaf
+        while node % 2 == 1:
+            current = node_hash(self._stored(level, node - 1), current)
+            level += 1
+            node //= 2
+            if level == len(self._levels):
+                self._levels.append(bytearray())
+            self._levels[level] += current
+        return index
+
+    def append(self, data: Data) -> int:
+        # добавляет лист с данными data и возвращает его номер
+        return self.append_hash(leaf_hash(data))
+
+    def extend(self, items: Iterable[Data]) -> None:
+        for data in items:
+            self.append_hash(leaf_hash(data))
+
+    def update(self, index: int, data: Data) -> None:
+        # заменяет данные листа и пересчитывает только полные узлы на пути к корню - O(log n)
+        if not 0 <= index < self._size:
+            raise IndexError("Номер листа вне дерева")
+        current = leaf_hash(data)
+        self._levels[0][index * HASH_SIZE:(index + 1) * HASH_SIZE] = current
+        self._edge.clear()
+        level, node = 0, index
+        while node // 2 < self._complete(level + 1):  # родитель полный - пересчитываем его
+            sibling = self._stored(level, node ^ 1)
+            current = node_hash(sibling, current) if node % 2 else node_hash(current, sibling)
+            level += 1
+            node //= 2
+            self._levels[level][node * HASH_SIZE:(node + 1) * HASH_SIZE] = current
+
+    def _node(self, level: int, index: int) -> bytes:
+        # хеш узла index на уровне level (полного - из буфера, правого края - вычисляется)
+        if index < self._complete(level):
+            return self._stored(level, index)
+        cached = self._edge.get((level, index))
+        if cached is not None:
+            return cached
+        left = self._node(level - 1, 2 * index)
+        if 2 * index + 1 < self._width(level - 1):
+            result = node_hash(left, self._node(level - 1, 2 * index + 1))
+        else:
+            result = left  # одиночный узел переносится выше без изменений
+        self._edge[(level, index)] = result
+        return result
+
+    def _width(self, level: int) -> int:
+        # число узлов на уровне с учётом неполного правого края
+        return -(-self._size >> level) if self._size else 0
+
+    @property
+    def nbytes(self) -> int:
+        # память, занятая хешами полных узлов всех уровней (байт)
+        return sum(len(level) for level in self._levels)
+
+    @property
+    def height(self) -> int:
+        return (self._size - 1).bit_length() if self._size else 0
+
+    @property
+    def root(self) -> bytes:
+        # корень пустого дерева - хеш пустой строки
+        if self._size == 0:
+            return sha256_hash(b"")
+        return self._node(self.height, 0)
+
+    def leaf(self, index: int) -> bytes:
+        # хеш листа index
+        if not 0 <= index < self._size:
+            raise IndexError("Номер листа вне дерева")
+        return self._stored(0, index)
+
+    def proof(self, index: int) -> List[bytes]:
+        # доказательство включения листа: хеши соседних узлов от листа к корню.
+        # сторона соседа определяется номером листа и размером дерева (см. verify_proof).
+        if not 0 <= index < self._size:
+            raise IndexError("Номер листа вне дерева")
+        result = []
+        node = index
+        for level in range(self.height):
+            sibling = node ^ 1
+            if sibling < self._width(level):
+                result.append(self._node(level, sibling))
+            node //= 2
+        return result
+
+
+def verify_proof(data: Data, index: int, size: int, proof: List[bytes], root: bytes,
+                 hashed: bool = False) -> bool:
+    # проверяет, что лист с данными data (или готовым хешем листа при hashed=True) стоит под номером
+    # index в дереве из size листьев с корнем root. пересчитываются только O(log n) узлов.
+    if not 0 <= index < size:
+        return False
+    current = bytes(data) if hashed else leaf_hash(data)
+    proof = iter(proof)
+    node, width = index, size
+    try:
+        while width > 1:
+            if node % 2 == 1:
+                current = node_hash(next(proof), current)
+            elif node + 1 < width:
+                current = node_hash(current, next(proof))
+            node //= 2
+            width = (width + 1) // 2
+    except StopIteration:
+        return False  # доказательство короче, чем нужно
+    if next(proof, None) is not None:
+        return False  # лишние элементы доказательства
+    return current == root
+
+
+def merkle_root(items: Iterable[Data]) -> bytes:
+    # корень дерева Меркла для набора данных, например id транзакций блока
+    return MerkleTree(items).root
+
+
+def transactions_root(transactions: Iterable) -> bytes:
+    # корень дерева Меркла по id транзакций блока (например, Blockchain.Transaction):
+    # лист - строка id в кодировке UTF-8, порядок листьев - порядок транзакций в блоке
+    return merkle_root(tx.id for tx in transactions)
+
+
+if __name__ == "__main__":
+    lines = []
+    print("Введите строки - листья дерева (пустая строка - конец ввода):")
+    while True:
+        line = input()
+        if not line:
+            break
+        lines.append(line)
+    tree = MerkleTree(lines)
+    print(f"Листьев: {len(tree)}, корень дерева Меркла (hex): {tree.root.hex()}")
+    for index, line in enumerate(lines):
+        proof = tree.proof(index)
+        print(f"{line!r}: доказательство из {len(proof)} хешей, "
+              f"проверка: {verify_proof(line, index, len(tree), proof, tree.root)}")
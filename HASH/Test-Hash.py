@@ -0,0 +1,307 @@
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import unittest
+from Hash import sha256_hash, sha256_file, sha256_many
+from unittest.mock import patch
+import HashCache as hash_cache
+from HashCache import HashCache
+from Merkle import MerkleTree, leaf_hash, merkle_root, transactions_root, verify_proof
+from TreeHash import TreeHash, sha256_tree_file, verify_range
+
+BLOCKCHAIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Blockchain")
+
+
+def rfc6962_root(items):
+    # корень по определению RFC 6962: MTH(D[n]) = SHA-256(0x01 || MTH(D[0:k]) || MTH(D[k:n])),
+    # k - наибольшая степень двойки, меньшая n
+    if not items:
+        return hashlib.sha256(b"").digest()
+    if len(items) == 1:
+        return hashlib.sha256(b"\x00" + items[0]).digest()
+    k = 1 << ((len(items) - 1).bit_length() - 1)
+    return hashlib.sha256(b"\x01" + rfc6962_root(items[:k]) + rfc6962_root(items[k:])).digest()
+
+
+class TestHash(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, data):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_sha256_hash(self):
+        self.assertEqual(sha256_hash(b"").hex(),
+                         "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855")
+        self.assertEqual(sha256_hash(b"abc").hex(),
+                         "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad")
+
+    def test_sha256_file(self):
+        for size in (0, 1, 1000, 4096, 4097, 100000):
+            data = os.urandom(size)
+            path = self.write(f"file{size}", data)
+            expected = hashlib.sha256(data).digest()
+            self.assertEqual(sha256_file(path), expected)
+            # Мелкие порции и отображение в память дают тот же хеш
+            self.assertEqual(sha256_file(path, chunk_size=4096), expected)
+            self.assertEqual(sha256_file(path, chunk_size=4096, mmap_threshold=1), expected)
+
+    def test_sha256_file_missing(self):
+        with self.assertRaises(OSError):
+            sha256_file(os.path.join(self.directory.name, "missing"))
+
+    def test_sha256_many(self):
+        # Файлов больше, чем окно 4 * workers: выдаются все, в любом порядке
+        expected = {}
+        for i in range(50):
+            data = os.urandom(i * 37)
+            expected[self.write(f"file{i}", data)] = hashlib.sha256(data).digest()
+        for workers in (1, 3):
+            self.assertEqual(dict(sha256_many(expected, workers)), expected)
+        self.assertEqual(list(sha256_many([])), [])
+
+
+class TestMerkle(unittest.TestCase):
+
+    def test_root_matches_rfc6962(self):
+        items = [os.urandom(i % 7) for i in range(70)]
+        tree = MerkleTree()
+        self.assertEqual(tree.root, rfc6962_root([]))
+        for size in range(1, len(items) + 1):
+            tree.append(items[size - 1])
+            self.assertEqual(tree.root, rfc6962_root(items[:size]))
+        self.assertEqual(merkle_root(items), rfc6962_root(items))
+        self.assertEqual(merkle_root(["tx1", "tx2"]), rfc6962_root([b"tx1", b"tx2"]))  # Строки - в UTF-8
+
+    def test_proofs(self):
+        for size in (1, 2, 3, 5, 8, 13, 33):
+            items = [f"item{i}".encode() for i in range(size)]
+            tree = MerkleTree(items)
+            root = tree.root
+            for index in range(size):
+                proof = tree.proof(index)
+                self.assertTrue(verify_proof(items[index], index, size, proof, root))
+                self.assertTrue(verify_proof(tree.leaf(index), index, size, proof, root, hashed=True))
+                self.assertFalse(verify_proof(b"other", index, size, proof, root))
+                self.assertFalse(verify_proof(items[index], index, size, proof + [root], root))
+                if proof:
+                    self.assertFalse(verify_proof(items[index], index, size, proof[:-1], root))
+                if index ^ 1 < size:  # Тот же лист под номером соседа
+                    self.assertFalse(verify_proof(items[index], index ^ 1, size, proof, root))
+            self.assertFalse(verify_proof(items[0], size, size, [], root))
+            with self.assertRaises(IndexError):
+                tree.proof(size)
+
+    def test_update(self):
+        rng = random.Random(3)
+        for size in (1, 2, 7, 16, 21):
+            items = [os.urandom(8) for _ in range(size)]
+            tree = MerkleTree(items)
+            for _ in range(20):
+                index = rng.randrange(size)
+                items[index] = os.urandom(8)
+                tree.update(index, items[index])
+                self.assertEqual(tree.root, rfc6962_root(items))
+                self.assertEqual(tree.leaf(index), leaf_hash(items[index]))
+            tree.append(b"more")  # Добавление после изменений
+            self.assertEqual(tree.root, rfc6962_root(items + [b"more"]))
+        with self.assertRaises(IndexError):
+            MerkleTree().update(0, b"x")
+
+    def test_append_hash_and_nbytes(self):
+        tree = MerkleTree()
+        with self.assertRaises(ValueError):
+            tree.append_hash(b"short")
+        self.assertEqual(tree.nbytes, 0)
+        tree.extend([b"a", b"b", b"c", b"d"])
+        self.assertEqual(tree.nbytes, 32 * (4 + 2 + 1))  # Только полные узлы
+
+    @unittest.skipUnless(os.path.isdir(BLOCKCHAIN_DIR), "нет каталога Blockchain")
+    def test_transactions_root(self):
+        sys.path.insert(0, BLOCKCHAIN_DIR)
+        try:
+            from Blockchain import Transaction, TxOutput
+        except ImportError as error:  # Нужна библиотека cryptography
+            self.skipTest(str(error))
+        finally:
+            sys.path.remove(BLOCKCHAIN_DIR)
+        transactions = [Transaction(tx_outputs=[TxOutput(f"address{i}", float(i + 1))]) for i in range(5)]
+        root = transactions_root(transactions)
+        self.assertEqual(root, rfc6962_root([tx.id.encode() for tx in transactions]))
+        tree = MerkleTree(tx.id for tx in transactions)
+        self.assertTrue(verify_proof(transactions[2].id, 2, 5, tree.proof(2), root))
+        transactions[2].add_output(TxOutput("changed", 1.0))  # Изменение транзакции меняет её id и корень
+        self.assertNotEqual(transactions_root(transactions), root)
+
+
+class TestHashCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.db_path = os.path.join(self.directory.name, "cache.sqlite")
+
+    def write(self, name, data):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_default_path_next_to_module(self):
+        # База по умолчанию не зависит от текущего каталога
+        self.assertEqual(os.path.dirname(hash_cache.DEFAULT_DB_PATH),
+                         os.path.dirname(os.path.abspath(hash_cache.__file__)))
+
+    def test_hits_and_changes(self):
+        path = self.write("a.bin", b"first")
+        with HashCache(self.db_path) as cache:
+            self.assertEqual(cache.sha256(path), sha256_hash(b"first"))
+            self.assertEqual(cache.sha256(path), sha256_hash(b"first"))  # Из ещё не записанной пачки
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+        with HashCache(self.db_path) as cache:  # Из базы после повторного открытия
+            self.assertEqual(cache.sha256(path), sha256_hash(b"first"))
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+            self.write("a.bin", b"second, longer")  # Другой размер - хеш считается заново
+            self.assertEqual(cache.sha256(path), sha256_hash(b"second, longer"))
+            self.assertEqual(cache.misses, 1)
+            self.assertEqual(cache.stats()["hit_rate"], 0.5)
+            self.assertIn("из кэша: 1", cache.report())
+
+    def test_changed_during_hashing_not_stored(self):
+        path = self.write("a.bin", b"data")
+        original = hash_cache.sha256_file
+
+        def hash_and_modify(file_path):
+            digest = original(file_path)
+            with open(file_path, "ab") as f:
+                f.write(b"appended")
+            return digest
+
+        with HashCache(self.db_path) as cache:
+            with patch.object(hash_cache, "sha256_file", hash_and_modify):
+                cache.sha256(path)
+            self.assertEqual(len(cache), 0)
+            self.assertEqual(cache.sha256(path), sha256_hash(b"dataappended"))
+            self.assertEqual(cache.misses, 2)
+
+    def test_batches_and_eviction(self):
+        paths = [self.write(f"file{i}", bytes([i])) for i in range(10)]
+        with HashCache(self.db_path, max_entries=4, batch_size=3) as cache:
+            for path in paths:
+                cache.sha256(path)
+            cache.flush()
+            self.assertEqual(len(cache), 4)
+        with HashCache(self.db_path, max_entries=4) as cache:
+            for path in paths[-4:]:  # Остались последние использованные
+                cache.sha256(path)
+            self.assertEqual(cache.hits, 4)
+            self.assertEqual(cache.misses, 0)
+
+    def test_touched_entries_survive_eviction(self):
+        paths = [self.write(f"file{i}", bytes([i])) for i in range(4)]
+        with HashCache(self.db_path, max_entries=4) as cache:
+            for path in paths:
+                cache.sha256(path)
+        with HashCache(self.db_path, max_entries=4) as cache:
+            cache.sha256(paths[0])  # Попадание обновляет last_used
+            cache.sha256(self.write("new", b"new"))
+        with HashCache(self.db_path, max_entries=4) as cache:
+            cache.sha256(paths[0])
+            cache.sha256(paths[1])  # Вытеснен как самый давний
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_sha256_many(self):
+        paths = [self.write(f"file{i}", os.urandom(100 * i)) for i in range(8)]
+        expected = [(path, sha256_file(path)) for path in paths]
+        relative = os.path.relpath(paths[0])
+        with HashCache(self.db_path) as cache:
+            cache.sha256(paths[1])
+            # Повторы и другое написание того же пути дают по одной паре на каждый переданный путь
+            result = list(cache.sha256_many(paths + [paths[2], relative], workers=2))
+            self.assertEqual(sorted(result), sorted(expected + [expected[2], (relative, expected[0][1])]))
+            self.assertEqual(cache.hits, 1)
+            self.assertEqual(cache.misses, 1 + 7)  # paths[1] - до sha256_many, остальные 7 файлов - по разу
+
+    def test_sha256_many_stopped_early(self):
+        paths = [self.write(f"file{i}", os.urandom(1000)) for i in range(20)]
+        with HashCache(self.db_path) as cache:
+            results = cache.sha256_many(paths, workers=2)
+            next(results)
+            results.close()
+            self.assertGreater(cache.hash_seconds, 0)
+            self.assertGreater(cache.stats()["hash_seconds"], 0)
+
+
+class TestTreeHash(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.data = os.urandom(10 * 1000 + 123)  # Последний лист неполный
+        self.path = os.path.join(self.directory.name, "big.bin")
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+
+    def test_digest_matches_reference(self):
+        leaf_size = 1000
+        leaves = [self.data[start:start + leaf_size] for start in range(0, len(self.data), leaf_size)]
+        header = b"TH" + bytes([1]) + leaf_size.to_bytes(8, "big") + len(self.data).to_bytes(8, "big")
+        expected = hashlib.sha256(b"\x02" + header + rfc6962_root(leaves)).digest()
+        for workers in (1, 3):
+            tree_hash = sha256_tree_file(self.path, leaf_size, workers)
+            self.assertEqual(tree_hash.digest, expected)
+        self.assertEqual(tree_hash.hexdigest(), f"sha256-tree-v1:{leaf_size}:{expected.hex()}")
+        # Другой размер листа - другой хеш
+        self.assertNotEqual(sha256_tree_file(self.path, 2000).digest, expected)
+
+    def test_empty_file(self):
+        path = os.path.join(self.directory.name, "empty.bin")
+        open(path, "wb").close()
+        tree_hash = sha256_tree_file(path, 1000)
+        self.assertEqual(len(tree_hash.tree), 0)
+        self.assertTrue(verify_range(path, 0, 0, tree_hash, tree_hash.digest))
+        with self.assertRaises(ValueError):
+            sha256_tree_file(path, 0)
+
+    def test_to_bytes_roundtrip_and_validation(self):
+        tree_hash = sha256_tree_file(self.path, 1000)
+        data = tree_hash.to_bytes()
+        restored = TreeHash.from_bytes(data)
+        self.assertEqual(restored.digest, tree_hash.digest)
+        self.assertEqual((restored.size, restored.leaf_size), (tree_hash.size, tree_hash.leaf_size))
+        bad_magic = b"XX" + data[2:]
+        bad_version = data[:2] + bytes([2]) + data[3:]
+        zero_leaf = data[:3] + bytes(8) + data[11:]
+        for broken in (data[:-1], data[:-32], data + bytes(32), data[:10], bad_magic, bad_version, zero_leaf):
+            with self.assertRaises(ValueError):
+                TreeHash.from_bytes(broken)
+
+    def test_verify_range(self):
+        tree_hash = TreeHash.from_bytes(sha256_tree_file(self.path, 1000).to_bytes())
+        size = len(self.data)
+        for start, length in ((0, 1), (999, 2), (size - 1, 1), (size - 123, 123), (9500, size - 9500), (0, size)):
+            self.assertTrue(verify_range(self.path, start, length, tree_hash, tree_hash.digest))
+        self.assertFalse(verify_range(self.path, 0, 1, tree_hash, bytes(32)))  # Чужой итоговый хеш
+        with self.assertRaises(ValueError):
+            verify_range(self.path, size - 1, 2, tree_hash)
+
+    def test_verify_range_tampered(self):
+        tree_hash = sha256_tree_file(self.path, 1000)
+        with open(self.path, "r+b") as f:
+            f.seek(len(self.data) - 1)  # Последний байт неполного листа
+            f.write(bytes([self.data[-1] ^ 1]))
+        self.assertFalse(verify_range(self.path, len(self.data) - 50, 50, tree_hash))
+        self.assertTrue(verify_range(self.path, 0, 10000, tree_hash))  # Полные листья не затронуты
+        with open(self.path, "ab") as f:
+            f.write(b"x")  # Размер файла изменился
+        self.assertFalse(verify_range(self.path, 0, 1, tree_hash))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from Merkle import HASH_SIZE, LEAF_PREFIX, MerkleTree, verify_proof
+
+# Формат древовидного хеша файла, версия 1:
+#   файл делится на листья по leaf_size байт (последний лист короче, у пустого файла листьев нет);
+#   хеш листа  = SHA-256(0x00 || байты листа), узлы и корень - как в Merkle.MerkleTree
+#                (SHA-256(0x01 || левый || правый), одиночный узел переносится выше);
+#   итоговый хеш = SHA-256(0x02 || "TH" || версия (1 байт) || leaf_size (8 байт) || размер файла (8 байт) || корень),
+#                  числа - big-endian. Префикс 0x02 отделяет итоговый хеш от хешей листьев и узлов,
+#                  а размер листа и версия в заголовке не дают спутать хеши с разными параметрами.
+#   текстовая запись: "sha256-tree-v1:<leaf_size>:<hex итогового хеша>".
+VERSION = 1
+LEAF_SIZE = 4 << 20  # 4 МБ
+ROOT_PREFIX = b"\x02"
+_HEADER = struct.Struct(">2sBQQ")  # "TH", версия, размер листа, размер файла
+
+
+def _hash_leaf(view, start: int, leaf_size: int) -> bytes:
+    # хеш одного листа прямо из отображённого в память файла, без копирования
+    sha256 = hashlib.sha256(LEAF_PREFIX)
+    sha256.update(view[start:start + leaf_size])
+    return sha256.digest()
+
+
+class TreeHash:
+    # древовидный хеш файла: размер файла, размер листа и дерево Меркла по хешам листьев.
+    # хеши листьев можно сохранить (to_bytes) и потом проверять любой диапазон байтов файла,
+    # хешируя только затронутые листья (verify_range).
+
+    def __init__(self, size: int, leaf_size: int, tree: MerkleTree):
+        self.size = size
+        self.leaf_size = leaf_size
+        self.tree = tree
+
+    @property
+    def header(self) -> bytes:
+        return _HEADER.pack(b"TH", VERSION, self.leaf_size, self.size)
+
+    @property
+    def digest(self) -> bytes:
+        return hashlib.sha256(ROOT_PREFIX + self.header + self.tree.root).digest()
+
+    def hexdigest(self) -> str:
+        return f"sha256-tree-v{VERSION}:{self.leaf_size}:{self.digest.hex()}"
+
+    def to_bytes(self) -> bytes:
+        # заголовок и хеши всех листьев подряд - этого достаточно, чтобы восстановить дерево
+        leaves = b"".join(self.tree.leaf(index) for index in range(len(self.tree)))
+        return self.header + leaves
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TreeHash":
+        if len(data) < _HEADER.size or (len(data) - _HEADER.size) % HASH_SIZE != 0:
+            raise ValueError("Неверная длина данных древовидного хеша")
+        magic, version, leaf_size, size = _HEADER.unpack_from(data)
+        if magic != b"TH" or version != VERSION or leaf_size == 0:
+            raise ValueError("Неизвестный формат или версия древовидного хеша")
+        count = (len(data) - _HEADER.size) // HASH_SIZE
+        if count != -(-size // leaf_size):
+            raise ValueError("Число листьев не соответствует размеру файла")
+        tree = MerkleTree()
+        for start in range(_HEADER.size, len(data), HASH_SIZE):
+            tree.append_hash(data[start:start + HASH_SIZE])
+        return cls(size, leaf_size, tree)
+
+
+def sha256_tree_file(path: str, leaf_size: int = LEAF_SIZE, workers: Optional[int] = None) -> TreeHash:
+    # древовидный хеш файла: листья хешируются параллельно в пуле потоков над mmap
+    # (hashlib отпускает GIL), затем хеши листьев собираются в дерево Меркла.
+    if leaf_size <= 0:
+        raise ValueError("Размер листа должен быть положительным")
+    workers = workers or os.cpu_count() or 1
+    tree = MerkleTree()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                starts = range(0, size, leaf_size)
+                if workers == 1:
+                    leaves = [_hash_leaf(view, start, leaf_size) for start in starts]
+                else:
+                    with ThreadPoolExecutor(max_workers=workers) as pool:
+                        leaves = list(pool.map(lambda start: _hash_leaf(view, start, leaf_size), starts))
+            for leaf in leaves:
+                tree.append_hash(leaf)
+    return TreeHash(size, leaf_size, tree)
+
+
+def verify_range(path: str, start: int, length: int, tree_hash: TreeHash,
+                 expected_digest: Optional[bytes] = None) -> bool:
+    # проверяет байты [start, start + length) файла: хешируются только затронутые листья,
+    # и каждый проверяется доказательством включения по корню tree_hash.
+    # если задан expected_digest, сначала проверяется, что сохранённое дерево даёт этот итоговый хеш.
+    if expected_digest is not None and tree_hash.digest != expected_digest:
+        return False
+    if start < 0 or length < 0 or start + length > tree_hash.size:
+        raise ValueError("Диапазон выходит за пределы файла")
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size != tree_hash.size:
+            return False
+        if length == 0:
+            return True
+        leaf_size = tree_hash.leaf_size
+        first, last = start // leaf_size, (start + length - 1) // leaf_size
+        root = tree_hash.tree.root
+        count = len(tree_hash.tree)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            for index in range(first, last + 1):
+                leaf = _hash_leaf(view, index * leaf_size, leaf_size)
+                if not verify_proof(leaf, index, count, tree_hash.tree.proof(index), root, hashed=True):
+                    return False
+    return True
+
+
+if __name__ == "__main__":
+    # python TreeHash.py <файл> [размер листа в МБ] - выводит древовидный хеш файла
+    if len(sys.argv) < 2:
+        print("Использование: python TreeHash.py <файл> [размер листа в МБ]")
+        sys.exit(1)
+    leaf_size = int(float(sys.argv[2]) * 2**20) if len(sys.argv) > 2 else LEAF_SIZE
+    print(f"{sha256_tree_file(sys.argv[1], leaf_size).hexdigest()}  {sys.argv[1]}")
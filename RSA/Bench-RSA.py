@@ -0,0 +1,167 @@
+import inspect
+import os
+import shutil
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from RSA import sieve_of_eratosthenes, generate_keys, encrypt, decrypt, PRIME_LIMIT, PRIMES_CACHE_ENV
+from RSA import modinv, batch_modinv
+from RSA import encrypt_bytes, decrypt_bytes, decrypt_many
+
+
+def sieve_reference(limit):
+    # Исходное решето по списку из limit + 1 значений bool - точка отсчёта для замеров
+    is_prime = [True] * (limit + 1)
+    is_prime[0] = is_prime[1] = False
+    for num in range(2, int(limit**0.5) + 1):
+        if is_prime[num]:
+            for multiple in range(num*num, limit + 1, num):
+                is_prime[multiple] = False
+    return [num for num, prime in enumerate(is_prime) if prime]
+
+
+def extended_gcd_reference(a, b):
+    # Исходный рекурсивный алгоритм Евклида
+    if a == 0:
+        return (b, 0, 1)
+    g, y, x = extended_gcd_reference(b % a, a)
+    return (g, x - (b // a) * y, y)
+
+
+def measure(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# Замер в отдельном процессе: время от начала импорта и пиковая память процесса в КБ.
+# ru_maxrss в Linux наследуется от родителя при fork, поэтому сначала читаем VmHWM из /proc.
+STARTUP_PROBE = '''
+import resource, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+try:
+    with open("/proc/self/status") as f:
+        peak = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, peak)
+'''
+
+
+def startup(code, env=None, repeat=5):
+    best_time, best_rss = float("inf"), float("inf")
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", STARTUP_PROBE.format(code=code)], env=env,
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout.split()
+        best_time, best_rss = min(best_time, float(output[0])), min(best_rss, int(output[1]))
+    return best_time, best_rss / 1024
+
+
+if __name__ == "__main__":
+    old_time, old_primes = measure(sieve_reference, PRIME_LIMIT)
+    new_time, new_primes = measure(sieve_of_eratosthenes, PRIME_LIMIT)
+    assert old_primes == new_primes
+    print(f"решето до {PRIME_LIMIT}: {old_time:.3f} с (исходное) -> {new_time:.3f} с (нечётные, bytearray)")
+
+    env = {key: value for key, value in os.environ.items() if key != PRIMES_CACHE_ENV}
+    with tempfile.TemporaryDirectory() as directory:
+        cache_env = dict(env, **{PRIMES_CACHE_ENV: os.path.join(directory, "primes.bin")})
+        startup("import RSA; RSA.PRIMES", cache_env, repeat=1)  # Создаём файл кэша
+        cases = [
+            ("python без импорта", "pass", env),
+            ("import RSA + исходное решето", "import RSA\n" + inspect.getsource(sieve_reference)
+             + "PRIMES = sieve_reference(1000000)", env),
+            ("import RSA", "import RSA", env),
+            ("import RSA; RSA.PRIMES", "import RSA; RSA.PRIMES", env),
+            ("import RSA; RSA.PRIMES (mmap-кэш)", "import RSA; RSA.PRIMES", cache_env),
+        ]
+        for name, code, case_env in cases:
+            seconds, rss = startup(code, case_env)
+            print(f"{name:<36} {seconds * 1000:8.1f} мс  {rss:7.1f} МБ")
+
+    # Модулярная инверсия: рекурсивный и итеративный алгоритм Евклида, приём Монтгомери для пачки чисел
+    rng = random.Random(18)
+    for bits in (256, 1024):
+        m = 2**bits - 189 if bits == 256 else 2**1024 - 105  # Простые модули
+        values = [rng.randrange(1, m) for _ in range(10000)]
+        old_time, old_result = measure(lambda: [extended_gcd_reference(v, m)[1] % m for v in values])
+        new_time, new_result = measure(lambda: [modinv(v, m) for v in values])
+        batch_time, batch_result = measure(batch_modinv, values, m)
+        assert old_result == new_result == batch_result
+        print(f"10000 инверсий по модулю {bits} бит: {old_time:.3f} с (рекурсия), {new_time:.3f} с (итеративно), "
+              f"{batch_time:.3f} с (batch_modinv)")
+
+    # Генерация ключей настоящей длины: среднее и разброс времени (время поиска простых случайно)
+    for bits in (1024, 2048, 3072):
+        for workers in sorted({1, os.cpu_count() or 1}):
+            times = []
+            for _ in range(5 if bits < 3072 else 3):
+                start = time.perf_counter()
+                generate_keys(bits, workers=workers)
+                times.append(time.perf_counter() - start)
+            print(f"generate_keys({bits}), процессов: {workers:2d}: среднее {statistics.mean(times):6.2f} с, "
+                  f"от {min(times):5.2f} до {max(times):5.2f} с")
+
+    # Блоки по 3 байта и список чисел против блоков размера модуля в одном объекте bytes
+    public_key, private_key, p, q = generate_keys(2048)
+    message = bytes(rng.randrange(32, 127) for rng in [random.Random(1)] for _ in range(4 * 1024)).decode()
+    old_time, cipher_blocks = measure(encrypt, message, public_key, repeat=1)
+    new_time, cipher_data = measure(encrypt_bytes, message, public_key, repeat=1)
+    old_size = sys.getsizeof(cipher_blocks) + sum(sys.getsizeof(c) for c in cipher_blocks)
+    print(f"encrypt 4 КБ, 2048 бит: {len(cipher_blocks)} блоков, {old_time:.2f} с, {old_size / 2**20:.1f} МБ -> "
+          f"encrypt_bytes: {(len(cipher_data) - 8) // 256} блоков, {new_time:.3f} с, {len(cipher_data) / 2**20:.2f} МБ")
+    old_time, old_result = measure(decrypt, cipher_blocks, private_key, repeat=1)
+    new_time, new_result = measure(decrypt_bytes, cipher_data, private_key, repeat=1)
+    assert old_result == new_result.decode() == message
+    print(f"decrypt 4 КБ, 2048 бит: {old_time:.2f} с -> decrypt_bytes: {new_time:.3f} с")
+
+    # Пакетная расшифровка блоков в пуле процессов: блоков в секунду в зависимости от числа процессов
+    n, e = public_key
+    rng = random.Random(2)
+    cipher_blocks = [pow(rng.randrange(2, n), e, n) for _ in range(400)]
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        seconds, _ = measure(lambda: list(decrypt_many(cipher_blocks, private_key, workers=workers)), repeat=1)
+        print(f"decrypt_many, 2048 бит, процессов: {workers:2d}: {len(cipher_blocks) / seconds:8.1f} блоков/с")
+
+    # Расшифровка: pow(c, d, n) по полному модулю против китайской теоремы об остатках
+    rng = random.Random(0)
+    for bits in (1024, 2048, 4096):
+        public_key, private_key, p, q = generate_keys(bits)
+        n, e = public_key
+        cipher_blocks = [pow(rng.randrange(n), e, n) for _ in range(max(20, 100 * 1024 // bits))]
+        plain_time, plain_result = measure(decrypt, cipher_blocks, tuple(private_key))
+        crt_time, crt_result = measure(decrypt, cipher_blocks, private_key)
+        assert plain_result == crt_result
+        count = len(cipher_blocks)
+        print(f"decrypt, {bits} бит: {count / plain_time:8.1f} блоков/с (pow по n), "
+              f"{count / crt_time:8.1f} блоков/с (КТО), ускорение {plain_time / crt_time:4.1f}x")
+
+    # Гибридная схема: шифрование файла ограничено скоростью диска, а не RSA
+    try:
+        from RSA_hybrid import encrypt_file, decrypt_file
+    except ImportError:  # Нужен пакет cryptography
+        encrypt_file = None
+    if encrypt_file:
+        public_key, private_key, p, q = generate_keys(2048)
+        size = 256 * 2**20
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source.bin")
+            with open(source, "wb") as f:
+                for _ in range(size // 2**20):
+                    f.write(os.urandom(2**20))
+            copy_time, _ = measure(shutil.copyfile, source, os.path.join(directory, "copy.bin"))
+            encrypt_time, _ = measure(encrypt_file, source, source + ".enc", public_key)
+            decrypt_time, _ = measure(decrypt_file, source + ".enc", source + ".dec", private_key)
+            for name, seconds in (("копирование файла", copy_time), ("RSA_hybrid.encrypt_file", encrypt_time),
+                                  ("RSA_hybrid.decrypt_file", decrypt_time)):
+                print(f"{name:<26} 256 МБ: {seconds:6.2f} с  {size / 2**20 / seconds:8.1f} МБ/с")
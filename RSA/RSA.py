@@ -1,25 +1,126 @@
 import random
 import math
+import mmap
+import os
+import queue
+import secrets
+import struct
+import sys
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import compress, islice
+
+PRIME_LIMIT = 1000000
+PUBLIC_EXPONENT = 65537
+MIN_BIT_LENGTH = 16
+MILLER_RABIN_ROUNDS = 40  # Вероятность принять составное число - не больше 4**-40
+CANDIDATES_PER_TASK = 256  # Сколько кандидатов проверяет процесс за одну задачу
+# Путь к файлу с готовой таблицей простых чисел (необязательно), например ~/.cache/rsa-primes.bin
+PRIMES_CACHE_ENV = "RSA_PRIMES_CACHE"
+_CACHE_MAGIC = b"RSAPRIM1"
+_CACHE_HEADER = struct.Struct("<8sQ")  # сигнатура и верхняя граница решета
+
+
 def sieve_of_eratosthenes(limit):
-    is_prime = [True] * (limit + 1)  # Массив знаков, где True означает, что число потенциально простое
-    is_prime[0] = is_prime[1] = False  # 0 и 1 не простые числа
+    """
+    Решето Эратосфена только по нечётным числам: байт i отвечает за число 2*i + 1.
+    Кратные вычёркиваются срезами bytearray, без цикла Python по каждому числу.
+    """
+    if limit < 2:
+        return []
+    size = (limit + 1) // 2  # Нечётные числа 1, 3, ..., не больше limit
+    is_prime = bytearray(b"\x01") * size
+    is_prime[0] = 0  # 1 не простое число
+
+    for i in range(1, (math.isqrt(limit) + 1) // 2):
+        if is_prime[i]:  # Если число 2*i + 1 простое
+            start = 2 * i * (i + 1)  # Индекс квадрата числа: (2i+1)^2 = 2 * (2i(i+1)) + 1
+            step = 2 * i + 1
+            is_prime[start::step] = bytes(len(range(start, size, step)))  # Помечаем кратные как непростые
+
+    primes = [2]
+    primes.extend(2 * i + 1 for i in compress(range(size), is_prime))
+    return primes
+
+
+def _read_primes_cache(path, limit):
+    # Таблица отображается в память: страницы читаются с диска по мере обращения к ним
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < _CACHE_HEADER.size or (len(mapped) - _CACHE_HEADER.size) % 4 != 0:
+        mapped.close()
+        return None
+    magic, cached_limit = _CACHE_HEADER.unpack_from(mapped)
+    if magic != _CACHE_MAGIC or cached_limit != limit:
+        mapped.close()
+        return None
+    return memoryview(mapped)[_CACHE_HEADER.size:].cast("I")
+
+
+def _write_primes_cache(path, limit, primes):
+    # Сначала пишем во временный файл, чтобы другой процесс не прочитал файл наполовину
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_CACHE_HEADER.pack(_CACHE_MAGIC, limit))
+        f.write(array("I", primes).tobytes())
+    os.replace(temp_path, path)
+
 
-    for num in range(2, int(limit**0.5) + 1):
-        if is_prime[num]:  # Если число простое
-            for multiple in range(num*num, limit + 1, num):
-                is_prime[multiple] = False  # Помечаем все кратные числа как непростые
+def load_primes(limit=PRIME_LIMIT, cache_path=None):
+    """
+    Возвращает простые числа до limit.
+    Если задан файл кэша (аргументом или переменной окружения RSA_PRIMES_CACHE), таблица
+    отображается в память из файла, а при его отсутствии вычисляется и сохраняется в него.
 
-    primes = [num for num, prime in enumerate(is_prime) if prime]
+    :return: Последовательность простых чисел (список или memoryview над файлом кэша)
+    """
+    cache_path = cache_path or os.environ.get(PRIMES_CACHE_ENV)
+    # Файл хранит числа в порядке байтов little-endian по 4 байта
+    if not cache_path or sys.byteorder != "little" or array("I").itemsize != 4:
+        return sieve_of_eratosthenes(limit)
+    try:
+        primes = _read_primes_cache(cache_path, limit)
+    except (OSError, ValueError):
+        primes = None
+    if primes is not None:
+        return primes
+    primes = sieve_of_eratosthenes(limit)
+    try:
+        _write_primes_cache(cache_path, limit, primes)
+    except OSError:
+        pass  # Кэш необязателен: если записать не удалось, просто используем вычисленную таблицу
     return primes
-PRIMES = sieve_of_eratosthenes(1000000)
+
+
+def get_primes():
+    """Таблица простых чисел до PRIME_LIMIT; строится при первом обращении"""
+    primes = globals().get("PRIMES")
+    if primes is None:
+        primes = globals()["PRIMES"] = load_primes()
+    return primes
+
+
+def __getattr__(name):
+    # RSA.PRIMES вычисляется лениво: импорт модуля не строит решето
+    if name == "PRIMES":
+        return get_primes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def extended_gcd(a, b):
-    """Расширенный алгоритм Евклида"""
-    if a == 0:
-        return (b, 0, 1)
-    else:
-        g, y, x = extended_gcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+    """
+    Расширенный алгоритм Евклида: (g, x, y), где a*x + b*y = g.
+    Итеративная версия без рекурсии: глубина не ограничена размером чисел,
+    коэффициенты совпадают с прежней рекурсивной реализацией.
+    """
+    # Инварианты: b = x0*a0 + y0*b0, a = x1*a0 + y1*b0 для исходных a0, b0
+    x0, y0, x1, y1 = 0, 1, 1, 0
+    while a != 0:
+        q = b // a
+        b, a = a, b - q * a
+        x0, y0, x1, y1 = x1, y1, x0 - q * x1, y0 - q * y1
+    return (b, x0, y0)
 
 def modinv(a, m):
     """Модулярная инверсия"""
@@ -29,29 +130,262 @@ def modinv(a, m):
     else:
         return x % m
 
-def generate_keys(bit_length=None):
-    """Генерация ключей RSA"""
-    # Выбираем два разных случайных простых числа
-    p = random.choice(PRIMES)
-    q = random.choice(PRIMES)
-    while q == p:
+def batch_modinv(values, m):
+    """
+    Обратные элементы для многих чисел по одному модулю (приём Монтгомери):
+    одна модулярная инверсия и 3(n - 1) умножений вместо n инверсий.
+
+    :return: Список обратных элементов; None для чисел, у которых обратного нет
+    """
+    values = [value % m for value in values]
+    if not values:
+        return []
+    # prefix[i] - произведение values[0..i] по модулю m
+    prefix = []
+    product = 1
+    for value in values:
+        product = product * value % m
+        prefix.append(product)
+    inverse = modinv(product, m)
+    if inverse is None:
+        # Хотя бы одно число не обратимо - считаем каждое отдельно
+        return [modinv(value, m) for value in values]
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = inverse * prefix[i - 1] % m  # (v0...vi)^-1 * (v0...v(i-1)) = vi^-1
+        inverse = inverse * values[i] % m
+    result[0] = inverse
+    return result
+
+
+# Произведение нечётных простых до 2000: одна операция gcd заменяет сотни делений кандидата
+SMALL_PRIMES = sieve_of_eratosthenes(2000)
+_SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES[1:])
+
+
+def is_probable_prime(n, rounds=MILLER_RABIN_ROUNDS):
+    """Проверка простоты: пробное деление на малые простые, затем тест Миллера - Рабина"""
+    if n < 2:
+        return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in SMALL_PRIMES
+    if n % 2 == 0 or math.gcd(n, _SMALL_PRIMES_PRODUCT) != 1:
+        return False
+
+    # n - 1 = d * 2^s, d нечётное
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for _ in range(rounds):
+        a = 2 + secrets.randbelow(n - 3)
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False  # a - свидетель того, что n составное
+    return True
+
+
+def _random_candidate(bits):
+    # Два старших бита установлены, чтобы произведение двух таких чисел имело ровно нужную длину
+    return secrets.randbits(bits) | (3 << (bits - 2)) | 1
+
+
+def _search_prime(bits, attempts=CANDIDATES_PER_TASK, e=PUBLIC_EXPONENT):
+    """Проверяет до attempts случайных кандидатов; возвращает простое p с gcd(p - 1, e) = 1 или None"""
+    for _ in range(attempts):
+        candidate = _random_candidate(bits)
+        if math.gcd(candidate - 1, e) == 1 and is_probable_prime(candidate):
+            return candidate
+    return None
+
+
+def generate_primes(bits, count=1, workers=None, executor=None):
+    """
+    Ищет count различных простых чисел длины bits.
+    Кандидаты проверяются пачками в пуле процессов: задачи запускаются во всех процессах сразу,
+    и результат возвращается, как только нужное число простых найдено.
+
+    :param workers: Число процессов (1 - без пула процессов)
+    :param executor: Готовый пул процессов (например, общий для многих вызовов)
+    :return: Список простых чисел
+    """
+    primes = []
+    workers = workers or os.cpu_count() or 1
+    if executor is None and workers == 1:
+        while len(primes) < count:
+            prime = _search_prime(bits)
+            if prime is not None and prime not in primes:
+                primes.append(prime)
+        return primes
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = {executor.submit(_search_prime, bits) for _ in range(workers)}
+        while len(primes) < count:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                prime = future.result()
+                if prime is not None and prime not in primes and len(primes) < count:
+                    primes.append(prime)
+            # Пока простых не хватает, держим все процессы занятыми
+            if len(primes) < count:
+                pending |= {executor.submit(_search_prime, bits) for _ in range(len(done))}
+        for future in pending:
+            future.cancel()
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+    return primes
+
+
+class PrivateKey(tuple):
+    """
+    Закрытый ключ: кортеж (n, d), как и раньше, с дополнительными параметрами для расшифровки
+    по китайской теореме об остатках: dp = d mod (p - 1), dq = d mod (q - 1), q_inv = q^-1 mod p.
+    """
+
+    def __new__(cls, n, d, p, q):
+        key = super().__new__(cls, (n, d))
+        key.p, key.q = p, q
+        key.dp = d % (p - 1)
+        key.dq = d % (q - 1)
+        key.q_inv = modinv(q, p)
+        return key
+
+    def __getnewargs__(self):
+        # Для pickle (например, при передаче ключа в пул процессов)
+        return (self[0], self[1], self.p, self.q)
+
+
+def _decrypt_block(c, private_key):
+    """Возводит блок в степень d; для PrivateKey - по китайской теореме об остатках"""
+    if isinstance(private_key, PrivateKey):
+        # Две степени по модулям p и q вдвое меньшей длины вместо одной по модулю n
+        m1 = pow(c, private_key.dp, private_key.p)
+        m2 = pow(c, private_key.dq, private_key.q)
+        h = private_key.q_inv * (m1 - m2) % private_key.p
+        return m2 + h * private_key.q
+    n, d = private_key
+    return pow(c, d, n)
+
+
+def generate_keys(bit_length=None, workers=None, executor=None):
+    """
+    Генерация ключей RSA
+
+    :param bit_length: Длина модуля n в битах (например, 2048 или 3072);
+                       None - простые числа из таблицы до 1 000 000, как раньше
+    :param workers: Число процессов для поиска простых чисел (1 - без пула процессов)
+    :param executor: Готовый пул процессов для поиска простых чисел
+    """
+    if bit_length is None:
+        # Выбираем два разных случайных простых числа
+        PRIMES = get_primes()
+        p = random.choice(PRIMES)
         q = random.choice(PRIMES)
+        while q == p:
+            q = random.choice(PRIMES)
+    else:
+        if bit_length < MIN_BIT_LENGTH:
+            raise ValueError(f"Длина ключа должна быть не меньше {MIN_BIT_LENGTH} бит")
+        # Длины p и q отличаются не больше чем на бит, а n = p * q имеет ровно bit_length бит
+        p_bits, q_bits = (bit_length + 1) // 2, bit_length // 2
+        if p_bits == q_bits:
+            p, q = generate_primes(p_bits, 2, workers, executor)
+        else:
+            (p,), (q,) = generate_primes(p_bits, 1, workers, executor), generate_primes(q_bits, 1, workers, executor)
     
     n = p * q
     phi = (p - 1) * (q - 1)
     
     # Выбираем e взаимно простое с phi
-    e = 65537
+    e = PUBLIC_EXPONENT
     while math.gcd(e, phi) != 1:
         e = random.choice([3, 5, 17, 257, 65537])
     
     d = modinv(e, phi)
     
     public_key = (n, e)
-    private_key = (n, d)
+    private_key = PrivateKey(n, d, p, q)  # Ведёт себя как кортеж (n, d)
     
     return public_key, private_key, p, q
 
+
+class KeyPool:
+    """
+    Очередь заранее сгенерированных ключей для сервисов, которым новые ключи нужны по запросу.
+    Фоновый поток поддерживает в очереди до size готовых ключей, поиск простых чисел идёт
+    в общем пуле процессов.
+
+    Пример:
+        with KeyPool(2048, size=4) as pool:
+            public_key, private_key, p, q = pool.get()
+    """
+
+    def __init__(self, bit_length=2048, size=4, workers=None):
+        self.bit_length = bit_length
+        self._keys = queue.Queue(maxsize=size)
+        self._stop = threading.Event()
+        self._error = None
+        workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._workers = workers
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        try:
+            while not self._stop.is_set():
+                keys = generate_keys(self.bit_length, self._workers, self._executor)
+                while not self._stop.is_set():
+                    try:
+                        self._keys.put(keys, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        except Exception as error:  # Ошибку передаём тому, кто ждёт ключ
+            if not self._stop.is_set():
+                self._error = error
+
+    def get(self, timeout=None):
+        """Возвращает готовый ключ (public_key, private_key, p, q); ждёт, если очередь пуста"""
+        waited = 0.0
+        while True:
+            if self._error is not None:
+                raise self._error
+            try:
+                return self._keys.get(timeout=0.1)
+            except queue.Empty:
+                waited += 0.1
+                if timeout is not None and waited >= timeout:
+                    raise TimeoutError("Ключ не был сгенерирован за отведённое время")
+                if not self._thread.is_alive() and self._error is None:
+                    raise RuntimeError("Пул ключей закрыт")
+
+    def ready(self):
+        """Число готовых ключей в очереди"""
+        return self._keys.qsize()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 def encrypt(message, public_key):
     """Шифрование сообщения"""
     n, e = public_key
@@ -77,12 +411,11 @@ def encrypt(message, public_key):
     return cipher_blocks
 
 def decrypt(cipher_blocks, private_key):
-    """Дешифрование сообщения"""
-    n, d = private_key
+    """Дешифрование сообщения (private_key - кортеж (n, d) или PrivateKey)"""
     message_blocks = []
     
     for c in cipher_blocks:
-        m = pow(c, d, n)
+        m = _decrypt_block(c, private_key)
         message_blocks.append(m)
     
     # Собираем байты обратно в строку
@@ -95,9 +428,172 @@ def decrypt(cipher_blocks, private_key):
     # Преобразуем байты обратно в строку
     return message_bytes.decode('utf-8', 'ignore')  # Используем ignore, чтобы игнорировать возможные ошибки декодирования
 
+LENGTH_HEADER = struct.Struct(">Q")  # Длина открытого текста в байтах перед блоками шифротекста
+
+
+def block_size(n):
+    """Размер блока шифротекста в байтах для модуля n; блок открытого текста на байт меньше"""
+    return (n.bit_length() + 7) // 8
+
+
+def encrypt_bytes(message, public_key):
+    """
+    Шифрует сообщение блоками размера модуля и возвращает компактный двоичный шифротекст:
+    8 байт длины открытого текста (big-endian), затем блоки по block_size(n) байт (big-endian).
+    Каждый блок открытого текста занимает block_size(n) - 1 байт, поэтому всегда меньше n;
+    последний блок дополняется нулями, а лишние нули отбрасываются по длине из заголовка.
+
+    :param message: Строка (кодируется в UTF-8) или байты
+    :return: bytes
+    """
+    n, e = public_key
+    data = memoryview(message.encode('utf-8') if isinstance(message, str) else message).cast('B')
+    cipher_size = block_size(n)
+    plain_size = cipher_size - 1
+    if plain_size < 1:
+        raise ValueError(f"Модуль n={n} слишком мал для шифрования байтов")
+    count = -(-len(data) // plain_size)
+    out = bytearray(LENGTH_HEADER.size + count * cipher_size)
+    LENGTH_HEADER.pack_into(out, 0, len(data))
+    position = LENGTH_HEADER.size
+    for start in range(0, len(data), plain_size):
+        m = int.from_bytes(data[start:start + plain_size], 'big')
+        if start + plain_size > len(data):
+            m <<= 8 * (start + plain_size - len(data))  # Дополняем последний блок нулями справа
+        out[position:position + cipher_size] = pow(m, e, n).to_bytes(cipher_size, 'big')
+        position += cipher_size
+    return bytes(out)
+
+
+def decrypt_bytes(cipher_data, private_key):
+    """
+    Расшифровывает шифротекст encrypt_bytes (private_key - кортеж (n, d) или PrivateKey).
+
+    :param cipher_data: bytes, bytearray или memoryview
+    :return: bytes - исходное сообщение (строку можно получить через .decode('utf-8'))
+    """
+    n = private_key[0]
+    data = memoryview(cipher_data).cast('B')
+    cipher_size = block_size(n)
+    plain_size = cipher_size - 1
+    if len(data) < LENGTH_HEADER.size or (len(data) - LENGTH_HEADER.size) % cipher_size != 0:
+        raise ValueError("Неверная длина шифротекста")
+    (length,) = LENGTH_HEADER.unpack_from(data)
+    count = (len(data) - LENGTH_HEADER.size) // cipher_size
+    if length > count * plain_size or (count > 0 and length <= (count - 1) * plain_size):
+        raise ValueError("Длина сообщения в заголовке не соответствует числу блоков")
+
+    out = bytearray(count * plain_size)
+    position = 0
+    for start in range(LENGTH_HEADER.size, len(data), cipher_size):
+        c = int.from_bytes(data[start:start + cipher_size], 'big')
+        if c >= n:
+            raise ValueError("Блок шифротекста больше модуля")
+        m = _decrypt_block(c, private_key)
+        if m.bit_length() > 8 * plain_size:
+            raise ValueError("Шифротекст повреждён или зашифрован другим ключом")
+        out[position:position + plain_size] = m.to_bytes(plain_size, 'big')
+        position += plain_size
+    del out[length:]
+    return bytes(out)
+
+BATCH_SIZE = 16  # Сообщений в одной задаче пула: меньше накладных расходов на передачу
+
+
+def _encrypt_item(item, public_key):
+    # Число - один блок (как encrypt(число)), строка или байты - формат encrypt_bytes
+    if isinstance(item, int):
+        n, e = public_key
+        if item >= n:
+            raise ValueError(f"Сообщение {item} слишком велико для модуля n={n}")
+        return pow(item, e, n)
+    return encrypt_bytes(item, public_key)
+
+
+def _decrypt_item(item, private_key):
+    # Число - один блок, байты - шифротекст encrypt_bytes
+    if isinstance(item, int):
+        return _decrypt_block(item, private_key)
+    return decrypt_bytes(item, private_key)
+
+
+_worker_key = None
+
+def _init_worker(key):
+    # Ключ передаётся в процесс один раз, а не с каждой задачей
+    global _worker_key
+    _worker_key = key
+
+def _encrypt_batch(items):
+    return [_encrypt_item(item, _worker_key) for item in items]
+
+def _decrypt_batch(items):
+    return [_decrypt_item(item, _worker_key) for item in items]
+
+
+def _map_ordered(function, batch_function, items, key, workers, window, batch_size):
+    """
+    Применяет function(item, key) ко всем элементам в пуле процессов и выдаёт результаты по порядку.
+    В работе одновременно не больше window задач, поэтому память не растёт с длиной входа.
+    """
+    workers = workers or os.cpu_count() or 1
+    items = iter(items)
+    if workers == 1:
+        for item in items:
+            yield function(item, key)
+        return
+
+    window = window or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(key,)) as pool:
+        in_flight = deque()
+        while True:
+            while len(in_flight) < window:
+                batch = list(islice(items, batch_size))
+                if not batch:
+                    break
+                in_flight.append(pool.submit(batch_function, batch))
+            if not in_flight:
+                return
+            yield from in_flight.popleft().result()
+
+
+def _check_batching(window, batch_size):
+    # Проверяется сразу при вызове, а не при первом next() генератора
+    if window is not None and window < 1:
+        raise ValueError("window должно быть не меньше 1")
+    if batch_size < 1:
+        raise ValueError("batch_size должно быть не меньше 1")
+
+
+def encrypt_many(messages, public_key, workers=None, window=None, batch_size=BATCH_SIZE):
+    """
+    Шифрует много независимых сообщений одним ключом в пуле процессов.
+
+    :param messages: Итерируемый объект: строки или байты (результат - как у encrypt_bytes)
+                     или числа-блоки (результат - pow(m, e, n))
+    :param workers: Число процессов (1 - без пула процессов)
+    :param window: Наибольшее число задач в работе (по умолчанию - вдвое больше числа процессов)
+    :param batch_size: Сообщений в одной задаче
+    :return: Генератор результатов в порядке сообщений
+    """
+    _check_batching(window, batch_size)
+    return _map_ordered(_encrypt_item, _encrypt_batch, messages, public_key, workers, window, batch_size)
+
+
+def decrypt_many(cipher_items, private_key, workers=None, window=None, batch_size=BATCH_SIZE):
+    """
+    Расшифровывает много шифротекстов одним ключом в пуле процессов (параметры - как у encrypt_many).
+
+    :param cipher_items: Итерируемый объект: шифротексты encrypt_bytes (результат - bytes)
+                         или числа-блоки (результат - число)
+    :return: Генератор результатов в порядке шифротекстов
+    """
+    _check_batching(window, batch_size)
+    return _map_ordered(_decrypt_item, _decrypt_batch, cipher_items, private_key, workers, window, batch_size)
+
 def main():
     print("RSA с простыми числами до 1,000,000")
-    print(f"Всего простых чисел в базе: {len(PRIMES)}")
+    print(f"Всего простых чисел в базе: {len(get_primes())}")
     
     # Генерация ключей
     public_key, private_key, p, q = generate_keys()
@@ -0,0 +1,212 @@
+import io
+import os
+import struct
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from RSA import PUBLIC_EXPONENT, PrivateKey, generate_keys
+
+# Формат зашифрованного потока (версия 2):
+#   заголовок: "RSAH", версия (1 байт), размер порции (4 байта), длина обёрнутого ключа (4 байта)
+#   обёрнутый ключ: RSA-OAEP (SHA-256, MGF1-SHA-256) от ключа AES-256 (32 байта) + префикса nonce (4 байта).
+#                   Учебный encrypt_bytes без дополнения здесь не годится: при малом e ключ восстанавливается
+#                   извлечением корня, а одинаковый ключ всегда даёт одинаковый шифротекст. В версии 1
+#                   ключ оборачивался именно так, поэтому она больше не принимается.
+#   порции: AES-GCM(порция открытого текста) + 16 байт тега; все порции, кроме последней, ровно
+#           CHUNK_SIZE байт открытого текста, последняя короче (возможно, пустая)
+# nonce порции = префикс (4 байта) + номер порции (8 байт, big-endian), поэтому порции нельзя
+# переставить; признак последней порции входит в связанные данные (AAD), поэтому поток нельзя обрезать.
+MAGIC = b"RSAH"
+VERSION = 2
+HEADER = struct.Struct(">4sBII")
+CHUNK_SIZE = 1 << 20
+MAX_CHUNK_SIZE = 16 << 20  # Больший размер порции из заголовка не принимается: память на порцию ограничена
+MIN_KEY_BITS = 2048  # Сеансовый ключ не оборачивается ключом RSA с модулем короче
+MIN_PUBLIC_EXPONENT = 65537  # И ключом с меньшей открытой экспонентой (generate_keys может выбрать e = 3)
+KEY_SIZE = 32
+PREFIX_SIZE = 4
+TAG_SIZE = 16
+MAX_WRAPPED_KEY = 1 << 20
+
+
+_OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+
+def _wrapping_key(public_key):
+    # Открытый ключ (n, e) этого модуля в виде ключа cryptography для OAEP
+    n, e = public_key
+    if n.bit_length() < MIN_KEY_BITS:
+        raise ValueError(f"Модуль RSA должен быть не короче {MIN_KEY_BITS} бит")
+    if e < MIN_PUBLIC_EXPONENT:
+        raise ValueError(f"Открытая экспонента RSA должна быть не меньше {MIN_PUBLIC_EXPONENT}")
+    return rsa.RSAPublicNumbers(e, n).public_key()
+
+
+def _unwrapping_key(private_key):
+    # Закрытый ключ cryptography по PrivateKey или по кортежу (n, d);
+    # у кортежа множители p и q восстанавливаются по n, d и e = PUBLIC_EXPONENT
+    n, d = private_key[0], private_key[1]
+    if isinstance(private_key, PrivateKey):
+        p, q = private_key.p, private_key.q
+    else:
+        p, q = rsa.rsa_recover_prime_factors(n, PUBLIC_EXPONENT, d)
+    e = pow(d, -1, (p - 1) * (q - 1))
+    numbers = rsa.RSAPrivateNumbers(p, q, d, rsa.rsa_crt_dmp1(d, p), rsa.rsa_crt_dmq1(d, q),
+                                    rsa.rsa_crt_iqmp(p, q), rsa.RSAPublicNumbers(e, n))
+    return numbers.private_key()
+
+
+def _nonce(prefix, counter):
+    return prefix + counter.to_bytes(12 - PREFIX_SIZE, 'big')
+
+
+def _aad(final):
+    return bytes([VERSION, 1 if final else 0])
+
+
+def _read_exact(src, size):
+    # read у каналов и сокетов может вернуть меньше запрошенного до конца потока
+    data = src.read(size)
+    if data is None:
+        data = b""
+    if len(data) == size or not data:
+        return data
+    parts = [data]
+    received = len(data)
+    while received < size:
+        part = src.read(size - received)
+        if not part:
+            break
+        parts.append(part)
+        received += len(part)
+    return b"".join(parts)
+
+
+def encrypt_stream(src, dst, public_key, chunk_size=CHUNK_SIZE):
+    """
+    Шифрует поток гибридной схемой: случайный сеансовый ключ AES-256 шифруется RSA-OAEP,
+    а данные - AES-GCM порциями по chunk_size байт (не больше MAX_CHUNK_SIZE).
+    Память не зависит от размера данных. Ключ с модулем короче MIN_KEY_BITS или с открытой
+    экспонентой меньше MIN_PUBLIC_EXPONENT - ValueError.
+
+    :param src: Двоичный поток открытого текста (файл, BytesIO и т.п.)
+    :param dst: Двоичный поток для шифротекста
+    :return: Число зашифрованных байтов открытого текста
+    """
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f"Размер порции должен быть от 1 байта до {MAX_CHUNK_SIZE >> 20} МБ")
+    wrapping_key = _wrapping_key(public_key)
+    session_key = AESGCM.generate_key(bit_length=8 * KEY_SIZE)
+    prefix = os.urandom(PREFIX_SIZE)
+    wrapped_key = wrapping_key.encrypt(session_key + prefix, _OAEP)
+    dst.write(HEADER.pack(MAGIC, VERSION, chunk_size, len(wrapped_key)))
+    dst.write(wrapped_key)
+
+    aes = AESGCM(session_key)
+    total = 0
+    counter = 0
+    while True:
+        chunk = _read_exact(src, chunk_size)
+        # Полная порция не последняя; последняя всегда короче (при необходимости - пустая)
+        final = len(chunk) < chunk_size
+        dst.write(aes.encrypt(_nonce(prefix, counter), chunk, _aad(final)))
+        total += len(chunk)
+        counter += 1
+        if final:
+            return total
+
+
+def decrypt_stream(src, dst, private_key):
+    """
+    Расшифровывает поток encrypt_stream (private_key - кортеж (n, d) или PrivateKey).
+    Каждая порция проверяется до записи; при повреждении, перестановке или обрезке порций - ValueError.
+
+    :return: Число расшифрованных байтов
+    """
+    header = _read_exact(src, HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Поток слишком короткий: нет заголовка")
+    magic, version, chunk_size, wrapped_size = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Неизвестный формат или версия гибридного шифротекста")
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE or wrapped_size > MAX_WRAPPED_KEY:
+        raise ValueError("Повреждённый заголовок гибридного шифротекста")
+    wrapped_key = _read_exact(src, wrapped_size)
+    if len(wrapped_key) < wrapped_size:
+        raise ValueError("Поток обрезан: нет сеансового ключа")
+    try:
+        key_material = _unwrapping_key(private_key).decrypt(wrapped_key, _OAEP)
+    except ValueError:
+        key_material = b""
+    if len(key_material) != KEY_SIZE + PREFIX_SIZE:
+        raise ValueError("Сеансовый ключ повреждён или зашифрован другим ключом")
+    aes = AESGCM(key_material[:KEY_SIZE])
+    prefix = key_material[KEY_SIZE:]
+
+    total = 0
+    counter = 0
+    while True:
+        sealed = _read_exact(src, chunk_size + TAG_SIZE)
+        final = len(sealed) < chunk_size + TAG_SIZE
+        if len(sealed) < TAG_SIZE:
+            raise ValueError("Поток обрезан: нет последней порции")
+        try:
+            chunk = aes.decrypt(_nonce(prefix, counter), sealed, _aad(final))
+        except InvalidTag:
+            raise ValueError(f"Порция {counter} повреждена, переставлена или поток обрезан") from None
+        dst.write(chunk)
+        total += len(chunk)
+        counter += 1
+        if final:
+            if src.read(1):
+                raise ValueError("Лишние данные после последней порции")
+            return total
+
+
+def encrypt_file(input_path, output_path, public_key, chunk_size=CHUNK_SIZE):
+    """Шифрует файл гибридной схемой"""
+    with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        return encrypt_stream(src, dst, public_key, chunk_size)
+
+
+def decrypt_file(input_path, output_path, private_key):
+    """
+    Расшифровывает файл. Порции проверяются по мере записи, поэтому при ошибке
+    частично записанный файл удаляется.
+    """
+    try:
+        with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+            return decrypt_stream(src, dst, private_key)
+    except ValueError:
+        os.remove(output_path)
+        raise
+
+
+def encrypt(message, public_key, chunk_size=CHUNK_SIZE):
+    """Шифрует строку (UTF-8) или байты в памяти; возвращает bytes в формате encrypt_stream"""
+    data = message.encode('utf-8') if isinstance(message, str) else message
+    dst = io.BytesIO()
+    encrypt_stream(io.BytesIO(data), dst, public_key, chunk_size)
+    return dst.getvalue()
+
+
+def decrypt(cipher_data, private_key):
+    """Расшифровывает bytes в формате encrypt_stream; возвращает bytes"""
+    dst = io.BytesIO()
+    decrypt_stream(io.BytesIO(cipher_data), dst, private_key)
+    return dst.getvalue()
+
+
+def main():
+    public_key, private_key, p, q = generate_keys(2048)
+    message = input("Введите сообщение для шифрования: ")
+    cipher_data = encrypt(message, public_key)
+    print(f"Зашифрованное сообщение ({len(cipher_data)} байт): {cipher_data.hex()}")
+    print(f"Расшифрованное сообщение: {decrypt(cipher_data, private_key).decode('utf-8')}")
+
+
+if __name__ == "__main__":
+    main()
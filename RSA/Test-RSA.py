@@ -1,5 +1,13 @@
 import unittest
+import os
+import subprocess
+import sys
+import tempfile
 from RSA import encrypt, decrypt, generate_keys, modinv, extended_gcd
+from RSA import sieve_of_eratosthenes, load_primes, is_probable_prime, generate_primes, KeyPool
+from RSA import batch_modinv, PrivateKey, encrypt_bytes, decrypt_bytes, block_size, encrypt_many, decrypt_many
+import pickle
+import random
 
 class TestRSACryptography(unittest.TestCase):
 
@@ -45,5 +53,149 @@ class TestRSACryptography(unittest.TestCase):
         self.assertEqual(g, 6)  # gcd(30, 12) = 6
         self.assertEqual(30 * x + 12 * y, g)  # Проверка на корректность
 
+    def test_sieve(self):
+        self.assertEqual(sieve_of_eratosthenes(30), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(sieve_of_eratosthenes(1), [])
+        self.assertEqual(sieve_of_eratosthenes(2), [2])
+        self.assertEqual(len(sieve_of_eratosthenes(1000000)), 78498)
+
+    def test_primes_are_lazy(self):
+        # Импорт модуля не должен строить таблицу простых чисел
+        code = "import RSA; print('PRIMES' in vars(RSA)); RSA.PRIMES; print('PRIMES' in vars(RSA))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.split()
+        self.assertEqual(output, ["False", "True"])
+
+    def test_primes_cache_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "primes.bin")
+            computed = load_primes(1000, cache_path=path)
+            self.assertTrue(os.path.exists(path))
+            cached = load_primes(1000, cache_path=path)
+            self.assertIsInstance(cached, memoryview)
+            self.assertEqual(list(cached), computed)
+            # Файл с другой границей решета пересчитывается
+            self.assertEqual(list(load_primes(100, cache_path=path)), sieve_of_eratosthenes(100))
+            cached.release()
+
+    def test_is_probable_prime(self):
+        small = set(sieve_of_eratosthenes(5000))
+        self.assertEqual([n for n in range(5000) if is_probable_prime(n)], sorted(small))
+        # Числа Кармайкла проходят тест Ферма, но не тест Миллера - Рабина
+        for carmichael in (561, 41041, 825265, 321197185, 5394826801):
+            self.assertFalse(is_probable_prime(carmichael))
+        self.assertTrue(is_probable_prime(2**127 - 1))
+        self.assertFalse(is_probable_prime((2**61 - 1) * (2**89 - 1)))
+
+    def test_generate_keys_bit_length(self):
+        for bits in (64, 257, 512):
+            public_key, private_key, p, q = generate_keys(bits, workers=1)
+            self.assertEqual(public_key[0].bit_length(), bits)
+            self.assertEqual(public_key[0], p * q)
+            self.assertNotEqual(p, q)
+            self.assertEqual(decrypt(encrypt("Hello, RSA!", public_key), private_key), "Hello, RSA!")
+        with self.assertRaises(ValueError):
+            generate_keys(8)
+
+    def test_generate_primes_process_pool(self):
+        primes = generate_primes(128, count=3, workers=2)
+        self.assertEqual(len(set(primes)), 3)
+        self.assertTrue(all(p.bit_length() == 128 and is_probable_prime(p) for p in primes))
+
+    def test_key_pool(self):
+        with KeyPool(256, size=2, workers=1) as pool:
+            first, second = pool.get(timeout=30), pool.get(timeout=30)
+        self.assertEqual(first[0][0].bit_length(), 256)
+        self.assertNotEqual(first[0], second[0])
+
+    def test_crt_private_key(self):
+        public_key, private_key, p, q = generate_keys(512, workers=1)
+        self.assertIsInstance(private_key, PrivateKey)
+        n, d = private_key  # Ключ по-прежнему распаковывается как кортеж (n, d)
+        self.assertEqual((private_key.p, private_key.q), (p, q))
+        self.assertEqual(private_key.q_inv * q % p, 1)
+        rng = random.Random(15)
+        blocks = [rng.randrange(n) for _ in range(20)]
+        cipher_blocks = [pow(m, public_key[1], n) for m in blocks]
+        # Расшифровка по китайской теореме об остатках совпадает с обычной
+        self.assertEqual(decrypt(cipher_blocks, private_key), decrypt(cipher_blocks, (n, d)))
+        self.assertEqual(decrypt(encrypt("Привет, RSA!", public_key), private_key), "Привет, RSA!")
+        self.assertEqual(decrypt(encrypt("Привет, RSA!", public_key), (n, d)), "Привет, RSA!")
+        restored = pickle.loads(pickle.dumps(private_key))
+        self.assertEqual((restored, restored.dp, restored.dq), (private_key, private_key.dp, private_key.dq))
+
+    def test_encrypt_bytes(self):
+        public_key, private_key, p, q = generate_keys(512, workers=1)
+        size = block_size(public_key[0])
+        for length in (0, 1, size - 2, size - 1, size, 1000):
+            # Ведущие и завершающие нулевые байты сохраняются
+            message = bytes([0, 0]) + os.urandom(length) + bytes(3)
+            cipher_data = encrypt_bytes(message, public_key)
+            self.assertEqual((len(cipher_data) - 8) % size, 0)
+            self.assertEqual(decrypt_bytes(cipher_data, private_key), message)
+            self.assertEqual(decrypt_bytes(memoryview(cipher_data), tuple(private_key)), message)
+        self.assertEqual(len(encrypt_bytes(b"A" * 1000, public_key)), 8 + 16 * size)  # 63 байта в блоке
+        self.assertEqual(decrypt_bytes(encrypt_bytes("Привет, RSA!", public_key), private_key).decode('utf-8'),
+                         "Привет, RSA!")
+
+    def test_encrypt_bytes_small_key(self):
+        message = "A" * 1000
+        cipher_data = encrypt_bytes(message, self.public_key)
+        self.assertEqual(decrypt_bytes(cipher_data, self.private_key).decode('utf-8'), message)
+
+    def test_decrypt_bytes_invalid(self):
+        cipher_data = encrypt_bytes(b"Hello, RSA!", self.public_key)
+        with self.assertRaises(ValueError):
+            decrypt_bytes(cipher_data[:-1], self.private_key)
+        with self.assertRaises(ValueError):
+            decrypt_bytes((10**6).to_bytes(8, 'big') + cipher_data[8:], self.private_key)
+
+    def test_batch_process_pool(self):
+        public_key, private_key, p, q = generate_keys(256, workers=1)
+        messages = [os.urandom(length) for length in range(60)]
+        for workers in (1, 2):
+            # Маленькие окно и пачки: результаты всё равно приходят по порядку
+            cipher_data = list(encrypt_many(messages, public_key, workers=workers, window=2, batch_size=3))
+            self.assertEqual([decrypt_bytes(item, private_key) for item in cipher_data], messages)
+            self.assertEqual(list(decrypt_many(iter(cipher_data), private_key, workers=workers, window=3)), messages)
+            blocks = list(range(1, 40))
+            cipher_blocks = list(encrypt_many(blocks, public_key, workers=workers))
+            self.assertEqual(cipher_blocks, [pow(m, public_key[1], public_key[0]) for m in blocks])
+            self.assertEqual(list(decrypt_many(cipher_blocks, private_key, workers=workers)), blocks)
+
+    def test_batch_parameters_validated(self):
+        # Ошибка видна сразу при вызове, до чтения результатов
+        for window, batch_size in ((0, 3), (-1, 3), (2, 0), (2, -1)):
+            with self.assertRaises(ValueError):
+                encrypt_many([b"A"], self.public_key, workers=1, window=window, batch_size=batch_size)
+            with self.assertRaises(ValueError):
+                decrypt_many([], self.private_key, workers=1, window=window, batch_size=batch_size)
+
+    def test_extended_gcd_matches_recursive(self):
+        def recursive(a, b):
+            if a == 0:
+                return (b, 0, 1)
+            g, y, x = recursive(b % a, a)
+            return (g, x - (b // a) * y, y)
+
+        rng = random.Random(18)
+        for _ in range(2000):
+            a, b = rng.randint(-500, 500), rng.randint(-500, 500)
+            self.assertEqual(extended_gcd(a, b), recursive(a, b))
+        # Соседние числа Фибоначчи - худший случай: рекурсивная версия не справилась бы
+        a, b = 1, 1
+        for _ in range(5000):
+            a, b = b, a + b
+        g, x, y = extended_gcd(a, b)
+        self.assertEqual((g, a * x + b * y), (1, 1))
+
+    def test_batch_modinv(self):
+        m = 2**127 - 1
+        values = [random.Random(i).randrange(1, m) for i in range(50)]
+        self.assertEqual(batch_modinv(values, m), [modinv(value, m) for value in values])
+        self.assertEqual(batch_modinv([], m), [])
+        # Необратимые числа - None, остальные считаются отдельно
+        self.assertEqual(batch_modinv([3, 4, 0, 5, 8], 8), [3, None, None, 5, None])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+import io
+import math
+import os
+import tempfile
+import unittest
+from RSA import generate_keys
+from RSA_hybrid import encrypt, decrypt, encrypt_stream, decrypt_stream, encrypt_file, decrypt_file
+from RSA_hybrid import HEADER, TAG_SIZE, MAX_CHUNK_SIZE, MIN_KEY_BITS
+
+class TestHybridEncryption(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Ключ 2048 бит (минимальная длина) генерируется один раз для всех тестов
+        cls.public_key, cls.private_key, cls.p, cls.q = generate_keys(MIN_KEY_BITS, workers=1)
+
+    def test_encrypt_decrypt(self):
+        message = "Привет, гибридный RSA!"
+        cipher_data = encrypt(message, self.public_key)
+        self.assertEqual(decrypt(cipher_data, self.private_key).decode('utf-8'), message)
+        # Обычный кортеж (n, d) тоже подходит
+        self.assertEqual(decrypt(cipher_data, tuple(self.private_key)).decode('utf-8'), message)
+
+    def test_chunk_boundaries(self):
+        for length in (0, 1, 15, 16, 17, 32, 33, 100):
+            data = os.urandom(length)
+            cipher_data = encrypt(data, self.public_key, chunk_size=16)
+            self.assertEqual(decrypt(cipher_data, self.private_key), data)
+
+    def test_small_key_rejected(self):
+        for bit_length in (None, 1024):
+            public_key, private_key, p, q = generate_keys(bit_length, workers=1)
+            with self.assertRaises(ValueError):
+                encrypt(b"data", public_key)
+
+    def test_small_exponent_rejected(self):
+        # Тот же модуль с малой открытой экспонентой: сеансовый ключ им не оборачивается
+        n = self.public_key[0]
+        phi = (self.p - 1) * (self.q - 1)
+        e = next(e for e in (3, 5, 17, 257) if math.gcd(e, phi) == 1)
+        with self.assertRaises(ValueError):
+            encrypt(b"data", (n, e))
+
+    def test_wrapped_key_randomized(self):
+        # OAEP: один и тот же ключ RSA каждый раз даёт разный обёрнутый ключ
+        first = encrypt(b"data", self.public_key)
+        second = encrypt(b"data", self.public_key)
+        wrapped_size = HEADER.unpack_from(first)[3]
+        self.assertNotEqual(first[HEADER.size:HEADER.size + wrapped_size],
+                            second[HEADER.size:HEADER.size + wrapped_size])
+
+    def test_chunk_size_limit(self):
+        with self.assertRaises(ValueError):
+            encrypt(b"data", self.public_key, chunk_size=MAX_CHUNK_SIZE + 1)
+        with self.assertRaises(ValueError):
+            encrypt(b"data", self.public_key, chunk_size=0)
+        # Размер порции из заголовка проверяется до чтения порций
+        cipher_data = encrypt(b"data", self.public_key, chunk_size=16)
+        magic, version, chunk_size, wrapped_size = HEADER.unpack_from(cipher_data)
+        forged = HEADER.pack(magic, version, (1 << 32) - 1, wrapped_size) + cipher_data[HEADER.size:]
+        with self.assertRaises(ValueError):
+            decrypt(forged, self.private_key)
+
+    def test_tampering_detected(self):
+        data = os.urandom(100)
+        cipher_data = encrypt(data, self.public_key, chunk_size=16)
+        chunks_start = HEADER.size + HEADER.unpack_from(cipher_data)[3]  # Заголовок и обёрнутый ключ
+        chunk = 16 + TAG_SIZE
+        modified = bytearray(cipher_data)
+        modified[-1] ^= 1
+        swapped = (cipher_data[:chunks_start] + cipher_data[chunks_start + chunk:chunks_start + 2 * chunk]
+                   + cipher_data[chunks_start:chunks_start + chunk] + cipher_data[chunks_start + 2 * chunk:])
+        truncated = cipher_data[:chunks_start + 3 * chunk]
+        for broken in (bytes(modified), swapped, truncated, cipher_data[:-5], cipher_data + b"x"):
+            with self.assertRaises(ValueError):
+                decrypt(broken, self.private_key)
+        with self.assertRaises(ValueError):
+            decrypt(b"XXXX" + cipher_data[4:], self.private_key)
+        with self.assertRaises(ValueError):
+            decrypt(cipher_data[:HEADER.size - 1], self.private_key)
+
+    def test_files(self):
+        data = os.urandom(300000)
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "source.bin")
+            encrypted = os.path.join(directory, "source.bin.enc")
+            restored = os.path.join(directory, "restored.bin")
+            with open(source, "wb") as f:
+                f.write(data)
+            self.assertEqual(encrypt_file(source, encrypted, self.public_key, chunk_size=65536), len(data))
+            self.assertEqual(decrypt_file(encrypted, restored, self.private_key), len(data))
+            with open(restored, "rb") as f:
+                self.assertEqual(f.read(), data)
+            # При ошибке частично расшифрованный файл не остаётся на диске
+            with open(encrypted, "r+b") as f:
+                f.seek(-1, os.SEEK_END)
+                last = f.read(1)[0]
+                f.seek(-1, os.SEEK_END)
+                f.write(bytes([last ^ 1]))
+            with self.assertRaises(ValueError):
+                decrypt_file(encrypted, restored, self.private_key)
+            self.assertFalse(os.path.exists(restored))
+
+    def test_streams(self):
+        src, dst, out = io.BytesIO(b"A" * 5000), io.BytesIO(), io.BytesIO()
+        self.assertEqual(encrypt_stream(src, dst, self.public_key, chunk_size=1000), 5000)
+        dst.seek(0)
+        self.assertEqual(decrypt_stream(dst, out, self.private_key), 5000)
+        self.assertEqual(out.getvalue(), b"A" * 5000)
+
+if __name__ == "__main__":
+    unittest.main()
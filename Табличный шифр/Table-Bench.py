@@ -0,0 +1,83 @@
+import random
+import string
+import sys
+import time
+
+from Table import permutation_cipher, decrypt_permutation, multi_permutation_cipher, decrypt_multi_permutation
+from Table_np import permutation_cipher_np, decrypt_permutation_np
+from Table_np import multi_permutation_cipher_np, decrypt_multi_permutation_np
+
+
+def make_text(size, seed=0):
+    rng = random.Random(seed)
+    block = ''.join(rng.choices(string.ascii_letters + string.digits, k=2**20))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def measure(func, *args, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(name, size, seconds):
+    print(f"{name:<32} {size / 2**20:8.1f} МБ  {seconds:8.3f} с  {size / 2**20 / seconds:10.1f} МБ/с")
+
+
+if __name__ == "__main__":
+    # Размер входа в МБ можно передать аргументом: python Table-Bench.py 100
+    size = int(float(sys.argv[1]) * 2**20) if len(sys.argv) > 1 else 100 * 2**20
+    key = [3, 1, 4, 7, 5, 2, 6]
+    text = make_text(size)
+
+    old_time, old_result = measure(permutation_cipher, text, key)
+    new_time, new_result = measure(permutation_cipher_np, text, key)
+    assert old_result == new_result
+    report("permutation_cipher (циклы)", size, old_time)
+    report("permutation_cipher_np", size, new_time)
+
+    old_time, old_result = measure(decrypt_permutation, new_result, key)
+    new_time, new_result = measure(decrypt_permutation_np, new_result, key)
+    assert old_result == new_result == text
+    report("decrypt_permutation (циклы)", size, old_time)
+    report("decrypt_permutation_np", size, new_time)
+
+    # Тройная перестановка: три вызова permutation_cipher против одной составной перестановки
+    keys = [[3, 1, 4, 7, 5, 2, 6], [2, 5, 1, 6, 3, 4], [4, 1, 3, 2, 5]]
+
+    def chained(text, keys):
+        for round_key in keys:
+            text = permutation_cipher(text, round_key)
+        return text
+
+    old_time, old_result = measure(chained, text, keys)
+    # Первый вызов строит и кэширует составную перестановку, второй показывает один проход по тексту
+    new_time, new_result = measure(multi_permutation_cipher, text, keys, repeat=2)
+    np_time, np_result = measure(multi_permutation_cipher_np, text, keys, repeat=2)
+    assert old_result == new_result == np_result
+    report("3 x permutation_cipher", size, old_time)
+    report("multi_permutation_cipher", size, new_time)
+    report("multi_permutation_cipher_np", size, np_time)
+    new_time, new_result = measure(decrypt_multi_permutation, old_result, keys)
+    np_time, np_result = measure(decrypt_multi_permutation_np, old_result, keys)
+    assert new_result == np_result == text
+    report("decrypt_multi_permutation", size, new_time)
+    report("decrypt_multi_permutation_np", size, np_time)
+
+    # Подбор ключа без ключа: полный перебор до 8 столбцов на пуле процессов
+    try:
+        from Table_crack import CORPUS_PATH, crack, load_ngrams
+    except ImportError:
+        crack = None
+    if crack:
+        ngrams = load_ngrams()
+        with open(CORPUS_PATH, encoding="utf-8") as f:
+            plaintext = f.read()[5000:6200].replace(" ", "").replace("\n", "")
+        for key in ([2, 5, 1, 6, 3, 4], [3, 1, 4, 7, 5, 2, 6], [3, 1, 4, 7, 5, 2, 6, 8], [5, 2, 9, 1, 7, 3, 10, 4, 8, 6]):
+            cipher_text = permutation_cipher(plaintext[:len(plaintext) // len(key) * len(key)], key)
+            crack_time, (found, _, _) = measure(crack, cipher_text, len(key), 8, 20, None, ngrams)
+            print(f"подбор ключа из {len(key):2d} столбцов: {crack_time:6.2f} с  "
+                  f"{'OK' if found == key else f'ошибка ({found})'}")
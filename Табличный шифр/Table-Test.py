@@ -1,6 +1,9 @@
 import unittest
 from unittest.mock import patch
 from Table import permutation_cipher,decrypt_permutation, get_key_from_input
+import random
+import Table
+from Table import multi_permutation_cipher, decrypt_multi_permutation
     
 class TestPermutationCipher(unittest.TestCase):
 
@@ -12,6 +15,11 @@ class TestPermutationCipher(unittest.TestCase):
         self.assertEqual(decrypt_permutation("EHLL*O", [2, 1]), "HELLO")
         self.assertEqual(decrypt_permutation("WROL*D", [1, 3, 2]), "WORLD")
         
+    def test_roundtrip_non_involutive_key(self):
+        self.assertEqual(permutation_cipher("ABCDEF", [2, 3, 1]), "BCAEFD")
+        self.assertEqual(decrypt_permutation("BCAEFD", [2, 3, 1]), "ABCDEF")
+        self.assertEqual(decrypt_permutation(permutation_cipher("HELLOWORLD", [3, 1, 4, 2]), [3, 1, 4, 2]), "HELLOWORLD")
+        
     def test_encryption_empty(self):
         self.assertEqual(permutation_cipher("", [2, 1]), "")   
         
@@ -19,6 +27,41 @@ class TestPermutationCipher(unittest.TestCase):
         self.assertEqual(permutation_cipher("hello123",[2, 1, 3]), "ehlol132*")
         self.assertEqual(permutation_cipher("ehlol132*",[2, 1, 3]), "hello123*")
    
+    def test_multi_round(self):
+        # Двойная перестановка совпадает с двумя вызовами permutation_cipher
+        keys = [[2, 1, 3], [3, 1, 4, 2]]
+        self.assertEqual(multi_permutation_cipher("HELLOWORLD", keys),
+                         permutation_cipher(permutation_cipher("HELLOWORLD", keys[0]), keys[1]))
+        self.assertEqual(decrypt_multi_permutation(multi_permutation_cipher("HELLOWORLD", keys), keys), "HELLOWORLD")
+        self.assertEqual(multi_permutation_cipher("HELLO", [[2, 1]]), "EHLL*O")
+        self.assertEqual(multi_permutation_cipher("", keys), "")
+
+    def test_multi_round_blocks(self):
+        # Тексты из нескольких блоков с хвостами разной длины совпадают с последовательными раундами
+        rng = random.Random(7)
+        for keys in ([[2, 1, 3], [3, 1, 4, 2]], [[5, 3, 1, 2, 4], [2, 1], [7, 1, 6, 2, 5, 3, 4]], [[1]]):
+            for length in (Table.BLOCK_TARGET - 1, Table.BLOCK_TARGET, 3 * Table.BLOCK_TARGET + rng.randint(1, 500)):
+                text = ''.join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=length))
+                reference = text
+                for key in keys:
+                    reference = permutation_cipher(reference, key)
+                self.assertEqual(multi_permutation_cipher(text, keys), reference)
+                self.assertEqual(decrypt_multi_permutation(reference, keys), text)
+
+    def test_multi_round_cache_bounded(self):
+        # Кэшируются только короткие перестановки (блок и хвост), а не список на всю длину текста
+        keys = ((2, 1, 3), (3, 1, 4, 2))
+        Table._cached_getters.cache_clear()
+        text = "AB" * (Table.MAX_CACHED_LENGTH + 1000)
+        self.assertEqual(decrypt_multi_permutation(multi_permutation_cipher(text, keys), keys), text)
+        self.assertLessEqual(Table._cached_getters.cache_info().currsize, 2)
+
+    def test_multi_round_non_permutation_key(self):
+        self.assertEqual(multi_permutation_cipher("ABCDEF", [[1, 3], [2, 1]]),
+                         permutation_cipher(permutation_cipher("ABCDEF", [1, 3]), [2, 1]))
+        with self.assertRaises(ValueError):
+            decrypt_multi_permutation("ABCD", [[1, 3], [2, 1]])
+
     @patch('builtins.input', side_effect=["2 1 3"])
     def test_get_key_from_input(self, mock_input):
         self.assertEqual(get_key_from_input(), [2, 1, 3])
@@ -1,3 +1,8 @@
+from functools import lru_cache
+from math import lcm
+from operator import itemgetter
+
+
 def permutation_cipher(text, key, fill_char='*'):
     """
     Шифрует текст методом перестановки с использованием таблицы.
@@ -52,11 +57,8 @@ def decrypt_permutation(cipher_text, key, fill_char='*'):
     # Восстанавливаем исходные строки
     plain_text = []
     for row in cipher_rows:
-        # Сортируем символы строки в исходном порядке
-        sorted_row = [''] * cols
-        for i, pos in enumerate(inverse_key):
-            if i < len(row):
-                sorted_row[pos] = row[i]
+        # Сортируем символы строки в исходном порядке: столбец k взят из позиции inverse_key[k]
+        sorted_row = [row[pos] for pos in inverse_key]
         plain_text.append(''.join(sorted_row))
     
     decrypted = ''.join(plain_text)
@@ -67,6 +69,162 @@ def decrypt_permutation(cipher_text, key, fill_char='*'):
     return decrypted
 
 
+def _padded_length(length, cols):
+    # Длина текста после дополнения до числа, кратного cols
+    return -(-length // cols) * cols
+
+
+def _round_gather(key):
+    # Индексы столбцов раунда в том же смысле, что и в permutation_cipher:
+    # номера больше числа столбцов пропускаются, отрицательные считаются с конца строки
+    cols = len(key)
+    if cols == 0:
+        raise ValueError("Ключ не может быть пустым")
+    gather = [k - 1 for k in key if k - 1 < cols]
+    gather = [k + cols if k < 0 else k for k in gather]
+    if any(k < 0 for k in gather):
+        raise IndexError("Номер столбца вне таблицы")
+    return cols, gather
+
+
+# Составные перестановки кэшируются только для коротких длин: блок (НОК ширин раундов) и хвост текста
+MAX_CACHED_LENGTH = 1 << 14
+BLOCK_TARGET = 1 << 12  # Примерная длина блока, который переставляется одним вызовом itemgetter
+
+
+def _block_length(keys):
+    # Если раунды не меняют длину текста, блок из НОК(ширин) символов переставляется независимо
+    # от остального текста. Блок увеличивается до ~BLOCK_TARGET символов, чтобы не вызывать
+    # itemgetter на каждые несколько символов. Ключи, пропускающие столбцы, меняют длину -
+    # тогда блоков нет (None) и весь текст переставляется одной перестановкой.
+    if any(len(_round_gather(key)[1]) != len(key) for key in keys):
+        return None
+    block = lcm(*(len(key) for key in keys))
+    return block * max(1, BLOCK_TARGET // block)
+
+
+def compose_keys(keys, length):
+    """
+    Составляет перестановки нескольких раундов в один список индексов.
+
+    :param keys: Кортеж ключей раундов (кортежи, например ((2, 1, 3), (3, 1, 2)))
+    :param length: Длина текста после дополнения в первом раунде
+    :return: Список индексов: символ i результата - символ index[i] дополненного текста,
+             индекс length означает символ заполнения, добавленный в следующих раундах
+    """
+    index = list(range(length))
+    for key in keys:
+        cols, gather = _round_gather(key)
+        index += [length] * (_padded_length(len(index), cols) - len(index))
+        index = [index[start + k] for start in range(0, len(index), cols) for k in gather]
+    return index
+
+
+def _compose_getters(keys, length):
+    # Готовые функции выборки для шифрования и расшифровки (None, если ключи - не перестановки)
+    index = compose_keys(keys, length)
+    inverse = None
+    if all(sorted(_round_gather(key)[1]) == list(range(len(key))) for key in keys):
+        inverse = [0] * length
+        for position, source in enumerate(index):
+            if source < length:
+                inverse[source] = position
+        inverse = itemgetter(*inverse) if inverse else (lambda buffer: ())
+    if not index:
+        # Ключи могут пропустить все столбцы - результат пустой, как и у permutation_cipher
+        return (lambda buffer: ()), inverse
+    return itemgetter(*index), inverse
+
+
+_cached_getters = lru_cache(maxsize=64)(_compose_getters)
+
+
+def _getters(keys, length):
+    # Короткие перестановки берутся из кэша, длинные строятся заново и освобождаются после вызова
+    if length <= MAX_CACHED_LENGTH:
+        return _cached_getters(keys, length)
+    return _compose_getters(keys, length)
+
+
+def multi_permutation_cipher(text, keys, fill_char='*'):
+    """
+    Шифрует текст несколькими раундами перестановки (двойная, тройная перестановка и т.д.).
+    Результат совпадает с последовательными вызовами permutation_cipher для каждого ключа,
+    но перестановки раундов заранее составлены в одну. Длина блока, кратная ширинам всех раундов,
+    переставляется независимо, поэтому текст переставляется блоками одной составной перестановкой,
+    а короткий хвост (с дополнением) - отдельной.
+
+    :param text: Исходный текст (без пробелов)
+    :param keys: Список ключей раундов (например, [[2, 1, 3], [3, 1, 2]])
+    :param fill_char: Символ для заполнения пустых ячеек
+    :return: Зашифрованная строка
+    """
+    keys = tuple(tuple(key) for key in keys)
+    if not keys:
+        return text
+    if not text:
+        return ''
+    length = _padded_length(len(text), len(keys[0]))
+    block = _block_length(keys)
+    full = length // block * block if block else 0
+    # Последний символ буфера (индекс length) - заполнение следующих раундов
+    buffer = text + fill_char * (length - len(text) + 1)
+    parts = []
+    if full:
+        encrypt, _ = _getters(keys, block)
+        parts = [''.join(encrypt(buffer[start:start + block])) for start in range(0, full, block)]
+    encrypt, _ = _getters(keys, length - full)
+    parts.append(''.join(encrypt(buffer[full:])))
+    return ''.join(parts)
+
+
+def decrypt_multi_permutation(cipher_text, keys, fill_char='*'):
+    """
+    Расшифровывает текст, зашифрованный multi_permutation_cipher, обратной составной перестановкой.
+
+    :param cipher_text: Зашифрованный текст
+    :param keys: Список ключей раундов в порядке шифрования
+    :param fill_char: Символ, который использовался для заполнения
+    :return: Исходный текст (без fill_char в конце)
+    """
+    keys = tuple(tuple(key) for key in keys)
+    if not keys or not cipher_text:
+        return cipher_text.rstrip(fill_char) if fill_char in cipher_text else cipher_text
+
+    def final_length(length):
+        for key in keys[1:]:
+            length = _padded_length(length, len(key))
+        return length
+
+    # Наибольшая длина первого раунда, дающая не больше символов, чем есть в шифротексте.
+    # Позиции символов не зависят от длины текста, поэтому лишние позиции - это заполнение
+    # следующих раундов, которое удаляется вместе с остальными символами заполнения.
+    cols = len(keys[0])
+    length = len(cipher_text) // cols * cols
+    while length > 0 and final_length(length) > len(cipher_text):
+        length -= cols
+    if length == 0:
+        return ''
+    block = _block_length(keys)
+    full = length // block * block if block else 0
+    parts = []
+    if full:
+        _, decrypt = _getters(keys, block)
+        if decrypt is None:
+            raise ValueError("Для расшифровки ключи должны быть перестановками чисел 1..n")
+        parts = [''.join(decrypt(cipher_text[start:start + block])) for start in range(0, full, block)]
+    _, decrypt = _getters(keys, length - full)
+    if decrypt is None:
+        raise ValueError("Для расшифровки ключи должны быть перестановками чисел 1..n")
+    # Хвост шифротекста - перестановка хвоста текста: full кратно ширинам всех раундов
+    parts.append(''.join(decrypt(cipher_text[full:final_length(length)])))
+    decrypted = ''.join(parts)
+    # Удаляем символы заполнения (если они были)
+    if fill_char in decrypted:
+        decrypted = decrypted.rstrip(fill_char)
+    return decrypted
+
+
 def get_key_from_input():
     """
     Запрашивает ключ у пользователя с клавиатуры.
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from Table import permutation_cipher
+from Table_crack import crack, encode, load_ngrams, score_batch
+
+PLAINTEXT = ("Moderncryptographyrestsonadifferentfoundation.Insteadofhopingthattheenemywillnot"
+             "discoverthemethod,thedesignersofamoderncipherpublisheverydetailofitandrelyonlyon"
+             "thesecrecyofthekey.Thekeyischosenatrandomfromaspacesolargethatnocomputercouldtry.")
+
+class TestPermutationCrack(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.ngrams = load_ngrams()
+
+    def test_encode(self):
+        self.assertEqual(encode("Az*").tolist(), [0, 25, 26])
+
+    def test_score_prefers_plaintext(self):
+        cipher_text = permutation_cipher(PLAINTEXT, [3, 1, 2])
+        scores = score_batch(encode(cipher_text), np.array([[1, 2, 0], [0, 1, 2]]), self.ngrams)
+        self.assertGreater(scores[0], scores[1])
+
+    def test_crack_empty(self):
+        for cipher_text in ("", "   "):
+            self.assertEqual(crack(cipher_text, workers=1, ngrams=self.ngrams), ([1], cipher_text, 0.0))
+
+    def test_crack_restarts_validated(self):
+        with self.assertRaises(ValueError):
+            crack("ABCDEFGHIJ", restarts=0, workers=1, ngrams=self.ngrams)
+
+    def test_crack_exhaustive(self):
+        for key in ([2, 1], [3, 1, 4, 2], [2, 5, 1, 6, 3, 4]):
+            cipher_text = permutation_cipher(PLAINTEXT, key)
+            found, plaintext, _ = crack(cipher_text, max_width=6, workers=1, ngrams=self.ngrams)
+            self.assertEqual(found, key)
+            self.assertEqual(plaintext, PLAINTEXT)
+
+    def test_crack_hill_climbing_on_pool(self):
+        key = [3, 1, 4, 5, 2]
+        cipher_text = permutation_cipher(PLAINTEXT, key)
+        found, plaintext, _ = crack(cipher_text, max_width=5, exhaustive_limit=3, workers=2,
+                                    ngrams=self.ngrams, seed=1)
+        self.assertEqual(found, key)
+        self.assertEqual(plaintext, PLAINTEXT)
+
+if __name__ == "__main__":
+    unittest.main()
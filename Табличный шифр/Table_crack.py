@@ -0,0 +1,182 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, permutations
+
+import numpy as np
+
+from Table_np import decrypt_permutation_np
+
+SYMBOLS = 27  # 26 латинских букв и "прочий символ"
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "english.txt")
+BATCH_SYMBOLS = 1 << 21  # Сколько символов расшифровок оценивать за одну операцию
+
+
+def encode(text):
+    """Переводит текст в номера символов: A-Z (без учёта регистра) -> 0-25, остальное -> 26"""
+    codes = np.frombuffer(text.upper().encode("utf-32-le"), dtype="<u4").astype(np.int64) - ord('A')
+    codes[(codes < 0) | (codes > 25)] = 26
+    return codes
+
+
+def build_ngrams(text):
+    """
+    Строит таблицу log10-вероятностей квадграмм (массив 27**4) по обучающему тексту без пробелов.
+    Наблюдаемые частоты смешиваются с оценкой по цепи Маркова на биграммах.
+    """
+    codes = encode(text.replace(" ", "").replace("\n", ""))
+    if len(codes) < 4:
+        raise ValueError("Обучающий текст слишком короткий")
+    unigrams = np.bincount(codes, minlength=SYMBOLS) + 1.0
+    bigrams = np.bincount(codes[:-1] * SYMBOLS + codes[1:], minlength=SYMBOLS ** 2)
+    bigrams = bigrams.reshape(SYMBOLS, SYMBOLS) + 1.0
+    transitions = bigrams / bigrams.sum(axis=1, keepdims=True)
+    markov = (unigrams / unigrams.sum())[:, None, None, None] * transitions[:, :, None, None] \
+        * transitions[None, :, :, None] * transitions[None, None, :, :]
+
+    quad_index = ((codes[:-3] * SYMBOLS + codes[1:-2]) * SYMBOLS + codes[2:-1]) * SYMBOLS + codes[3:]
+    observed = np.bincount(quad_index, minlength=SYMBOLS ** 4) / len(quad_index)
+    return np.log10(0.7 * observed + 0.3 * markov.ravel())
+
+
+def load_ngrams(path=None):
+    """Строит таблицу квадграмм по английскому тексту (по умолчанию english.txt рядом с модулем)"""
+    with open(path or CORPUS_PATH, encoding="utf-8") as f:
+        return build_ngrams(f.read())
+
+
+def score_batch(codes, inverses, ngrams):
+    """
+    Оценивает сразу несколько вариантов расшифровки.
+
+    :param codes: Шифротекст в виде номеров символов (длина кратна ширине таблицы)
+    :param inverses: Массив (варианты, ширина): для каждого столбца открытого текста - столбец шифротекста
+    :return: Сумма log10-вероятностей квадграмм для каждого варианта
+    """
+    count, width = inverses.shape
+    rows = len(codes) // width
+    # Полный обратный индекс каждого варианта: строка * ширина + столбец шифротекста
+    index = (np.arange(rows) * width)[None, :, None] + inverses[:, None, :]
+    plain = codes[index.reshape(count, rows * width)]
+    quad = ((plain[:, :-3] * SYMBOLS + plain[:, 1:-2]) * SYMBOLS + plain[:, 2:-1]) * SYMBOLS + plain[:, 3:]
+    return ngrams[quad].sum(axis=1)
+
+
+def _search_exhaustive(codes, ngrams, width, first):
+    """Перебирает все перестановки ширины width, начинающиеся со столбца first"""
+    rest = [column for column in range(width) if column != first]
+    batch_size = max(1, BATCH_SYMBOLS // max(len(codes), 1))
+    candidates = permutations(rest)
+    best_score, best = float("-inf"), None
+    while True:
+        chunk = list(islice(candidates, batch_size))
+        if not chunk:
+            return best_score, best
+        inverses = np.empty((len(chunk), width), dtype=np.int64)
+        inverses[:, 0] = first
+        inverses[:, 1:] = chunk
+        scores = score_batch(codes, inverses, ngrams)
+        i = int(scores.argmax())
+        if scores[i] > best_score:
+            best_score, best = float(scores[i]), inverses[i].tolist()
+
+
+def _search_climb(codes, ngrams, width, seed, restarts):
+    """Подъём на холм: на каждом шаге оцениваются все обмены двух столбцов и все циклические сдвиги"""
+    rng = random.Random(seed)
+    pairs = [(i, j) for i in range(width) for j in range(i + 1, width)]
+    best_score, best = float("-inf"), None
+    for _ in range(restarts):
+        current = list(range(width))
+        rng.shuffle(current)
+        current_score = float(score_batch(codes, np.array([current]), ngrams)[0])
+        while True:
+            neighbours = []
+            for i, j in pairs:
+                candidate = current[:]
+                candidate[i], candidate[j] = candidate[j], candidate[i]
+                neighbours.append(candidate)
+            for shift in range(1, width):
+                neighbours.append(current[shift:] + current[:shift])
+            scores = score_batch(codes, np.array(neighbours), ngrams)
+            i = int(scores.argmax())
+            if scores[i] <= current_score:
+                break
+            current, current_score = neighbours[i], float(scores[i])
+        if current_score > best_score:
+            best_score, best = current_score, current
+    return best_score, best
+
+
+_worker_state = None
+
+def _init_worker(codes, ngrams):
+    # Шифротекст и таблица квадграмм передаются в процесс один раз
+    global _worker_state
+    _worker_state = (codes, ngrams)
+
+def _run_task(task):
+    codes, ngrams = _worker_state
+    kind, width, argument, restarts = task
+    if kind == "exhaustive":
+        return width, _search_exhaustive(codes, ngrams, width, argument)
+    return width, _search_climb(codes, ngrams, width, argument, restarts)
+
+
+def crack(cipher_text, max_width=12, exhaustive_limit=8, restarts=20, workers=None, ngrams=None,
+          fill_char='*', seed=None):
+    """
+    Подбирает ключ перестановки по шифротексту.
+    Проверяются ширины таблицы, на которые делится длина шифротекста: до exhaustive_limit
+    столбцов - полным перебором, шире - подъёмом на холм. Задачи распределяются по пулу процессов.
+
+    :return: (ключ в формате permutation_cipher, расшифрованный текст, оценка)
+    """
+    if restarts < 1:
+        raise ValueError("restarts должно быть не меньше 1")
+    workers = workers or os.cpu_count() or 1
+    if not cipher_text.strip():
+        # Подбирать нечего: тождественный ключ оставляет текст как есть
+        return [1], cipher_text, 0.0
+    codes = encode(cipher_text)
+    if ngrams is None:
+        ngrams = load_ngrams()
+    widths = [w for w in range(1, min(max_width, len(cipher_text)) + 1) if len(cipher_text) % w == 0]
+    rng = random.Random(seed)
+    tasks = []
+    for width in widths:
+        if width <= exhaustive_limit:
+            tasks.extend(("exhaustive", width, first, 0) for first in range(width))
+        else:
+            # Перезапуски делятся между несколькими задачами, чтобы загрузить все процессы
+            parts = min(restarts, workers)
+            tasks.extend(("climb", width, rng.randrange(2 ** 31), -(-restarts // parts)) for _ in range(parts))
+
+    if workers == 1:
+        _init_worker(codes, ngrams)
+        results = [_run_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(codes, ngrams)) as pool:
+            results = list(pool.map(_run_task, tasks))
+
+    best = {}
+    for width, (score, inverse) in results:
+        if inverse is not None and score > best.get(width, (float("-inf"),))[0]:
+            best[width] = (score, inverse)
+    # Ключ ширины w повторённый дважды даёт ту же расшифровку при ширине 2w - берём самую узкую
+    top_score = max(score for score, _ in best.values())
+    width = min(w for w, (score, _) in best.items() if score >= top_score - 1e-6 * abs(top_score))
+    score, inverse = best[width]
+
+    key = [0] * width
+    for plain_column, cipher_column in enumerate(inverse):
+        key[cipher_column] = plain_column + 1
+    return key, decrypt_permutation_np(cipher_text, key, fill_char), score
+
+
+if __name__ == "__main__":
+    cipher_text = input("Введите зашифрованный текст: ").replace(" ", "")
+    key, plaintext, score = crack(cipher_text)
+    print(f"Найденный ключ: {' '.join(map(str, key))}")
+    print(f"Расшифрованный текст: {plaintext}")
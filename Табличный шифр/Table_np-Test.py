@@ -0,0 +1,70 @@
+import random
+import string
+import unittest
+from Table import permutation_cipher, decrypt_permutation, multi_permutation_cipher
+from Table_np import permutation_cipher_np, decrypt_permutation_np, compile_key
+from Table_np import multi_permutation_cipher_np, decrypt_multi_permutation_np
+
+class TestPermutationEngine(unittest.TestCase):
+
+    def test_known_vectors(self):
+        self.assertEqual(permutation_cipher_np("HELLO", [2, 1]), "EHLL*O")
+        self.assertEqual(permutation_cipher_np("WORLD", [1, 3, 2]), "WROL*D")
+        self.assertEqual(decrypt_permutation_np("EHLL*O", [2, 1]), "HELLO")
+        self.assertEqual(decrypt_permutation_np("WROL*D", [1, 3, 2]), "WORLD")
+        self.assertEqual(permutation_cipher_np("", [2, 1]), "")
+
+    def test_matches_reference(self):
+        rng = random.Random(5)
+        for _ in range(200):
+            cols = rng.randint(1, 9)
+            key = rng.sample(range(1, cols + 1), cols)
+            text = ''.join(rng.choices(string.ascii_letters + "Яё ", k=rng.randint(0, 60)))
+            encrypted = permutation_cipher_np(text, key)
+            self.assertEqual(encrypted, permutation_cipher(text, key))
+            self.assertEqual(decrypt_permutation_np(encrypted, key), decrypt_permutation(encrypted, key))
+            self.assertEqual(decrypt_permutation_np(encrypted, key), text.rstrip('*'))
+
+    def test_custom_fill_char(self):
+        self.assertEqual(permutation_cipher_np("HELLO", [2, 1], fill_char='#'), "EHLL#O")
+        self.assertEqual(decrypt_permutation_np("EHLL#O", [2, 1], fill_char='#'), "HELLO")
+
+    def test_non_permutation_key(self):
+        # Номера вне таблицы пропускаются так же, как в permutation_cipher
+        self.assertEqual(permutation_cipher_np("ABCD", [1, 3]), permutation_cipher("ABCD", [1, 3]))
+        self.assertIsNone(compile_key((1, 3))[2])
+        with self.assertRaises(ValueError):
+            decrypt_permutation_np("ABCD", [1, 3])
+        with self.assertRaises(ValueError):
+            permutation_cipher_np("ABCD", [])
+    def test_multi_round_matches_reference(self):
+        rng = random.Random(12)
+        for _ in range(200):
+            keys = [rng.sample(range(1, cols + 1), cols) for cols in rng.choices(range(1, 8), k=rng.randint(1, 3))]
+            text = ''.join(rng.choices(string.ascii_letters + "Яё", k=rng.randint(0, 60)))
+            reference = text
+            for key in keys:
+                reference = permutation_cipher(reference, key)
+            self.assertEqual(multi_permutation_cipher_np(text, keys), reference)
+            self.assertEqual(multi_permutation_cipher(text, keys), reference)
+            self.assertEqual(decrypt_multi_permutation_np(reference, keys), text)
+
+    def test_multi_round_long_text(self):
+        # Несколько блоков и хвост, в том числе ключи, дублирующие столбцы
+        rng = random.Random(5)
+        for keys in ([[2, 1, 3], [3, 1, 4, 2]], [[5, 3, 1, 2, 4], [2, 1], [7, 1, 6, 2, 5, 3, 4]], [[1, 1, 2], [2, 1]]):
+            text = ''.join(rng.choices(string.ascii_letters, k=rng.randint(5000, 6000)))
+            reference = text
+            for key in keys:
+                reference = permutation_cipher(reference, key)
+            self.assertEqual(multi_permutation_cipher_np(text, keys), reference)
+            self.assertEqual(multi_permutation_cipher(text, keys), reference)
+
+    def test_multi_round_non_permutation_key(self):
+        keys = [[1, 3], [2, 1]]
+        self.assertEqual(multi_permutation_cipher_np("ABCDEF", keys), multi_permutation_cipher("ABCDEF", keys))
+        with self.assertRaises(ValueError):
+            decrypt_multi_permutation_np("ABCD", keys)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+from functools import lru_cache
+from math import lcm
+
+import numpy as np
+
+
+@lru_cache(maxsize=128)
+def compile_key(key):
+    """
+    Заранее вычисляет индексы выборки столбцов для ключа.
+
+    :param key: Порядок столбцов (кортеж, например (2, 1, 3))
+    :return: (число столбцов, индексы для шифрования, индексы для расшифровки или None,
+              если ключ не является перестановкой)
+    """
+    cols = len(key)
+    if cols == 0:
+        raise ValueError("Ключ не может быть пустым")
+    # Как и в permutation_cipher: номера больше числа столбцов пропускаются,
+    # отрицательные индексы считаются с конца строки
+    gather = [k - 1 for k in key if k - 1 < cols]
+    gather = [k + cols if k < 0 else k for k in gather]
+    if any(k < 0 for k in gather):
+        raise IndexError("Номер столбца вне таблицы")
+
+    inverse = None
+    if sorted(gather) == list(range(cols)):
+        inverse = [0] * cols
+        for i, k in enumerate(gather):
+            inverse[k] = i
+        inverse = np.array(inverse, dtype=np.intp)
+    return cols, np.array(gather, dtype=np.intp), inverse
+
+
+def _to_array(text):
+    # ASCII хранится по байту на символ, остальной текст - по 4 байта (UTF-32)
+    if text.isascii():
+        return np.frombuffer(text.encode("ascii"), dtype=np.uint8), "ascii"
+    return np.frombuffer(text.encode("utf-32-le"), dtype="<u4"), "utf-32-le"
+
+
+def permutation_cipher_np(text, key, fill_char='*'):
+    """
+    Шифрует текст методом перестановки одной выборкой по заранее вычисленным индексам.
+    Результат совпадает с permutation_cipher.
+    """
+    cols, gather, _ = compile_key(tuple(key))
+    remainder = len(text) % cols
+    if remainder != 0:
+        text += fill_char * (cols - remainder)
+    data, encoding = _to_array(text)
+    # Строки таблицы - это строки матрицы (rows, cols); ключ выбирает её столбцы
+    return data.reshape(-1, cols)[:, gather].tobytes().decode(encoding)
+
+
+def decrypt_permutation_np(cipher_text, key, fill_char='*'):
+    """
+    Расшифровывает текст одной выборкой по обратной перестановке.
+    Результат совпадает с decrypt_permutation.
+    """
+    cols, _, inverse = compile_key(tuple(key))
+    if inverse is None:
+        raise ValueError("Для расшифровки ключ должен быть перестановкой чисел 1..n")
+    rows = len(cipher_text) // cols
+    data, encoding = _to_array(cipher_text[:rows * cols])
+    decrypted = data.reshape(rows, cols)[:, inverse].tobytes().decode(encoding)
+    # Удаляем символы заполнения (если они были)
+    if fill_char in decrypted:
+        decrypted = decrypted.rstrip(fill_char)
+    return decrypted
+
+
+MAX_CACHED_LENGTH = 1 << 16  # Составные перестановки длиннее этого не кэшируются
+
+
+def compose_keys_np(keys, length):
+    """
+    Составляет перестановки нескольких раундов в один массив индексов (см. Table.compose_keys).
+
+    :param keys: Кортеж ключей раундов (кортежи)
+    :param length: Длина текста после дополнения в первом раунде
+    :return: (индексы для шифрования, индексы для расшифровки или None, если ключи - не перестановки);
+             индекс length в массиве шифрования означает символ заполнения следующих раундов
+    """
+    index = np.arange(length, dtype=np.intp)
+    permutation = True
+    for key in keys:
+        cols, gather, inverse = compile_key(key)
+        permutation = permutation and inverse is not None
+        remainder = len(index) % cols
+        if remainder != 0:
+            index = np.concatenate([index, np.full(cols - remainder, length, dtype=np.intp)])
+        index = index.reshape(-1, cols)[:, gather].ravel()
+
+    inverse = None
+    if permutation:
+        inverse = np.empty(length, dtype=np.intp)
+        sources = index < length
+        inverse[index[sources]] = np.flatnonzero(sources)
+    return index, inverse
+
+
+_cached_compose = lru_cache(maxsize=64)(compose_keys_np)
+
+
+def _compose(keys, length):
+    # Короткие перестановки (блок и хвост текста) берутся из кэша, длинные строятся заново
+    if length <= MAX_CACHED_LENGTH:
+        return _cached_compose(keys, length)
+    return compose_keys_np(keys, length)
+
+
+def _block_length(keys):
+    # Блок из НОК(ширин) символов переставляется независимо от остального текста,
+    # если раунды не меняют длину (см. Table._block_length); иначе None
+    widths = [compile_key(key)[0] for key in keys]
+    if any(len(compile_key(key)[1]) != cols for key, cols in zip(keys, widths)):
+        return None
+    return lcm(*widths)
+
+
+def _permute(data, keys, length, block, inverse):
+    # Переставляет полные блоки одной выборкой по матрице (блоки, длина блока), затем хвост
+    full = length // block * block if block else 0
+    parts = []
+    if full:
+        indexes = _compose(keys, block)
+        if inverse and indexes[1] is None:
+            raise ValueError("Для расшифровки ключи должны быть перестановками чисел 1..n")
+        parts.append(data[:full].reshape(-1, block)[:, indexes[inverse]].ravel())
+    indexes = _compose(keys, length - full)
+    if inverse and indexes[1] is None:
+        raise ValueError("Для расшифровки ключи должны быть перестановками чисел 1..n")
+    parts.append(data[full:][indexes[inverse]])
+    return np.concatenate(parts)
+
+
+def multi_permutation_cipher_np(text, keys, fill_char='*'):
+    """
+    Шифрует текст несколькими раундами перестановки выборкой по составленным индексам:
+    полные блоки (НОК ширин раундов) - одной выборкой по матрице блоков, хвост - отдельно.
+    Результат совпадает с multi_permutation_cipher.
+    """
+    keys = tuple(tuple(key) for key in keys)
+    if not keys:
+        return text
+    if not text:
+        return ''
+    cols = compile_key(keys[0])[0]
+    length = -(-len(text) // cols) * cols
+    data, encoding = _to_array(text + fill_char * (length - len(text) + 1))
+    return _permute(data, keys, length, _block_length(keys), False).tobytes().decode(encoding)
+
+
+def decrypt_multi_permutation_np(cipher_text, keys, fill_char='*'):
+    """
+    Расшифровывает текст обратной составной перестановкой.
+    Результат совпадает с decrypt_multi_permutation.
+    """
+    keys = tuple(tuple(key) for key in keys)
+    if not keys or not cipher_text:
+        return cipher_text.rstrip(fill_char) if fill_char in cipher_text else cipher_text
+
+    def final_length(length):
+        for key in keys[1:]:
+            length = -(-length // len(key)) * len(key)
+        return length
+
+    # Как и в decrypt_multi_permutation: лишние позиции - заполнение следующих раундов
+    cols = compile_key(keys[0])[0]
+    length = len(cipher_text) // cols * cols
+    while length > 0 and final_length(length) > len(cipher_text):
+        length -= cols
+    if length == 0:
+        return ''
+    data, encoding = _to_array(cipher_text[:final_length(length)])
+    decrypted = _permute(data, keys, length, _block_length(keys), True).tobytes().decode(encoding)
+    # Удаляем символы заполнения (если они были)
+    if fill_char in decrypted:
+        decrypted = decrypted.rstrip(fill_char)
+    return decrypted
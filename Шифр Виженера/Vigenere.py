@@ -31,6 +31,75 @@ def vigenere_decrypt(ciphertext, key):
     
     return ''.join(decrypted_text)
 
+class VigenereStream:
+    """
+    Потоковый шифр Виженера: запоминает позицию в ключе между вызовами update(),
+    поэтому ''.join(update(часть) ...) + finalize() совпадает с результатом vigenere_encrypt/decrypt.
+    Принимает str и bytes/bytearray/memoryview (для байтов символом считается каждый байт).
+    """
+
+    def __init__(self, key, decrypt=False):
+        if not key:
+            raise ValueError("Ключ не может быть пустым")
+        key_upper = key.upper()
+        shifts = [(ord(key_upper[j]) - ord('A')) % 26 for j in range(len(key))]
+        if decrypt:
+            shifts = [-shift % 26 for shift in shifts]
+        self.shifts = shifts
+        self.key_length = len(key)
+        self.position = 0
+        self._finalized = False
+        self._empty = ''
+        # Таблица для каждой буквы ключа сразу переводит букву в верхний регистр и сдвигает её
+        self._tables = []
+        for shift in shifts:
+            table = bytearray(range(256))
+            for i in range(26):
+                table[ord('A') + i] = table[ord('a') + i] = ord('A') + (i + shift) % 26
+            self._tables.append(bytes(table))
+
+    def _transform_bytes(self, data):
+        # Символы, попадающие на одну букву ключа, идут с шагом key_length - переводим их одним срезом
+        view = memoryview(data).cast('B')
+        size = len(view)
+        output = bytearray(size)
+        for start in range(min(self.key_length, size)):
+            table = self._tables[(self.position + start) % self.key_length]
+            output[start::self.key_length] = bytes(view[start::self.key_length]).translate(table)
+        self.position += size
+        return bytes(output)
+
+    def _transform_text(self, text):
+        upper = text.upper()
+        if upper.isascii():
+            return self._transform_bytes(upper.encode('ascii')).decode('ascii')
+        # Не-ASCII символы обрабатываются так же, как в vigenere_encrypt
+        result = []
+        for i, char in enumerate(upper, self.position):
+            if char.isalpha():
+                shift = self.shifts[i % self.key_length]
+                result.append(chr((ord(char) - ord('A') + shift) % 26 + ord('A')))
+            else:
+                result.append(char)
+        self.position += len(upper)
+        return ''.join(result)
+
+    def update(self, chunk):
+        """Обрабатывает очередную часть сообщения и возвращает результат того же типа (str или bytes)"""
+        if self._finalized:
+            raise ValueError("Поток уже завершён")
+        if isinstance(chunk, str):
+            self._empty = ''
+            return self._transform_text(chunk)
+        self._empty = b''
+        return self._transform_bytes(chunk)
+
+    def finalize(self):
+        """Завершает поток; шифр Виженера не буферизует данные, поэтому остаток всегда пустой"""
+        self._finalized = True
+        return self._empty
+
+
 if __name__ == "__main__":
     message = input("Введите сообщение для шифрования (английские буквы): ")
     key = input("Введите ключ (английские буквы): ")
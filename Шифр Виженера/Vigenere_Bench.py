@@ -0,0 +1,97 @@
+import random
+import string
+import time
+
+from Vigenere import vigenere_encrypt, vigenere_decrypt, VigenereStream
+from Vigenere_np import vigenere_encrypt_np, vigenere_decrypt_np, vigenere_encrypt_batch
+
+
+def make_text(size, seed=0):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + " .,!\n"
+    return ''.join(rng.choices(alphabet, k=size))
+
+
+WORDS = ("the of and to in a is that for it as was with be by on not he this are or his from at which "
+         "but have an they you were her she there been one all we their has would when if so no will "
+         "more what up out who them some time could into two then than its only other new may people "
+         "about also after first made over did many before must through back years where much your way "
+         "well down should because each just those how too little state good very make world still own "
+         "see men work long here between both life being under never day same another know while last").split()
+
+
+def make_english(size, seed=0):
+    # Корпус из частых английских слов с убывающими (по Ципфу) весами
+    rng = random.Random(seed)
+    words = rng.choices(WORDS, weights=[1 / (rank + 1) for rank in range(len(WORDS))], k=size // 4)
+    text = ' '.join(words)
+    return text[:size]
+
+
+def measure(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(name, size, seconds):
+    print(f"{name:<28} {size / 2**20:8.1f} МБ  {seconds:8.4f} с  {size / 2**20 / seconds:10.1f} МБ/с")
+
+
+if __name__ == "__main__":
+    size = 10 * 2**20
+    text, key = make_text(size), "LEMONADE"
+
+    loop_time, loop_result = measure(vigenere_encrypt, text, key, repeat=1)
+    np_time, np_result = measure(vigenere_encrypt_np, text, key)
+    assert loop_result == np_result
+    report("vigenere_encrypt (цикл)", size, loop_time)
+    report("vigenere_encrypt_np", size, np_time)
+
+    loop_time, loop_result = measure(vigenere_decrypt, np_result, key, repeat=1)
+    np_time, np_result = measure(vigenere_decrypt_np, np_result, key)
+    assert loop_result == np_result
+    report("vigenere_decrypt (цикл)", size, loop_time)
+    report("vigenere_decrypt_np", size, np_time)
+    print(f"Ускорение: {loop_time / np_time:.1f}x")
+
+    # Потоковая обработка блоками по 256 КБ: память постоянна, позиция ключа переносится между блоками
+    data = text.encode("ascii")
+
+    def stream_encrypt(chunk_size=1 << 18):
+        stream = VigenereStream(key)
+        view = memoryview(data)
+        parts = [stream.update(view[i:i + chunk_size]) for i in range(0, len(view), chunk_size)]
+        return b''.join(parts) + stream.finalize()
+
+    stream_time, stream_result = measure(stream_encrypt)
+    assert stream_result == vigenere_encrypt_np(text, key).encode("ascii")
+    report("VigenereStream, bytes", size, stream_time)
+
+    # Пакет из множества коротких сообщений с разными ключами
+    rng = random.Random(1)
+    pairs = [(make_text(200, seed=i), ''.join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 12))))
+             for i in range(20000)]
+    loop_time, loop_result = measure(lambda: [vigenere_encrypt(t, k) for t, k in pairs], repeat=1)
+    batch_time, batch_result = measure(vigenere_encrypt_batch, pairs)
+    assert loop_result == batch_result
+    print(f"\n{'пакет, цикл':<28} {len(pairs) / loop_time:10.0f} сообщений/с")
+    print(f"{'vigenere_encrypt_batch':<28} {len(pairs) / batch_time:10.0f} сообщений/с")
+
+    # Взлом без ключа: корпус, зашифрованный vigenere_encrypt
+    try:
+        from Vigenere_crack import crack
+    except ImportError:
+        crack = None
+    for size in ((50_000, 200_000, 500_000) if crack else ()):
+        plaintext = make_english(size, seed=size)
+        for key in ("LEMON", "CRYPTOGRAPHY"):
+            ciphertext = vigenere_encrypt(plaintext, key)
+            crack_time, (found, _, _) = measure(crack, ciphertext, 20, 5, 1, repeat=1)
+            pool_time, _ = measure(crack, ciphertext, repeat=1)
+            status = "OK" if found == key else f"ошибка ({found})"
+            print(f"взлом {size / 1000:6.0f} КБ, ключ {key:<13} {crack_time:7.3f} с (1 процесс), "
+                  f"{pool_time:7.3f} с (пул процессов)  {status}")
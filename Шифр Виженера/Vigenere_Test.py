@@ -1,5 +1,5 @@
 import unittest
-from Vigenere import vigenere_encrypt, vigenere_decrypt
+from Vigenere import vigenere_encrypt, vigenere_decrypt, VigenereStream
 
 class TestVigenereCipher(unittest.TestCase):
     def test_encrypt_basic(self):
@@ -41,5 +41,41 @@ class TestVigenereCipher(unittest.TestCase):
         self.assertEqual(vigenere_encrypt("TEST", "TEST"), "MIKM")
         self.assertEqual(vigenere_decrypt("MIKM", "TEST"), "TEST")
 
+class TestVigenereStream(unittest.TestCase):
+    def test_chunks_join_to_one_shot(self):
+        #Тест: результат по частям совпадает с шифрованием целиком
+        text = "Hello, World! Attack at dawn. " * 20
+        for chunk_size in (1, 2, 5, 7, 64, 1000):
+            for decrypt, reference in ((False, vigenere_encrypt), (True, vigenere_decrypt)):
+                stream = VigenereStream("LEMON", decrypt=decrypt)
+                parts = [stream.update(text[i:i + chunk_size]) for i in range(0, len(text), chunk_size)]
+                parts.append(stream.finalize())
+                self.assertEqual(''.join(parts), reference(text, "LEMON"))
+    
+    def test_bytes_and_memoryview(self):
+        #Тест байтовых частей
+        data = b"ATTACK AT DAWN, attack at dawn!"
+        stream = VigenereStream("LEMON")
+        result = stream.update(data[:10]) + stream.update(memoryview(data)[10:]) + stream.finalize()
+        self.assertEqual(result, vigenere_encrypt(data.decode(), "LEMON").encode())
+        decrypt_stream = VigenereStream("LEMON", decrypt=True)
+        self.assertEqual(decrypt_stream.update(bytearray(result)), data.upper())
+    
+    def test_non_ascii_chunks(self):
+        #Тест не-ASCII символов в частях
+        text = "Привет, straße! Hello"
+        stream = VigenereStream("KEY")
+        self.assertEqual(stream.update(text[:8]) + stream.update(text[8:]), vigenere_encrypt(text, "KEY"))
+    
+    def test_finalize(self):
+        #Тест завершения потока
+        stream = VigenereStream("KEY")
+        self.assertEqual(stream.update(b"abc"), b"KFA")
+        self.assertEqual(stream.finalize(), b"")
+        with self.assertRaises(ValueError):
+            stream.update("abc")
+        with self.assertRaises(ValueError):
+            VigenereStream("")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Vigenere import vigenere_decrypt
+
+# Частоты букв английского языка (%), A-Z
+ENGLISH_FREQUENCIES = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]) / 100
+LOG_FREQUENCIES = np.log(ENGLISH_FREQUENCIES / ENGLISH_FREQUENCIES.sum())
+ENGLISH_IC = float((ENGLISH_FREQUENCIES ** 2).sum())  # ~0.066 для английского, ~0.038 для случайного текста
+FITNESS_TOLERANCE = 0.05
+ROTATIONS = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+
+def _letters(ciphertext):
+    """
+    Возвращает номера букв (0-25) и их позиции в полном тексте.
+    Позиции нужны потому, что индекс ключа растёт на каждом символе, включая не-буквы.
+    """
+    text = ciphertext.upper()
+    if text.isascii():
+        codes = np.frombuffer(text.encode("ascii"), dtype=np.uint8).astype(np.int64)
+    else:
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4").astype(np.int64)
+    positions = np.flatnonzero((codes >= ord('A')) & (codes <= ord('Z')))
+    return codes[positions] - ord('A'), positions
+
+
+def kasiski_distances(ciphertext, n=3):
+    """
+    Находит расстояния между повторами n-грамм через индекс n-грамм (сортировка кодов),
+    без повторного поиска подстрок.
+
+    :param n: Длина n-граммы; учитываются только n-граммы из подряд идущих букв
+    :return: Массив расстояний между соседними вхождениями одинаковых n-грамм
+    """
+    letters, positions = _letters(ciphertext)
+    if len(letters) < n:
+        return np.zeros(0, dtype=np.int64)
+    count = len(letters) - n + 1
+    codes = np.zeros(count, dtype=np.int64)
+    for offset in range(n):
+        codes = codes * 26 + letters[offset:offset + count]
+    # n-грамма должна занимать n соседних позиций исходного текста
+    contiguous = positions[n - 1:] - positions[:count] == n - 1
+    codes, starts = codes[contiguous], positions[:count][contiguous]
+
+    order = np.argsort(codes, kind="stable")
+    codes, starts = codes[order], starts[order]
+    same = codes[1:] == codes[:-1]
+    return (starts[1:] - starts[:-1])[same]
+
+
+def kasiski_scores(distances, max_key_length=20):
+    """Доля расстояний, кратных каждой длине ключа 1..max_key_length"""
+    lengths = np.arange(1, max_key_length + 1)
+    if len(distances) == 0:
+        return np.zeros(max_key_length)
+    return (distances[None, :] % lengths[:, None] == 0).mean(axis=1)
+
+
+def _column_counts(letters, positions, key_length):
+    counts = np.bincount((positions % key_length) * 26 + letters, minlength=key_length * 26)
+    return counts.reshape(key_length, 26)
+
+
+def index_of_coincidence(ciphertext, key_length):
+    """Средний индекс совпадений столбцов, соответствующих буквам ключа"""
+    letters, positions = _letters(ciphertext)
+    return _mean_ic(_column_counts(letters, positions, key_length))
+
+
+def _mean_ic(counts):
+    totals = counts.sum(axis=1)
+    valid = totals > 1
+    if not valid.any():
+        return 0.0
+    ic = (counts * (counts - 1)).sum(axis=1)[valid] / (totals * (totals - 1))[valid]
+    return float(ic.mean())
+
+
+def estimate_key_lengths(ciphertext, max_key_length=20, top=5):
+    """
+    Оценивает длину ключа по методу Касиски и индексу совпадений.
+
+    :return: Список (длина, оценка) от наиболее вероятной к наименее вероятной
+    """
+    letters, positions = _letters(ciphertext)
+    kasiski = kasiski_scores(kasiski_distances(ciphertext), max_key_length)
+    scores = []
+    for length in range(1, max_key_length + 1):
+        ic = _mean_ic(_column_counts(letters, positions, length))
+        # Индекс совпадений высок и для кратных длин, а доля Касиски - для делителей;
+        # произведение выделяет саму длину ключа
+        scores.append((length, (ic / ENGLISH_IC) * (0.1 + kasiski[length - 1])))
+    scores.sort(key=lambda item: -item[1])
+    return scores[:top]
+
+
+def _minimal_period(key):
+    # "LEMONLEMON" -> "LEMON": кратная длина даёт ту же расшифровку
+    for period in range(1, len(key)):
+        if len(key) % period == 0 and key[:period] * (len(key) // period) == key:
+            return key[:period]
+    return key
+
+
+def _solve_key(letters, positions, key_length):
+    counts = _column_counts(letters, positions, key_length).astype(np.float64)
+    observed = counts[:, ROTATIONS]  # [столбец, сдвиг, буква открытого текста]
+    expected = counts.sum(axis=1)[:, None, None] * ENGLISH_FREQUENCIES[None, None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2 = np.nan_to_num((observed - expected) ** 2 / expected).sum(axis=2)
+    shifts = chi2.argmin(axis=1)
+    key = ''.join(chr(ord('A') + int(shift)) for shift in shifts)
+    # Правдоподобие расшифровки в расчёте на букву - общая шкала для разных длин ключа
+    fitness = float((observed[np.arange(key_length), shifts] @ LOG_FREQUENCIES).sum()) / max(len(letters), 1)
+    return key, fitness
+
+
+def recover_key(ciphertext, key_length):
+    """
+    Восстанавливает ключ заданной длины частотным анализом каждого столбца.
+
+    :return: (ключ, средний логарифм правдоподобия буквы расшифровки)
+    """
+    letters, positions = _letters(ciphertext)
+    return _solve_key(letters, positions, key_length)
+
+
+_worker_letters = None
+_worker_positions = None
+
+def _init_worker(letters, positions):
+    # Шифротекст передаётся в процесс один раз, а не с каждой задачей
+    global _worker_letters, _worker_positions
+    _worker_letters, _worker_positions = letters, positions
+
+def _solve_in_worker(key_length):
+    return key_length, _solve_key(_worker_letters, _worker_positions, key_length)
+
+
+def crack(ciphertext, max_key_length=20, top=5, workers=None):
+    """
+    Взламывает шифр Виженера без ключа.
+
+    :param max_key_length: Наибольшая проверяемая длина ключа
+    :param top: Сколько наиболее вероятных длин ключа проверять полностью
+    :param workers: Число процессов для проверки длин (1 - без пула процессов)
+    :return: (ключ, расшифрованный текст, [(длина, ключ, оценка), ...] от лучшего к худшему)
+    """
+    if top < 1 or max_key_length < 1:
+        raise ValueError("top и max_key_length должны быть не меньше 1")
+    letters, positions = _letters(ciphertext)
+    lengths = [length for length, _ in estimate_key_lengths(ciphertext, max_key_length, top)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        solved = [(length, _solve_key(letters, positions, length)) for length in lengths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(lengths)), initializer=_init_worker,
+                                 initargs=(letters, positions)) as pool:
+            solved = list(pool.map(_solve_in_worker, lengths))
+
+    candidates = sorted(((length, key, fitness) for length, (key, fitness) in solved),
+                        key=lambda item: -item[2])
+    # Кратные длины расшифровывают не хуже настоящей, поэтому из почти равных берём самую короткую
+    best_fitness = candidates[0][2]
+    key = min((key for _, key, fitness in candidates if fitness >= best_fitness - FITNESS_TOLERANCE), key=len)
+    key = _minimal_period(key)
+    return key, vigenere_decrypt(ciphertext, key), candidates
+
+
+if __name__ == "__main__":
+    ciphertext = input("Введите зашифрованное сообщение: ")
+    key, plaintext, candidates = crack(ciphertext)
+    print(f"Найденный ключ: {key}")
+    print(f"Расшифрованное сообщение: {plaintext}")
+    print("Проверенные длины ключа:", ", ".join(f"{length} ({k})" for length, k, _ in candidates))
@@ -0,0 +1,63 @@
+import unittest
+from Vigenere import vigenere_encrypt
+from Vigenere_crack import (crack, estimate_key_lengths, index_of_coincidence,
+                            kasiski_distances, recover_key)
+
+PLAINTEXT = (
+    "It was the best of times, it was the worst of times, it was the age of wisdom, it was the age "
+    "of foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the season "
+    "of light, it was the season of darkness, it was the spring of hope, it was the winter of despair, "
+    "we had everything before us, we had nothing before us, we were all going direct to heaven, we were "
+    "all going direct the other way. In short, the period was so far like the present period, that some "
+    "of its noisiest authorities insisted on its being received, for good or for evil, in the superlative "
+    "degree of comparison only. There were a king with a large jaw and a queen with a plain face, on the "
+    "throne of England; there were a king with a large jaw and a queen with a fair face, on the throne of "
+    "France. In both countries it was clearer than crystal to the lords of the State preserves of loaves "
+    "and fishes, that things in general were settled for ever."
+)
+
+class TestVigenereCrack(unittest.TestCase):
+    def test_kasiski_distances(self):
+        #Тест поиска повторов n-грамм
+        self.assertEqual(list(kasiski_distances("ABCXXABC")), [5])
+        self.assertEqual(list(kasiski_distances("AB CAB C")), [])
+        self.assertEqual(len(kasiski_distances("AB")), 0)
+    
+    def test_index_of_coincidence(self):
+        #Тест индекса совпадений: у правильной длины он близок к английскому
+        ciphertext = vigenere_encrypt(PLAINTEXT, "LEMON")
+        self.assertGreater(index_of_coincidence(ciphertext, 5), 0.055)
+        self.assertLess(index_of_coincidence(ciphertext, 3), 0.05)
+    
+    def test_estimate_key_length(self):
+        #Тест оценки длины ключа
+        ciphertext = vigenere_encrypt(PLAINTEXT, "CRYPTO")
+        lengths = [length for length, _ in estimate_key_lengths(ciphertext)]
+        self.assertIn(6, lengths[:2])
+    
+    def test_recover_key(self):
+        #Тест восстановления ключа известной длины
+        ciphertext = vigenere_encrypt(PLAINTEXT, "LEMON")
+        self.assertEqual(recover_key(ciphertext, 5)[0], "LEMON")
+    
+    def test_crack(self):
+        #Тест взлома без ключа (с пулом процессов и без него)
+        for key in ("LEMON", "CRYPTO", "KEY"):
+            ciphertext = vigenere_encrypt(PLAINTEXT, key)
+            for workers in (1, 2):
+                found, plaintext, candidates = crack(ciphertext, workers=workers)
+                self.assertEqual(found, key)
+                self.assertEqual(plaintext, PLAINTEXT.upper())
+                self.assertTrue(candidates)
+
+    def test_crack_invalid_arguments(self):
+        #Тест проверки параметров до запуска пула процессов
+        ciphertext = vigenere_encrypt(PLAINTEXT, "LEMON")
+        for workers in (1, 2):
+            with self.assertRaises(ValueError):
+                crack(ciphertext, top=0, workers=workers)
+            with self.assertRaises(ValueError):
+                crack(ciphertext, max_key_length=0, workers=workers)
+
+if __name__ == "__main__":
+    unittest.main()
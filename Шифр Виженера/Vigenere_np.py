@@ -0,0 +1,100 @@
+import numpy as np
+
+from Vigenere import vigenere_encrypt, vigenere_decrypt
+
+ORD_A = ord('A')
+
+
+def _key_shifts(key):
+    # Сдвиги ключа по тем же правилам, что и в vigenere_encrypt: индекс берётся по длине исходного ключа
+    if not key:
+        raise ValueError("Ключ не может быть пустым")
+    key_upper = key.upper()
+    return [(ord(key_upper[j]) - ORD_A) % 26 for j in range(len(key))]
+
+
+def _build_table(decrypt):
+    # table[shift * 256 + byte] - результат сдвига байта; меняются только буквы A-Z
+    table = np.tile(np.arange(256, dtype=np.uint8), (26, 1))
+    letters = np.arange(26)
+    for shift in range(26):
+        delta = -shift if decrypt else shift
+        table[shift, ORD_A + letters] = (letters + delta) % 26 + ORD_A
+    return table.ravel()
+
+_TABLES = {False: _build_table(False), True: _build_table(True)}
+
+
+def _apply(data, shifts, decrypt):
+    """Сдвигает буквы A-Z массива uint8 на shifts одной выборкой из таблицы, остальные байты не трогает"""
+    index = shifts.astype(np.uint16) << 8
+    index |= data
+    return _TABLES[decrypt][index]
+
+
+def _transform(pairs, decrypt):
+    fallback = vigenere_decrypt if decrypt else vigenere_encrypt
+    results = [None] * len(pairs)
+    fast = []
+    for i, (text, key) in enumerate(pairs):
+        shifts = _key_shifts(key)
+        upper = text.upper()
+        if upper.isascii():
+            fast.append((i, upper, shifts))
+        else:
+            # isalpha() для не-ASCII символов не векторизуется - используем исходную функцию
+            results[i] = fallback(text, key)
+    if not fast:
+        return results
+
+    data = np.frombuffer(''.join(upper for _, upper, _ in fast).encode("ascii"), dtype=np.uint8)
+    if len(fast) == 1:
+        # Один текст: просто размножаем сдвиги ключа на всю длину
+        key_shifts = np.array(fast[0][2], dtype=np.uint8)
+        shifts = np.tile(key_shifts, -(-len(data) // len(key_shifts)))[:len(data)]
+    else:
+        # Много текстов: позиция каждого символа внутри своего текста определяет букву своего ключа
+        text_lengths = np.array([len(upper) for _, upper, _ in fast], dtype=np.int64)
+        key_lengths = np.array([len(shifts) for _, _, shifts in fast], dtype=np.int64)
+        key_shifts = np.array([s for _, _, shifts in fast for s in shifts], dtype=np.uint8)
+        text_index = np.repeat(np.arange(len(fast)), text_lengths)
+        positions = np.arange(len(data)) - np.repeat(np.cumsum(text_lengths) - text_lengths, text_lengths)
+        key_starts = np.cumsum(key_lengths) - key_lengths
+        shifts = key_shifts[key_starts[text_index] + positions % key_lengths[text_index]]
+
+    output = _apply(data, shifts, decrypt).tobytes().decode("ascii")
+    start = 0
+    for i, upper, _ in fast:
+        results[i] = output[start:start + len(upper)]
+        start += len(upper)
+    return results
+
+
+def vigenere_encrypt_np(plaintext, key):
+    """Векторизованный аналог vigenere_encrypt (результат совпадает посимвольно)"""
+    return _transform([(plaintext, key)], decrypt=False)[0]
+
+
+def vigenere_decrypt_np(ciphertext, key):
+    """Векторизованный аналог vigenere_decrypt (результат совпадает посимвольно)"""
+    return _transform([(ciphertext, key)], decrypt=True)[0]
+
+
+def vigenere_encrypt_batch(pairs):
+    """
+    Шифрует много сообщений за один проход по массиву.
+
+    :param pairs: Последовательность пар (текст, ключ)
+    :return: Список зашифрованных текстов в том же порядке
+    """
+    return _transform(list(pairs), decrypt=False)
+
+
+def vigenere_decrypt_batch(pairs):
+    """
+    Расшифровывает много сообщений за один проход по массиву.
+
+    :param pairs: Последовательность пар (шифротекст, ключ)
+    :return: Список расшифрованных текстов в том же порядке
+    """
+    return _transform(list(pairs), decrypt=True)
@@ -0,0 +1,49 @@
+import random
+import string
+import unittest
+from Vigenere import vigenere_encrypt, vigenere_decrypt
+from Vigenere_np import (vigenere_encrypt_np, vigenere_decrypt_np,
+                         vigenere_encrypt_batch, vigenere_decrypt_batch)
+
+class TestVigenereNumpy(unittest.TestCase):
+    def test_known_vectors(self):
+        #Тест на тех же примерах, что и исходные функции
+        self.assertEqual(vigenere_encrypt_np("ATTACKATDAWN", "LEMON"), "LXFOPVEFRNHR")
+        self.assertEqual(vigenere_decrypt_np("LXFOPVEFRNHR", "LEMON"), "ATTACKATDAWN")
+        self.assertEqual(vigenere_encrypt_np("Hello, World!", "KEY"), "RIJVS, AMBPB!")
+        self.assertEqual(vigenere_decrypt_np("RIJVS, AMBPB!", "KEY"), "HELLO, WORLD!")
+        self.assertEqual(vigenere_encrypt_np("", "KEY"), "")
+    
+    def test_matches_reference_on_random_text(self):
+        #Тест совпадения с исходными функциями на случайных данных
+        rng = random.Random(1)
+        alphabet = string.ascii_letters + string.digits + " ,.!\n"
+        for _ in range(50):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 300)))
+            key = ''.join(rng.choice(string.ascii_letters) for _ in range(rng.randint(1, 12)))
+            self.assertEqual(vigenere_encrypt_np(text, key), vigenere_encrypt(text, key))
+            self.assertEqual(vigenere_decrypt_np(text, key), vigenere_decrypt(text, key))
+    
+    def test_non_ascii_text(self):
+        #Тест текста с не-ASCII символами (результат как у исходной функции)
+        for text in ("Привет, World", "straße", "naïve café"):
+            self.assertEqual(vigenere_encrypt_np(text, "KEY"), vigenere_encrypt(text, "KEY"))
+            self.assertEqual(vigenere_decrypt_np(text, "KEY"), vigenere_decrypt(text, "KEY"))
+    
+    def test_batch(self):
+        #Тест пакетной обработки
+        pairs = [("ATTACKATDAWN", "LEMON"), ("Hello, World!", "KEY"), ("", "A"), ("ABC", "LONGKEY"), ("Привет", "KEY")]
+        expected = [vigenere_encrypt(text, key) for text, key in pairs]
+        encrypted = vigenere_encrypt_batch(pairs)
+        self.assertEqual(encrypted, expected)
+        keys = [key for _, key in pairs]
+        self.assertEqual(vigenere_decrypt_batch(zip(encrypted, keys)),
+                         [vigenere_decrypt(text, key) for text, key in zip(encrypted, keys)])
+    
+    def test_empty_key(self):
+        #Тест с пустым ключом
+        with self.assertRaises(ValueError):
+            vigenere_encrypt_np("ABC", "")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,23 @@
 import re
+from functools import lru_cache
+
+CIPHER_CACHE_SIZE = 128  # Сколько скомпилированных шифров хранить в кэше get_cipher
+
+_NON_LETTERS = re.compile(r'[^A-Za-z]')
+_NON_CIPHER = re.compile(r'[^A-Z]')
+_BIGRAM = re.compile(r'(.)((?!\1).)?')  # Две разные буквы или одна, если следующая совпадает
+_PAIR = re.compile(r'..')
+_FILLER = re.compile(r'(?<=(.))X(?=\1)')  # X между одинаковыми буквами
 
 class PlayfairCipher:
     def __init__(self, key):
         self.key = key.upper().replace("J", "I")
         self.table = self._create_table()
+        self._positions = {char: (row, col) for row, letters in enumerate(self.table)
+                           for col, char in enumerate(letters)}
+        # Полные таблицы биграмм 25x25: каждая биграмма шифруется одним обращением к словарю
+        self._encrypt_map = self._build_digraph_map(1)
+        self._decrypt_map = self._build_digraph_map(-1)
     
     def _create_table(self):
         # Удаляем повторяющиеся буквы и добавляем остальные алфавитные (I=J)
@@ -25,95 +39,127 @@ class PlayfairCipher:
         return table
     
     def _preprocess_text(self, text):
-        # Удаляем все не-алфавитные символы и приводим к верхнему регистру
-        text = re.sub(r'[^A-Za-z]', '', text).upper()
-        text = text.replace("J", "I")
-        
-        # Разбиваем на биграммы и добавляем X между повторяющимися буквами
-        processed = []
-        i = 0
-        while i < len(text):
-            if i == len(text) - 1:
-                # Если нечетное количество символов, добавляем X
-                processed.append(text[i] + 'X')
-                i += 1
-            elif text[i] == text[i+1]:
-                # Повторяющиеся буквы - добавляем X между ними
-                processed.append(text[i] + 'X')
-                i += 1
-            else:
-                processed.append(text[i] + text[i+1])
-                i += 2
-        return processed
+        return [bigram for bigrams in self._bigram_chunks([text]) for bigram in bigrams]
+    
+    def _bigram_chunks(self, chunks):
+        """
+        Разбивает текст, поступающий частями, на биграммы за один проход.
+        Для каждой части выдаёт список биграмм; буква без пары переносится в следующую часть.
+        """
+        pending = ''
+        for chunk in chunks:
+            # Удаляем все не-алфавитные символы и приводим к верхнему регистру
+            text = pending + _NON_LETTERS.sub('', chunk).upper().replace("J", "I")
+            # Пара из разных букв, либо одна буква, если следующая такая же - ей добавляется X
+            pairs = _BIGRAM.findall(text)
+            pending = ''
+            if pairs and not pairs[-1][1]:
+                # Последняя буква без пары: её пара может прийти со следующей частью
+                pending = pairs.pop()[0]
+            yield [a + (b or 'X') for a, b in pairs]
+        if pending:
+            # Если нечетное количество символов, добавляем X
+            yield [pending + 'X']
     
     def _find_position(self, char):
-        for row in range(5):
-            for col in range(5):
-                if self.table[row][col] == char:
-                    return (row, col)
-        raise ValueError(f"Символ {char} не найден в таблице")
+        try:
+            return self._positions[char]
+        except KeyError:
+            raise ValueError(f"Символ {char} не найден в таблице") from None
+    
+    def _build_digraph_map(self, step):
+        # step = 1 - шифрование (вправо/вниз), step = -1 - расшифровка (влево/вверх)
+        digraphs = {}
+        for a, (row1, col1) in self._positions.items():
+            for b, (row2, col2) in self._positions.items():
+                if row1 == row2:
+                    # Одна строка - сдвигаем по строке
+                    pair = self.table[row1][(col1 + step) % 5] + self.table[row2][(col2 + step) % 5]
+                elif col1 == col2:
+                    # Один столбец - сдвигаем по столбцу
+                    pair = self.table[(row1 + step) % 5][col1] + self.table[(row2 + step) % 5][col2]
+                else:
+                    # Прямоугольник - берем противоположные углы
+                    pair = self.table[row1][col2] + self.table[row2][col1]
+                digraphs[a + b] = pair
+        return digraphs
+    
+    def _map_bigrams(self, digraphs, bigrams):
+        try:
+            return ''.join(map(digraphs.__getitem__, bigrams))
+        except KeyError as error:
+            missing = next(char for char in error.args[0] if char not in self._positions)
+            raise ValueError(f"Символ {missing} не найден в таблице") from None
     
     def encrypt(self, plaintext):
-        bigrams = self._preprocess_text(plaintext)
-        ciphertext = []
-        
-        for a, b in bigrams:
-            row1, col1 = self._find_position(a)
-            row2, col2 = self._find_position(b)
-            
-            if row1 == row2:
-                # Одна строка - сдвигаем вправо
-                ciphertext.append(self.table[row1][(col1 + 1) % 5] + self.table[row2][(col2 + 1) % 5])
-            elif col1 == col2:
-                # Один столбец - сдвигаем вниз
-                ciphertext.append(self.table[(row1 + 1) % 5][col1] + self.table[(row2 + 1) % 5][col2])
-            else:
-                # Прямоугольник - берем противоположные углы
-                ciphertext.append(self.table[row1][col2] + self.table[row2][col1])
-        
-        return ''.join(ciphertext)
+        return ''.join(self.encrypt_stream([plaintext]))
+    
+    def encrypt_stream(self, chunks):
+        """Шифрует текст, поступающий частями (любой итерируемый объект строк), и выдаёт шифротекст по частям"""
+        for bigrams in self._bigram_chunks(chunks):
+            yield self._map_bigrams(self._encrypt_map, bigrams)
     
     def decrypt(self, ciphertext):
-        # Проверяем, что ciphertext имеет четную длину и состоит только из букв
-        ciphertext = re.sub(r'[^A-Z]', '', ciphertext.upper())
-        if len(ciphertext) % 2 != 0:
+        return ''.join(self.decrypt_stream([ciphertext]))
+    
+    def decrypt_stream(self, chunks):
+        """
+        Расшифровывает шифротекст, поступающий частями, и выдаёт открытый текст по частям.
+        Нечетная длина шифротекста обнаруживается в конце потока (ValueError).
+        """
+        return _remove_fillers(self._decrypt_chunks(chunks))
+    
+    def _decrypt_chunks(self, chunks):
+        pending = ''
+        for chunk in chunks:
+            # Оставляем только буквы; буква без пары переносится в следующую часть
+            ciphertext = pending + _NON_CIPHER.sub('', chunk.upper())
+            split = len(ciphertext) - len(ciphertext) % 2
+            pending = ciphertext[split:]
+            yield self._map_bigrams(self._decrypt_map, _PAIR.findall(ciphertext, 0, split))
+        if pending:
             raise ValueError("Длина зашифрованного текста должна быть четной")
-        
-        bigrams = [ciphertext[i:i+2] for i in range(0, len(ciphertext), 2)]
-        plaintext = []
-        
-        for a, b in bigrams:
-            row1, col1 = self._find_position(a)
-            row2, col2 = self._find_position(b)
-            
-            if row1 == row2:
-                # Одна строка - сдвигаем влево
-                plaintext.append(self.table[row1][(col1 - 1) % 5] + self.table[row2][(col2 - 1) % 5])
-            elif col1 == col2:
-                # Один столбец - сдвигаем вверх
-                plaintext.append(self.table[(row1 - 1) % 5][col1] + self.table[(row2 - 1) % 5][col2])
-            else:
-                # Прямоугольник - берем противоположные углы
-                plaintext.append(self.table[row1][col2] + self.table[row2][col1])
-        
-        # Удаляем добавленные X при шифровании (если они есть)
-        decrypted = ''.join(plaintext)
-        if decrypted.endswith('X'):
-            decrypted = decrypted[:-1]
-        
-        # Удаляем X между повторяющимися буквами
-        i = 1
-        while i < len(decrypted) - 1:
-            if decrypted[i] == 'X' and decrypted[i-1] == decrypted[i+1]:
-                decrypted = decrypted[:i] + decrypted[i+1:]
-            else:
-                i += 1
-        
-        return decrypted
     
     def get_table(self):
         return self.table
 
+
+def _remove_fillers(chunks):
+    """
+    Удаляет X, добавленные при шифровании, за один проход по частям текста:
+    X в конце текста и X между двумя одинаковыми буквами.
+    Для решения по символу нужны соседи, поэтому два последних символа части ждут следующую.
+    """
+    previous, pending = '', ''
+    for chunk in chunks:
+        pending += chunk
+        if len(pending) < 3:
+            continue
+        # Последний символ text - сосед справа для предпоследнего, сам он пока не решён
+        text = previous + pending[:-1]
+        yield _FILLER.sub('', text)[len(previous):-1]
+        previous, pending = pending[-3], pending[-2:]
+    if pending.endswith('X'):
+        pending = pending[:-1]
+    yield _FILLER.sub('', previous + pending)[len(previous):]
+
+
+def _normalize_key(key):
+    # Ключи с одинаковой последовательностью уникальных букв дают одинаковую таблицу
+    letters = []
+    for char in key.upper().replace("J", "I"):
+        if char.isalpha() and char not in letters:
+            letters.append(char)
+    return ''.join(letters)
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def _compiled_cipher(normalized_key):
+    return PlayfairCipher(normalized_key)
+
+def get_cipher(key):
+    """Возвращает скомпилированный шифр из кэша (таблицы строятся один раз на ключ)"""
+    return _compiled_cipher(_normalize_key(key))
+
 if __name__ == "__main__":
     key = "PLAYFAIR EXAMPLE"
     cipher = PlayfairCipher(key)
@@ -0,0 +1,119 @@
+import random
+import re
+import string
+import time
+
+from Playfair import PlayfairCipher, get_cipher
+
+
+class ReferencePlayfair(PlayfairCipher):
+    """Исходный алгоритм: линейный поиск позиций и разбор случаев для каждой биграммы"""
+
+    def _find_position(self, char):
+        for row in range(5):
+            for col in range(5):
+                if self.table[row][col] == char:
+                    return (row, col)
+        raise ValueError(f"Символ {char} не найден в таблице")
+
+    def encrypt(self, plaintext):
+        ciphertext = []
+        for a, b in self._preprocess_text(plaintext):
+            row1, col1 = self._find_position(a)
+            row2, col2 = self._find_position(b)
+            if row1 == row2:
+                ciphertext.append(self.table[row1][(col1 + 1) % 5] + self.table[row2][(col2 + 1) % 5])
+            elif col1 == col2:
+                ciphertext.append(self.table[(row1 + 1) % 5][col1] + self.table[(row2 + 1) % 5][col2])
+            else:
+                ciphertext.append(self.table[row1][col2] + self.table[row2][col1])
+        return ''.join(ciphertext)
+
+    def decrypt(self, ciphertext):
+        ciphertext = re.sub(r'[^A-Z]', '', ciphertext.upper())
+        plaintext = []
+        for i in range(0, len(ciphertext), 2):
+            row1, col1 = self._find_position(ciphertext[i])
+            row2, col2 = self._find_position(ciphertext[i + 1])
+            if row1 == row2:
+                plaintext.append(self.table[row1][(col1 - 1) % 5] + self.table[row2][(col2 - 1) % 5])
+            elif col1 == col2:
+                plaintext.append(self.table[(row1 - 1) % 5][col1] + self.table[(row2 - 1) % 5][col2])
+            else:
+                plaintext.append(self.table[row1][col2] + self.table[row2][col1])
+        decrypted = ''.join(plaintext)
+        if decrypted.endswith('X'):
+            decrypted = decrypted[:-1]
+        i = 1
+        while i < len(decrypted) - 1:
+            if decrypted[i] == 'X' and decrypted[i-1] == decrypted[i+1]:
+                decrypted = decrypted[:i] + decrypted[i+1:]
+            else:
+                i += 1
+        return decrypted
+
+
+def make_text(size, seed=0):
+    rng = random.Random(seed)
+    return ''.join(rng.choices(string.ascii_letters + "   ,.", k=size))
+
+
+def measure(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    key = "PLAYFAIR EXAMPLE"
+    size = 2 * 2**20
+    text = make_text(size)
+
+    reference_time, reference_result = measure(ReferencePlayfair(key).encrypt, text, repeat=1)
+    table_time, table_result = measure(PlayfairCipher(key).encrypt, text)
+    assert reference_result == table_result
+    print(f"{'encrypt, линейный поиск':<32} {size / 2**20 / reference_time:8.2f} МБ/с")
+    print(f"{'encrypt, таблица биграмм':<32} {size / 2**20 / table_time:8.2f} МБ/с")
+
+    # Расшифровка: удаление X срезами строки квадратично, однопроходное - линейно
+    cipher = PlayfairCipher(key)
+    for size in (50_000, 200_000, 800_000):
+        ciphertext = cipher.encrypt(make_text(size, seed=size) + "balloon letter " * (size // 100))
+        reference_time, reference_result = measure(ReferencePlayfair(key).decrypt, ciphertext, repeat=1)
+        linear_time, linear_result = measure(cipher.decrypt, ciphertext)
+        assert reference_result == linear_result
+        print(f"decrypt {len(ciphertext) / 1000:7.0f} тыс. символов: {reference_time:8.3f} с (исходный), "
+              f"{linear_time:8.3f} с (однопроходный)")
+
+    # Потоковая обработка блоками по 64 КБ
+    chunks = [text[i:i + 65536] for i in range(0, len(text), 65536)]
+    stream_time, stream_result = measure(lambda: ''.join(cipher.encrypt_stream(chunks)))
+    assert stream_result == table_result
+    print(f"{'encrypt_stream, блоки 64 КБ':<32} {len(text) / 2**20 / stream_time:8.2f} МБ/с")
+
+    # Создание шифра на каждый запрос против кэша get_cipher
+    keys = ["KEY%d" % (i % 8) for i in range(2000)]
+    build_time, _ = measure(lambda: [PlayfairCipher(k).encrypt("HELLO") for k in keys])
+    cache_time, _ = measure(lambda: [get_cipher(k).encrypt("HELLO") for k in keys])
+    print(f"{'PlayfairCipher(key) на запрос':<32} {len(keys) / build_time:8.0f} запросов/с")
+    print(f"{'get_cipher(key) из кэша':<32} {len(keys) / cache_time:8.0f} запросов/с")
+
+    # Восстановление квадрата без ключа: итерации отжига в секунду на ядро
+    try:
+        from Playfair_crack import crack
+    except ImportError:
+        crack = None
+    if crack:
+        with open("english.txt", encoding="utf-8") as f:
+            plaintext = f.read()[3000:3450]
+        secret = PlayfairCipher("MONARCHY SECURITY")
+        ciphertext = secret.encrypt(plaintext)
+        start = time.perf_counter()
+        square, recovered, score, rate = crack(ciphertext, iterations=300_000, seed=1)
+        elapsed = time.perf_counter() - start
+        solved = recovered == secret.decrypt(ciphertext)
+        print(f"\nотжиг: {rate:.0f} итераций/с на ядро, {elapsed:.1f} с всего, "
+              f"квадрат {'найден' if solved else 'не найден'}: {square}")
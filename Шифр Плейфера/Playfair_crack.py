@@ -0,0 +1,237 @@
+import math
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Playfair import PlayfairCipher
+
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWXYZ"  # 25 букв, J объединена с I
+_RANGE = np.arange(25)
+_NON_LETTERS = re.compile(r'[^A-Z]')  # Всё, кроме букв, после перевода в верхний регистр
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "english.txt")
+
+# _DECRYPT_POSITIONS[p1 * 25 + p2] - позиции букв открытого текста для биграммы с позициями p1, p2.
+# Правила Плейфера зависят только от позиций в квадрате, поэтому таблица общая для всех ключей.
+_DECRYPT_POSITIONS = np.zeros((625, 2), dtype=np.int64)
+for _p1 in range(25):
+    for _p2 in range(25):
+        _r1, _c1, _r2, _c2 = _p1 // 5, _p1 % 5, _p2 // 5, _p2 % 5
+        if _r1 == _r2:
+            _DECRYPT_POSITIONS[_p1 * 25 + _p2] = (_r1 * 5 + (_c1 - 1) % 5, _r2 * 5 + (_c2 - 1) % 5)
+        elif _c1 == _c2:
+            _DECRYPT_POSITIONS[_p1 * 25 + _p2] = ((_r1 - 1) % 5 * 5 + _c1, (_r2 - 1) % 5 * 5 + _c2)
+        else:
+            _DECRYPT_POSITIONS[_p1 * 25 + _p2] = (_r1 * 5 + _c2, _r2 * 5 + _c1)
+
+
+def encode(text):
+    """Переводит текст в массив номеров букв 0-24 (J -> I, остальные символы отбрасываются)"""
+    letters = _NON_LETTERS.sub('', text.upper()).replace("J", "I")
+    lookup = np.zeros(128, dtype=np.int64)
+    lookup[[ord(char) for char in ALPHABET]] = np.arange(25)
+    return lookup[np.frombuffer(letters.encode("ascii"), dtype=np.uint8)]
+
+
+def build_quadgrams(text):
+    """
+    Строит таблицу log10-вероятностей квадграмм (массив 25**4) по обучающему тексту.
+    Наблюдаемые частоты смешиваются с оценкой по цепи Маркова на биграммах,
+    чтобы у не встретившихся в небольшом корпусе квадграмм была осмысленная оценка.
+    """
+    codes = encode(text)
+    if len(codes) < 4:
+        raise ValueError("Обучающий текст слишком короткий")
+    unigrams = np.bincount(codes, minlength=25) + 1.0
+    bigrams = np.bincount(codes[:-1] * 25 + codes[1:], minlength=625).reshape(25, 25) + 1.0
+    transitions = bigrams / bigrams.sum(axis=1, keepdims=True)
+    markov = (unigrams / unigrams.sum())[:, None, None, None] * transitions[:, :, None, None] \
+        * transitions[None, :, :, None] * transitions[None, None, :, :]
+
+    quad_index = ((codes[:-3] * 25 + codes[1:-2]) * 25 + codes[2:-1]) * 25 + codes[3:]
+    observed = np.bincount(quad_index, minlength=25 ** 4) / len(quad_index)
+    return np.log10(0.7 * observed + 0.3 * markov.ravel()).astype(np.float64)
+
+
+def load_quadgrams(path=None):
+    """
+    Загружает таблицу квадграмм.
+
+    :param path: Файл со строками "TION 13168375" (готовая статистика квадграмм)
+                 или обычный английский текст; по умолчанию - english.txt рядом с модулем
+    """
+    with open(path or CORPUS_PATH, encoding="utf-8") as f:
+        content = f.read()
+    first_line = content.split("\n", 1)[0].split()
+    if len(first_line) == 2 and len(first_line[0]) == 4 and first_line[1].isdigit():
+        counts = np.zeros(25 ** 4)
+        for line in content.splitlines():
+            quad, count = line.split()
+            codes = encode(quad)
+            if len(codes) == 4:
+                counts[((codes[0] * 25 + codes[1]) * 25 + codes[2]) * 25 + codes[3]] += int(count)
+        total = counts.sum()
+        return np.log10(np.maximum(counts, 0.01) / total)
+    return build_quadgrams(content)
+
+
+class _Scorer:
+    """Расшифровка и оценка одного квадрата без выделения памяти: все буферы создаются заранее"""
+
+    def __init__(self, ciphertext_codes, quadgrams):
+        if len(ciphertext_codes) % 2 != 0 or len(ciphertext_codes) < 4:
+            raise ValueError("Длина зашифрованного текста должна быть четной и не меньше 4")
+        self.first = np.ascontiguousarray(ciphertext_codes[0::2])
+        self.second = np.ascontiguousarray(ciphertext_codes[1::2])
+        self.quadgrams = quadgrams
+        pairs = len(self.first)
+        self.pair_index = np.empty(pairs, dtype=np.int64)
+        self.second_pos = np.empty(pairs, dtype=np.int64)
+        self.plain_pos = np.empty((pairs, 2), dtype=np.int64)
+        self.plain = np.empty(pairs * 2, dtype=np.int64)
+        self.quad_index = np.empty(pairs * 2 - 3, dtype=np.int64)
+        self.quad_scores = np.empty(pairs * 2 - 3, dtype=np.float64)
+
+    def decrypt(self, square, positions):
+        """square[позиция] - буква, positions[буква] - позиция; результат в self.plain"""
+        np.take(positions, self.first, out=self.pair_index)
+        np.take(positions, self.second, out=self.second_pos)
+        self.pair_index *= 25
+        self.pair_index += self.second_pos
+        np.take(_DECRYPT_POSITIONS, self.pair_index, axis=0, out=self.plain_pos)
+        np.take(square, self.plain_pos.ravel(), out=self.plain)
+        return self.plain
+
+    def score(self, square, positions):
+        plain = self.decrypt(square, positions)
+        index = self.quad_index
+        np.multiply(plain[:-3], 25, out=index)
+        index += plain[1:-2]
+        index *= 25
+        index += plain[2:-1]
+        index *= 25
+        index += plain[3:]
+        np.take(self.quadgrams, index, out=self.quad_scores)
+        return float(self.quad_scores.sum())
+
+
+def _mutate(square, rng):
+    # Изменения квадрата: чаще всего обмен двух букв, реже - строк, столбцов и отражения
+    grid = square.reshape(5, 5)
+    move = rng.randrange(50)
+    if move < 44:
+        i, j = rng.sample(range(25), 2)
+        square[i], square[j] = square[j], square[i]
+    elif move < 46:
+        i, j = rng.sample(range(5), 2)
+        grid[[i, j]] = grid[[j, i]]
+    elif move < 48:
+        i, j = rng.sample(range(5), 2)
+        grid[:, [i, j]] = grid[:, [j, i]]
+    elif move == 48:
+        grid[:] = grid[::-1].copy()
+    else:
+        grid[:] = grid.T.copy()
+
+
+def anneal(ciphertext_codes, quadgrams, iterations=200_000, temperature=None, seed=None, square=None):
+    """
+    Имитация отжига по перестановкам квадрата 5x5.
+
+    :param ciphertext_codes: Шифротекст в виде номеров букв (см. encode)
+    :param temperature: Начальная температура; по умолчанию зависит от длины текста
+    :param square: Начальный квадрат (строка из 25 букв); по умолчанию случайный
+    :return: (оценка, квадрат строкой из 25 букв, число итераций, время в секундах)
+    """
+    rng = random.Random(seed)
+    scorer = _Scorer(ciphertext_codes, quadgrams)
+    if square is None:
+        letters = list(range(25))
+        rng.shuffle(letters)
+        current = np.array(letters, dtype=np.int64)
+    else:
+        current = encode(square)
+    if temperature is None:
+        # Разница оценок растёт с длиной текста, поэтому и температура тоже (подобрано опытным путём)
+        temperature = 5 + 0.015 * len(ciphertext_codes)
+
+    positions = np.empty(25, dtype=np.int64)
+    positions[current] = _RANGE
+    backup = current.copy()
+    current_score = scorer.score(current, positions)
+    best_score, best = current_score, current.copy()
+
+    start = time.perf_counter()
+    for step in range(iterations):
+        t = temperature * (1 - step / iterations) + 1e-9
+        np.copyto(backup, current)
+        _mutate(current, rng)
+        positions[current] = _RANGE
+        score = scorer.score(current, positions)
+        delta = score - current_score
+        if delta >= 0 or rng.random() < math.exp(delta / t):
+            current_score = score
+            if score > best_score:
+                best_score = score
+                np.copyto(best, current)
+        else:
+            np.copyto(current, backup)
+            positions[current] = _RANGE
+    elapsed = time.perf_counter() - start
+    return best_score, ''.join(ALPHABET[code] for code in best), iterations, elapsed
+
+
+_worker_state = None
+
+def _init_worker(ciphertext_codes, quadgrams):
+    # Шифротекст и таблица квадграмм передаются в процесс один раз
+    global _worker_state
+    _worker_state = (ciphertext_codes, quadgrams)
+
+def _anneal_in_worker(args):
+    seed, iterations = args
+    ciphertext_codes, quadgrams = _worker_state
+    return anneal(ciphertext_codes, quadgrams, iterations, seed=seed)
+
+
+def crack(ciphertext, restarts=None, iterations=200_000, workers=None, quadgrams=None, seed=None):
+    """
+    Восстанавливает квадрат Плейфера по одному шифротексту.
+    Независимые перезапуски отжига выполняются в пуле процессов.
+
+    :param restarts: Число перезапусков (по умолчанию - по одному на процесс)
+    :param workers: Число процессов (1 - без пула процессов)
+    :return: (квадрат строкой из 25 букв, расшифрованный текст, оценка,
+              итераций в секунду на одно ядро)
+    """
+    codes = encode(ciphertext)
+    if quadgrams is None:
+        quadgrams = load_quadgrams()
+    workers = workers or os.cpu_count() or 1
+    restarts = restarts or workers
+    seeds = random.Random(seed).sample(range(2 ** 31), restarts)
+    tasks = [(task_seed, iterations) for task_seed in seeds]
+
+    if workers == 1:
+        results = [anneal(codes, quadgrams, iterations, seed=task_seed) for task_seed in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(codes, quadgrams)) as pool:
+            results = list(pool.map(_anneal_in_worker, tasks))
+
+    best_score, square, _, _ = max(results)
+    rate = sum(done for _, _, done, _ in results) / sum(elapsed for _, _, _, elapsed in results)
+    return square, PlayfairCipher(square).decrypt(ciphertext), best_score, rate
+
+
+if __name__ == "__main__":
+    ciphertext = input("Введите зашифрованный текст: ")
+    square, plaintext, score, rate = crack(ciphertext)
+    print("Найденная таблица:")
+    for row in range(5):
+        print(' '.join(square[row * 5:(row + 1) * 5]))
+    print(f"Расшифрованный текст: {plaintext}")
+    print(f"Оценка: {score:.1f}, скорость: {rate:.0f} итераций/с на ядро")
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from Playfair import PlayfairCipher
+from Playfair_crack import ALPHABET, anneal, crack, encode, load_quadgrams, _Scorer
+
+PLAINTEXT = ("Modern cryptography rests on a different foundation. Instead of hoping that the enemy "
+             "will not discover the method, the designers of a modern cipher publish every detail of it "
+             "and rely only on the secrecy of the key.")
+
+# Около 400 букв - достаточно, чтобы отжиг восстановил ключ
+LONG_PLAINTEXT = (PLAINTEXT + " The security of the system must depend entirely on the key, which is short, random "
+                  "and changed often, while the algorithm itself is studied openly by everyone who wishes to "
+                  "attack it. Many classical ciphers failed exactly because their designers trusted that "
+                  "nobody would learn how they worked.")
+
+class TestPlayfairCrack(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.quadgrams = load_quadgrams()
+        cls.cipher = PlayfairCipher("MONARCHY SECURITY")
+        cls.ciphertext = cls.cipher.encrypt(PLAINTEXT)
+        cls.square = ''.join(''.join(row) for row in cls.cipher.get_table())
+    
+    def _positions(self, square):
+        codes = encode(square)
+        positions = np.empty(25, dtype=np.int64)
+        positions[codes] = np.arange(25)
+        return codes, positions
+    
+    def test_fast_decrypt_matches_cipher(self):
+        """Проверка быстрой расшифровки по номерам букв"""
+        scorer = _Scorer(encode(self.ciphertext), self.quadgrams)
+        plain = scorer.decrypt(*self._positions(self.square))
+        expected = ''.join(self.cipher._decrypt_map[self.ciphertext[i:i + 2]]
+                           for i in range(0, len(self.ciphertext), 2))
+        self.assertEqual(''.join(ALPHABET[code] for code in plain), expected)
+    
+    def test_score_prefers_true_key(self):
+        """Проверка оценки: правильный квадрат оценивается выше случайного"""
+        scorer = _Scorer(encode(self.ciphertext), self.quadgrams)
+        true_score = scorer.score(*self._positions(self.square))
+        self.assertGreater(true_score, scorer.score(*self._positions(ALPHABET)))
+    
+    def test_anneal_keeps_true_key(self):
+        """Проверка отжига: из правильного квадрата при низкой температуре оценка не ухудшается"""
+        scorer = _Scorer(encode(self.ciphertext), self.quadgrams)
+        true_score = scorer.score(*self._positions(self.square))
+        score, square, iterations, elapsed = anneal(encode(self.ciphertext), self.quadgrams, 500,
+                                                    temperature=0.01, seed=1, square=self.square)
+        self.assertGreaterEqual(score, true_score)
+        self.assertEqual(sorted(square), sorted(ALPHABET))
+        self.assertEqual(iterations, 500)
+    
+    def test_crack_api(self):
+        """Проверка результата crack (короткий поиск, с пулом процессов и без него)"""
+        for workers in (1, 2):
+            square, plaintext, score, rate = crack(self.ciphertext, restarts=2, iterations=300,
+                                                   workers=workers, quadgrams=self.quadgrams, seed=1)
+            self.assertEqual(sorted(square), sorted(ALPHABET))
+            self.assertEqual(plaintext, PlayfairCipher(square).decrypt(self.ciphertext))
+            self.assertGreater(rate, 0)
+    
+    def test_crack_recovers_plaintext(self):
+        """Проверка подбора: по шифротексту из ~400 букв восстанавливается открытый текст (фиксированный seed)"""
+        ciphertext = self.cipher.encrypt(LONG_PLAINTEXT)
+        expected = self.cipher.decrypt(ciphertext)
+        square, plaintext, score, rate = crack(ciphertext, restarts=2, iterations=150_000, workers=1,
+                                               quadgrams=self.quadgrams, seed=1)
+        # Квадрат может отличаться от исходного (циклические сдвиги строк и столбцов дают тот же шифр)
+        self.assertEqual(plaintext, expected)
+        true_score = _Scorer(encode(ciphertext), self.quadgrams).score(*self._positions(self.square))
+        self.assertGreaterEqual(score, true_score - 1e-6)
+        self.assertTrue(plaintext.startswith("MODERNCRYPTOGRAPHYRESTSONADIFFERENTFOUNDATION"))
+
+    def test_load_quadgram_counts(self):
+        """Проверка загрузки готовой статистики квадграмм"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "quadgrams.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("TION 300\nTHER 100\n")
+            table = load_quadgrams(path)
+        self.assertEqual(table.shape, (25 ** 4,))
+        self.assertAlmostEqual(table[encode("TION") @ np.array([15625, 625, 25, 1])], np.log10(0.75))
+
+if __name__ == '__main__':
+    unittest.main()
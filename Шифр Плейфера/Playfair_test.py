@@ -1,5 +1,5 @@
 import unittest
-from Playfair import PlayfairCipher
+from Playfair import PlayfairCipher, get_cipher
 
 class TestPlayfairCipher(unittest.TestCase):
     def setUp(self):
@@ -90,5 +90,44 @@ class TestPlayfairCipher(unittest.TestCase):
         # Не-алфавитные символы
         self.assertEqual(self.cipher.decrypt("BM,OD ZBXD!"), "HIDETHEG")
 
+    def test_digraph_maps(self):
+        """Проверка таблиц биграмм: расшифровка обращает шифрование"""
+        letters = [char for row in self.cipher.get_table() for char in row]
+        for a in letters:
+            for b in letters:
+                if a != b:
+                    self.assertEqual(self.cipher._decrypt_map[self.cipher._encrypt_map[a + b]], a + b)
+        # Символ J не входит в таблицу
+        with self.assertRaises(ValueError):
+            self.cipher.decrypt("JA")
+    
+    def test_get_cipher_cache(self):
+        """Проверка кэша скомпилированных шифров"""
+        cipher = get_cipher("Playfair Example")
+        self.assertIs(cipher, get_cipher("PLAYFAIR EXAMPLE!"))
+        self.assertIsNot(cipher, get_cipher("MONARCHY"))
+        self.assertEqual(cipher.get_table(), self.cipher.get_table())
+        self.assertEqual(cipher.encrypt("Hide the gold in the tree stump"), "BMODZBXDNABEKUDMUIXMMOUVIF")
+
+    def test_streaming(self):
+        """Проверка потокового шифрования и расшифровки частями"""
+        plaintext = "Hide the gold in the tree stump. " * 50 + "Balloon, letter, jazz!"
+        chunks = [plaintext[i:i + 7] for i in range(0, len(plaintext), 7)]
+        encrypted = ''.join(self.cipher.encrypt_stream(chunks))
+        self.assertEqual(encrypted, self.cipher.encrypt(plaintext))
+        
+        cipher_chunks = [encrypted[i:i + 5] for i in range(0, len(encrypted), 5)]
+        self.assertEqual(''.join(self.cipher.decrypt_stream(cipher_chunks)), self.cipher.decrypt(encrypted))
+        self.assertEqual(''.join(self.cipher.decrypt_stream(iter(["BM", "OD", "ZB", "XD"]))), "HIDETHEG")
+        
+        # Нечетная длина обнаруживается в конце потока
+        with self.assertRaises(ValueError):
+            ''.join(self.cipher.decrypt_stream(["BMO", "DZ"]))
+    
+    def test_filler_removal(self):
+        """Проверка удаления X между одинаковыми буквами и в конце текста"""
+        for plaintext, expected in (("balloon", "BALLOON"), ("letter", "LETTER"), ("AXA", "AA"), ("X", "X")):
+            self.assertEqual(self.cipher.decrypt(self.cipher.encrypt(plaintext)), expected)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
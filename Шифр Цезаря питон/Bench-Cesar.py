@@ -0,0 +1,90 @@
+import io
+import os
+import random
+import string
+import tempfile
+import time
+
+from Cesar import encrypt, decrypt, encrypt_stream, encrypt_file
+
+
+def encrypt_reference(text, shift):
+    # Исходная посимвольная реализация - точка отсчёта для замеров
+    encrypted_text = ""
+    for char in text:
+        if char.isalpha():
+            shift_base = ord('A') if char.isupper() else ord('a')
+            encrypted_text += chr((ord(char) - shift_base + shift) % 26 + shift_base)
+        else:
+            encrypted_text += char
+    return encrypted_text
+
+
+def crack_by_loop(text):
+    # Перебор 26 сдвигов вызовами decrypt с подсчётом совпадений с частыми буквами
+    common = set("etaoinshr")
+    return max(range(26), key=lambda shift: sum(char in common for char in decrypt(text, shift).lower()))
+
+
+def make_text(size, seed=0):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + " .,!\n"
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+
+def measure(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(name, size, seconds):
+    print(f"{name:<28} {size / 2**20:8.1f} МБ  {seconds:8.4f} с  {size / 2**20 / seconds:10.1f} МБ/с")
+
+
+if __name__ == "__main__":
+    for size in (2**20, 8 * 2**20):
+        text = make_text(size)
+        data = text.encode("ascii")
+
+        old_time, old_result = measure(encrypt_reference, text, 3, repeat=1)
+        new_time, new_result = measure(encrypt, text, 3)
+        bytes_time, bytes_result = measure(encrypt, data, 3)
+        assert old_result == new_result
+        assert bytes_result == new_result.encode("ascii")
+
+        report("посимвольно (исходный)", size, old_time)
+        report("таблица перевода, str", size, new_time)
+        report("таблица перевода, bytes", size, bytes_time)
+        print()
+
+    # Потоковая обработка против обработки целиком в памяти
+    size = 64 * 2**20
+    data = make_text(2**20).encode("ascii") * 64
+    memory_time, _ = measure(encrypt, data, 3)
+    with open(os.devnull, "wb") as sink:
+        stream_time, _ = measure(lambda: encrypt_stream(io.BytesIO(data), sink, 3))
+    with tempfile.TemporaryDirectory() as tmp:
+        src_path, dst_path = os.path.join(tmp, "plain"), os.path.join(tmp, "cipher")
+        with open(src_path, "wb") as f:
+            f.write(data)
+        file_time, _ = measure(encrypt_file, src_path, dst_path, 3)
+    report("в памяти, bytes", size, memory_time)
+    report("поток блоками в /dev/null", size, stream_time)
+    report("файл через mmap", size, file_time)
+
+    # Взлом пачки перехваченных сообщений
+    try:
+        from Cesar_crack import crack_batch
+    except ImportError:
+        print("\nNumPy не установлен, замер взлома пропущен")
+    else:
+        english = "the people of the town gather in the market square to hear the news "
+        samples = [encrypt(english * 3, i % 26) for i in range(5000)]
+        loop_time, _ = measure(lambda: [crack_by_loop(text) for text in samples[:500]], repeat=1)
+        batch_time, _ = measure(crack_batch, samples)
+        print(f"\n{'26 вызовов decrypt':<28} {500 / loop_time:10.0f} сообщений/с")
+        print(f"{'crack_batch (NumPy)':<28} {len(samples) / batch_time:10.0f} сообщений/с")
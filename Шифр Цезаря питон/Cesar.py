@@ -1,19 +1,133 @@
-def encrypt(text, shift):
-    encrypted_text = ""
-    for char in text:
+import mmap
+import os
+import sys
+from functools import lru_cache
+
+CHUNK_SIZE = 1 << 18  # Размер блока для потоковой обработки (256 КБ)
+
+
+class _ShiftTable(dict):
+    """Таблица перевода для str.translate, достраивается для не-ASCII символов"""
+    def __init__(self, shift):
+        super().__init__()
+        self.shift = shift
+        for code in range(128):
+            self[code] = self._shift_code(code)
+
+    def _shift_code(self, code):
+        char = chr(code)
         if char.isalpha():
             shift_base = ord('A') if char.isupper() else ord('a')
-            encrypted_text += chr((ord(char) - shift_base + shift) % 26 + shift_base)
-        else:
-            encrypted_text += char
-    return encrypted_text
+            return (code - shift_base + self.shift) % 26 + shift_base
+        return code
+
+    def __missing__(self, code):
+        # Символ встретился впервые - вычисляем его образ один раз и запоминаем
+        value = self[code] = self._shift_code(code)
+        return value
+
+
+@lru_cache(maxsize=26)
+def _compile_tables(shift):
+    """Компилирует сдвиг в таблицы перевода для str и bytes (кэшируется по shift % 26)"""
+    str_table = _ShiftTable(shift)
+    bytes_table = bytes(str_table[code] if code < 128 else code for code in range(256))
+    return str_table, bytes_table
+
+
+def encrypt(text, shift):
+    str_table, bytes_table = _compile_tables(shift % 26)
+    if isinstance(text, (bytes, bytearray, memoryview)):
+        # Для байтов сдвигаются только латинские буквы ASCII
+        return bytes(text).translate(bytes_table)
+    return text.translate(str_table)
+
 def decrypt(text, shift):
     return encrypt(text, -shift)
 
+
+def encrypt_stream(src, dst, shift, chunk_size=CHUNK_SIZE):
+    """
+    Шифрует поток блоками фиксированного размера.
+
+    :param src: Файловый объект (текстовый или бинарный), stdin или mmap - всё, у чего есть read(n)
+    :param dst: Файловый объект для записи результата
+    :param shift: Сдвиг
+    :param chunk_size: Размер блока; память не зависит от размера входа
+    :return: Количество обработанных символов (байт)
+    """
+    read, write = src.read, dst.write
+    total = 0
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return total
+        write(encrypt(chunk, shift))
+        total += len(chunk)
+
+def decrypt_stream(src, dst, shift, chunk_size=CHUNK_SIZE):
+    return encrypt_stream(src, dst, -shift, chunk_size)
+
+
+def encrypt_file(src_path, dst_path, shift, chunk_size=CHUNK_SIZE):
+    """
+    Шифрует файл побайтно через отображение в память (mmap) входного и выходного файлов.
+    Сдвигаются только латинские буквы ASCII, остальные байты копируются как есть.
+    Выходной файл не может совпадать с входным (ValueError): он обрезается до отображения входного.
+
+    :return: Количество обработанных байт
+    """
+    if os.path.exists(dst_path) and os.path.samefile(src_path, dst_path):
+        raise ValueError("Входной и выходной файлы совпадают")
+    bytes_table = _compile_tables(shift % 26)[1]
+    size = os.path.getsize(src_path)
+    with open(src_path, "rb") as src, open(dst_path, "wb+") as dst:
+        if size == 0:
+            return 0  # Пустой файл нельзя отобразить в память
+        dst.truncate(size)
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as src_map, \
+                mmap.mmap(dst.fileno(), size) as dst_map:
+            for start in range(0, size, chunk_size):
+                end = min(start + chunk_size, size)
+                dst_map[start:end] = src_map[start:end].translate(bytes_table)
+    return size
+
+def decrypt_file(src_path, dst_path, shift, chunk_size=CHUNK_SIZE):
+    return encrypt_file(src_path, dst_path, -shift, chunk_size)
+
+
+USAGE = "Использование: Cesar.py encrypt|decrypt <сдвиг> [входной файл [выходной файл]]"
+
+
+def main(argv):
+    """Потоковый режим: Cesar.py encrypt|decrypt <сдвиг> [входной файл [выходной файл]]"""
+    if len(argv) < 2 or argv[0] not in ("encrypt", "decrypt"):
+        raise SystemExit(USAGE)
+    mode = argv[0]
+    try:
+        shift = int(argv[1])
+    except ValueError:
+        raise SystemExit(f"Сдвиг должен быть целым числом\n{USAGE}") from None
+    if mode == "decrypt":
+        shift = -shift
+    if len(argv) >= 4:
+        try:
+            encrypt_file(argv[2], argv[3], shift)
+        except ValueError as error:
+            raise SystemExit(str(error)) from None
+    elif len(argv) == 3:
+        with open(argv[2], "rb") as src:
+            encrypt_stream(src, sys.stdout.buffer, shift)
+    else:
+        encrypt_stream(sys.stdin.buffer, sys.stdout.buffer, shift)
+
 if __name__ == "__main__":
-    user_input = input("Введите текст для шифрования: ")
-    shift_value = int(input("Введите значение сдвига: "))
-    encrypted_text = encrypt(user_input, shift_value)
-    print("Зашифрованный текст:", encrypt(user_input, shift_value))
-    decrypted_text = decrypt(encrypted_text, shift_value)
-    print("Расшифрованный текст:", decrypted_text)    
+    if len(sys.argv) > 1:
+        main(sys.argv[1:])
+    else:
+        user_input = input("Введите текст для шифрования: ")
+        shift_value = int(input("Введите значение сдвига: "))
+        encrypted_text = encrypt(user_input, shift_value)
+        print("Зашифрованный текст:", encrypt(user_input, shift_value))
+        decrypted_text = decrypt(encrypted_text, shift_value)
+        print("Расшифрованный текст:", decrypted_text)
@@ -0,0 +1,133 @@
+import numpy as np
+
+from Cesar import decrypt
+
+# Частоты букв (%) в английских и русских текстах
+ENGLISH_ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+ENGLISH_FREQUENCIES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]
+RUSSIAN_ALPHABET = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+RUSSIAN_FREQUENCIES = [
+    8.01, 1.59, 4.54, 1.70, 2.98, 8.45, 0.04, 0.94, 1.65, 7.35, 1.21, 3.49, 4.40, 3.21, 6.70, 10.97,
+    2.81, 4.73, 5.47, 6.26, 2.62, 0.26, 0.97, 0.48, 1.44, 0.73, 0.36, 0.04, 1.90, 1.74, 0.32, 0.64, 2.01,
+]
+LANGUAGES = {
+    "en": (ENGLISH_ALPHABET, ENGLISH_FREQUENCIES),
+    "ru": (RUSSIAN_ALPHABET, RUSSIAN_FREQUENCIES),
+}
+
+
+class _Language:
+    """Подготовленные для векторных вычислений данные языка"""
+    def __init__(self, alphabet, frequencies):
+        self.alphabet = alphabet
+        self.size = len(alphabet)
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.frequencies = frequencies / frequencies.sum()
+        self.log_frequencies = np.log(self.frequencies)
+
+        # Кодовая точка -> номер буквы в алфавите (без учёта регистра), остальное -> size.
+        # Последний элемент таблицы всегда "не буква", туда попадают все большие коды.
+        letters = alphabet + alphabet.upper()
+        self.lookup = np.full(max(map(ord, letters)) + 2, self.size, dtype=np.int64)
+        for index, char in enumerate(alphabet):
+            self.lookup[ord(char)] = index
+            self.lookup[ord(char.upper())] = index
+
+        # rotations[s, l] - номер буквы шифротекста для буквы l открытого текста при сдвиге s
+        letters_range = np.arange(self.size)
+        self.rotations = (letters_range[None, :] + letters_range[:, None]) % self.size
+
+    def decrypt(self, text, shift):
+        lower, upper = self.alphabet, self.alphabet.upper()
+        shifted = lower[-shift:] + lower[:-shift] if shift else lower
+        shifted_upper = shifted.upper()
+        return text.translate(str.maketrans(lower + upper, shifted + shifted_upper))
+
+
+_PREPARED = {}
+
+def _language(language):
+    if language not in _PREPARED:
+        if language not in LANGUAGES:
+            raise ValueError(f"Неизвестный язык: {language}")
+        _PREPARED[language] = _Language(*LANGUAGES[language])
+    return _PREPARED[language]
+
+
+def letter_histograms(texts, language="en"):
+    """
+    Считает гистограммы букв сразу для всех текстов одним вызовом bincount.
+
+    :param texts: Список строк
+    :param language: "en" или "ru"
+    :return: Массив (len(texts), размер алфавита) с количеством каждой буквы
+    """
+    lang = _language(language)
+    joined = ''.join(texts)
+    if joined.isascii():
+        codes = np.frombuffer(joined.encode("ascii"), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(joined.encode("utf-32-le"), dtype="<u4")
+    letters = lang.lookup[np.minimum(codes, len(lang.lookup) - 1)]
+
+    width = lang.size + 1  # Последний столбец собирает всё, что не является буквой
+    text_index = np.repeat(np.arange(len(texts)), [len(text) for text in texts])
+    counts = np.bincount(text_index * width + letters, minlength=len(texts) * width)
+    return counts.reshape(len(texts), width)[:, :lang.size]
+
+
+def score_shifts(texts, language="en", method="chi2"):
+    """
+    Оценивает все сдвиги всех текстов одной операцией над массивами.
+
+    :param method: "chi2" (хи-квадрат, меньше - лучше) или "loglik" (логарифм правдоподобия, больше - лучше)
+    :return: Массив (len(texts), размер алфавита); элемент [i, s] - оценка сдвига s для текста i
+    """
+    lang = _language(language)
+    counts = letter_histograms(texts, language).astype(np.float64)
+    # observed[i, s, l] - сколько раз буква l открытого текста встретилась бы при сдвиге s
+    observed = counts[:, lang.rotations]
+    if method == "chi2":
+        expected = counts.sum(axis=1)[:, None, None] * lang.frequencies[None, None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terms = (observed - expected) ** 2 / expected
+        return np.nan_to_num(terms, nan=0.0).sum(axis=2)
+    if method == "loglik":
+        return observed @ lang.log_frequencies
+    raise ValueError(f"Неизвестный метод оценки: {method}")
+
+
+def crack_batch(texts, language="en", method="chi2"):
+    """
+    Подбирает сдвиг для каждого шифротекста из списка.
+
+    :return: Список кортежей (сдвиг, расшифрованный текст, [(сдвиг, оценка), ...] от лучшего к худшему)
+    """
+    texts = list(texts)
+    scores = score_shifts(texts, language, method)
+    order = np.argsort(scores if method == "chi2" else -scores, axis=1, kind="stable")
+
+    lang = _language(language)
+    results = []
+    for text, text_order, text_scores in zip(texts, order.tolist(), scores.tolist()):
+        shift = text_order[0]
+        plaintext = decrypt(text, shift) if language == "en" else lang.decrypt(text, shift)
+        results.append((shift, plaintext, [(s, text_scores[s]) for s in text_order]))
+    return results
+
+
+def crack(text, language="en", method="chi2"):
+    """Подбирает сдвиг для одного шифротекста"""
+    return crack_batch([text], language, method)[0]
+
+
+if __name__ == "__main__":
+    ciphertext = input("Введите зашифрованный текст: ")
+    language = input("Язык текста (en/ru): ").strip() or "en"
+    shift, plaintext, ranking = crack(ciphertext, language)
+    print(f"Наиболее вероятный сдвиг: {shift}")
+    print(f"Расшифрованный текст: {plaintext}")
+    print("Следующие кандидаты:", ", ".join(str(s) for s, _ in ranking[1:4]))
@@ -1,6 +1,11 @@
+import io
+import os
+import tempfile
 import unittest
 from Cesar import encrypt
 from Cesar import decrypt
+from Cesar import encrypt_stream, decrypt_stream, encrypt_file, decrypt_file
+from Cesar import main, USAGE
 
 class TestEncryptionDecryption(unittest.TestCase):
 
@@ -23,5 +28,83 @@ class TestEncryptionDecryption(unittest.TestCase):
         self.assertEqual(encrypt("Hello, World 123!", 5), "Mjqqt, Btwqi 123!")
         self.assertEqual(decrypt("Mjqqt, Btwqi 123!", 5), "Hello, World 123!")
 
+    def test_large_and_negative_shift(self):
+        self.assertEqual(encrypt("abc", 27), "bcd")
+        self.assertEqual(encrypt("abc", -1), "zab")
+        self.assertEqual(decrypt("bcd", 53), "abc")
+
+    def test_bytes_input(self):
+        self.assertEqual(encrypt(b"Hello, World!", 3), b"Khoor, Zruog!")
+        self.assertEqual(decrypt(bytearray(b"Khoor, Zruog!"), 3), b"Hello, World!")
+        self.assertEqual(encrypt("Привет".encode("utf-8"), 3), "Привет".encode("utf-8"))
+
+    def test_non_ascii_letters(self):
+        # Поведение для не-ASCII букв совпадает с исходным посимвольным алгоритмом
+        self.assertEqual(encrypt("Привет ß ǅ ª", 3), "Fgysvi z v y")
+
+class TestStreaming(unittest.TestCase):
+
+    def test_text_stream_matches_in_memory(self):
+        text = "Hello, World 123!\n" * 100
+        dst = io.StringIO()
+        self.assertEqual(encrypt_stream(io.StringIO(text), dst, 5, chunk_size=7), len(text))
+        self.assertEqual(dst.getvalue(), encrypt(text, 5))
+
+    def test_binary_stream_roundtrip(self):
+        data = b"Attack at dawn! " * 1000
+        encrypted, decrypted = io.BytesIO(), io.BytesIO()
+        encrypt_stream(io.BytesIO(data), encrypted, 11, chunk_size=100)
+        encrypted.seek(0)
+        decrypt_stream(encrypted, decrypted, 11, chunk_size=64)
+        self.assertEqual(decrypted.getvalue(), data)
+
+    def test_file_roundtrip(self):
+        data = "Привет, World!\n".encode("utf-8") * 1000
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, name) for name in ("plain", "cipher", "result", "empty", "empty2")]
+            with open(paths[0], "wb") as f:
+                f.write(data)
+            self.assertEqual(encrypt_file(paths[0], paths[1], 3, chunk_size=1000), len(data))
+            decrypt_file(paths[1], paths[2], 3)
+            with open(paths[1], "rb") as f:
+                self.assertEqual(f.read(), encrypt(data, 3))
+            with open(paths[2], "rb") as f:
+                self.assertEqual(f.read(), data)
+            open(paths[3], "wb").close()
+            self.assertEqual(encrypt_file(paths[3], paths[4], 3), 0)
+
+    def test_file_same_path_refused(self):
+        # Тот же файл на входе и выходе обрезался бы до чтения - отказ, содержимое не меняется
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plain")
+            with open(path, "wb") as f:
+                f.write(b"Hello, World!")
+            for dst_path in (path, os.path.join(tmp, ".", "plain")):
+                with self.assertRaises(ValueError):
+                    encrypt_file(path, dst_path, 3)
+            with self.assertRaises(SystemExit):
+                main(["encrypt", "3", path, path])
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"Hello, World!")
+
+    def test_main_invalid_arguments(self):
+        # Неверные аргументы - сообщение с подсказкой, а не трассировка
+        for argv in ([], ["encrypt"], ["rotate", "3"], ["3", "encrypt"], ["encrypt", "three"]):
+            with self.assertRaises(SystemExit) as context:
+                main(argv)
+            self.assertIn(USAGE, str(context.exception.code))
+
+    def test_main_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            plain, cipher, result = (os.path.join(tmp, name) for name in ("plain", "cipher", "result"))
+            with open(plain, "wb") as f:
+                f.write(b"Hello, World!")
+            main(["encrypt", "3", plain, cipher])
+            main(["decrypt", "3", cipher, result])
+            with open(cipher, "rb") as f:
+                self.assertEqual(f.read(), b"Khoor, Zruog!")
+            with open(result, "rb") as f:
+                self.assertEqual(f.read(), b"Hello, World!")
+
 if __name__ == "__main__":
     unittest.main() 
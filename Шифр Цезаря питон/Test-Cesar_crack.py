@@ -0,0 +1,59 @@
+import unittest
+from Cesar import encrypt
+from Cesar_crack import crack, crack_batch, letter_histograms, score_shifts
+
+ENGLISH_TEXT = ("The quick brown fox jumps over the lazy dog while the people of the town "
+                "gather in the market square to hear the news about the coming harvest")
+RUSSIAN_TEXT = ("Шифр Цезаря является одним из самых простых и наиболее широко известных методов "
+                "шифрования, каждая буква в открытом тексте заменяется буквой находящейся правее")
+
+
+def encrypt_russian(text, shift):
+    alphabet = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+    shifted = alphabet[shift:] + alphabet[:shift]
+    return text.translate(str.maketrans(alphabet + alphabet.upper(), shifted + shifted.upper()))
+
+
+class TestCaesarCracker(unittest.TestCase):
+
+    def test_histograms(self):
+        counts = letter_histograms(["aAb!", "", "zz"])
+        self.assertEqual(counts.shape, (3, 26))
+        self.assertEqual(counts[0, 0], 2)
+        self.assertEqual(counts[0, 1], 1)
+        self.assertEqual(counts[1].sum(), 0)
+        self.assertEqual(counts[2, 25], 2)
+
+    def test_crack_english(self):
+        for shift in (0, 3, 13, 25):
+            found, plaintext, ranking = crack(encrypt(ENGLISH_TEXT, shift))
+            self.assertEqual(found, shift)
+            self.assertEqual(plaintext, ENGLISH_TEXT)
+            self.assertEqual(len(ranking), 26)
+            self.assertEqual(ranking[0][0], shift)
+
+    def test_crack_loglik(self):
+        found, plaintext, _ = crack(encrypt(ENGLISH_TEXT, 7), method="loglik")
+        self.assertEqual(found, 7)
+        self.assertEqual(plaintext, ENGLISH_TEXT)
+
+    def test_crack_russian(self):
+        found, plaintext, ranking = crack(encrypt_russian(RUSSIAN_TEXT, 5), language="ru")
+        self.assertEqual(found, 5)
+        self.assertEqual(plaintext, RUSSIAN_TEXT)
+        self.assertEqual(len(ranking), 33)
+
+    def test_batch_matches_single(self):
+        texts = [encrypt(ENGLISH_TEXT, shift) for shift in range(26)]
+        results = crack_batch(texts)
+        self.assertEqual([shift for shift, _, _ in results], list(range(26)))
+        self.assertEqual(score_shifts(texts).shape, (26, 26))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            crack("abc", language="de")
+        with self.assertRaises(ValueError):
+            crack("abc", method="unknown")
+
+if __name__ == "__main__":
+    unittest.main()